@@ -52,7 +52,7 @@ void print_usage() {
     std::cout << "  DCFR params: --dcfr-alpha A --dcfr-beta B --dcfr-gamma G\n";
     std::cout << "  Bet sizes: --bet-sizes 0.5,1 (comma-separated pot fractions)\n";
     std::cout << "  Checkpoints: --checkpoints 1024,2048,4096\n";
-    std::cout << "  Strategy dump: --dump-strategy PATH\n";
+    std::cout << "  Strategy dump: --dump-strategy PATH (binary container for *.bin, JSON otherwise)\n";
 }
 
 std::vector<double> parse_doubles(const std::string &value) {
@@ -289,6 +289,145 @@ void write_strategy_json(const std::string &path,
     out << "]}";
 }
 
+// Binary container matching python/src/cli/strategy_dump.py (version 1, float32 matrices).
+// Fields are written in host byte order; all supported targets are little-endian.
+template <typename T>
+void append_pod(std::string &buf, T value) {
+    char bytes[sizeof(T)];
+    std::memcpy(bytes, &value, sizeof(T));
+    buf.append(bytes, sizeof(T));
+}
+
+void pad_to(std::string &buf, std::size_t alignment) {
+    while (buf.size() % alignment != 0) {
+        buf.push_back('\0');
+    }
+}
+
+void write_strategy_binary(const std::string &path,
+                           const RiverGame &game,
+                           const std::array<StrategyProfile, 2> &profiles) {
+    struct Record {
+        std::uint32_t player;
+        std::uint32_t num_actions;
+        std::uint32_t key_offset;
+        std::uint32_t key_len;
+        std::uint32_t token_offset;
+        std::uint32_t token_len;
+        const StrategyMatrix *matrix;
+    };
+    const std::size_t header_size = 64;
+    const std::size_t record_size = 32;
+    std::string strings;
+    std::vector<Record> records;
+    for (int player = 0; player < 2; ++player) {
+        std::vector<std::string> keys;
+        keys.reserve(profiles[player].size());
+        for (const auto &entry : profiles[player]) {
+            keys.push_back(entry.first);
+        }
+        std::sort(keys.begin(), keys.end());
+        for (const auto &key : keys) {
+            const auto &entry = profiles[player].at(key);
+            Record rec{};
+            rec.player = static_cast<std::uint32_t>(player);
+            rec.num_actions = static_cast<std::uint32_t>(entry.first.size());
+            rec.key_offset = static_cast<std::uint32_t>(strings.size());
+            rec.key_len = static_cast<std::uint32_t>(key.size());
+            strings += key;
+            std::string joined;
+            for (std::size_t i = 0; i < entry.first.size(); ++i) {
+                if (i > 0) {
+                    joined += ",";
+                }
+                joined += entry.first[i];
+            }
+            rec.token_offset = static_cast<std::uint32_t>(strings.size());
+            rec.token_len = static_cast<std::uint32_t>(joined.size());
+            strings += joined;
+            rec.matrix = &entry.second;
+            records.push_back(rec);
+        }
+    }
+
+    std::string body;
+    body.resize(header_size, '\0');
+    std::uint64_t hands_offset = body.size();
+    for (int player = 0; player < 2; ++player) {
+        for (const auto &hand : game.hands[player]) {
+            body += hand_to_string(hand);
+        }
+    }
+    pad_to(body, 8);
+    std::uint64_t weights_offset = body.size();
+    for (int player = 0; player < 2; ++player) {
+        for (double weight : game.hand_weights[player]) {
+            append_pod<double>(body, weight);
+        }
+    }
+    pad_to(body, 8);
+    std::uint64_t index_offset = body.size();
+    std::uint64_t strings_offset = index_offset + record_size * records.size();
+    std::uint64_t data_offset = strings_offset + strings.size();
+    data_offset = (data_offset + 7) / 8 * 8;
+    std::uint64_t cursor = data_offset;
+    for (const auto &rec : records) {
+        append_pod<std::uint32_t>(body, rec.player);
+        append_pod<std::uint32_t>(body, rec.num_actions);
+        append_pod<std::uint32_t>(body, rec.key_offset);
+        append_pod<std::uint32_t>(body, rec.key_len);
+        append_pod<std::uint32_t>(body, rec.token_offset);
+        append_pod<std::uint32_t>(body, rec.token_len);
+        append_pod<std::uint64_t>(body, cursor);
+        cursor += static_cast<std::uint64_t>(rec.matrix->size()) * rec.num_actions * sizeof(float);
+    }
+    body += strings;
+    pad_to(body, 8);
+    for (const auto &rec : records) {
+        for (const auto &row : *rec.matrix) {
+            for (double value : row) {
+                append_pod<float>(body, static_cast<float>(value));
+            }
+        }
+    }
+
+    std::string header;
+    header.append("PSSTRAT", 7);
+    header.push_back('\0');
+    append_pod<std::uint32_t>(header, 1);  // version
+    append_pod<std::uint32_t>(header, 0);  // dtype: float32
+    append_pod<std::uint32_t>(header, static_cast<std::uint32_t>(game.hands[0].size()));
+    append_pod<std::uint32_t>(header, static_cast<std::uint32_t>(game.hands[1].size()));
+    append_pod<std::uint32_t>(header, static_cast<std::uint32_t>(records.size()));
+    append_pod<std::uint32_t>(header, 0);
+    append_pod<std::uint64_t>(header, hands_offset);
+    append_pod<std::uint64_t>(header, weights_offset);
+    append_pod<std::uint64_t>(header, index_offset);
+    append_pod<std::uint64_t>(header, strings_offset);
+    body.replace(0, header_size, header);
+
+    std::ofstream out(path, std::ios::binary);
+    if (!out) {
+        std::cerr << "Failed to write strategy to " << path << "\n";
+        return;
+    }
+    out.write(body.data(), static_cast<std::streamsize>(body.size()));
+}
+
+bool ends_with(const std::string &value, const std::string &suffix) {
+    return value.size() >= suffix.size() && value.compare(value.size() - suffix.size(), suffix.size(), suffix) == 0;
+}
+
+void write_strategy(const std::string &path,
+                    const RiverGame &game,
+                    const std::array<StrategyProfile, 2> &profiles) {
+    if (ends_with(path, ".bin")) {
+        write_strategy_binary(path, game, profiles);
+    } else {
+        write_strategy_json(path, game, profiles);
+    }
+}
+
 void build_profile_from_trainer(const Trainer &trainer,
                                 const Tree &tree,
                                 const std::vector<std::string> &keys,
@@ -473,7 +612,7 @@ void run_algo(const std::string &label,
     if (!dump_path.empty()) {
         std::array<StrategyProfile, 2> profiles;
         build_profile_from_trainer(trainer, tree, keys, tokens, profiles);
-        write_strategy_json(dump_path, game, profiles);
+        write_strategy(dump_path, game, profiles);
     }
 }
 
@@ -571,7 +710,7 @@ void run_mccfr(const RiverGame &game,
     if (!dump_path.empty()) {
         std::array<StrategyProfile, 2> profiles;
         build_profile_from_mccfr(trainer, tree, keys, tokens, profiles);
-        write_strategy_json(dump_path, game, profiles);
+        write_strategy(dump_path, game, profiles);
     }
 }
 }
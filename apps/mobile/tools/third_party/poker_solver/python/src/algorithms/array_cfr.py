@@ -0,0 +1,343 @@
+from __future__ import annotations
+
+from dataclasses import asdict
+from time import perf_counter
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from algorithms.array_eval import ArrayTerminalEvaluator, as_vector, normalize_rows, regret_matching
+from algorithms.discount import LazyDiscount, make_discount
+from algorithms.naive_eval import showdown_values_naive
+from algorithms.profiler import SolverProfiler
+from algorithms.snapshot import check_trainer_meta
+from algorithms.storage import check_storage
+from algorithms.vector_cfr import VectorCFRConfig
+from algorithms.vector_eval import (
+    StrengthSummary,
+    action_tokens,
+    build_card_removal_index,
+    build_strength_summary,
+)
+from games.river_holdem import Action, RiverHoldemGame
+from games.river_tree import TERMINAL_FOLD, TERMINAL_NONE
+from games.suit_iso import HandIsomorphism
+
+
+def storage_dtype(storage: str):
+    check_storage(storage)
+    return np.float32 if storage == "float32" else np.float64
+
+
+class ArrayInfoSet:
+    def __init__(self, num_hands: int, actions: List[Action], dtype=np.float64) -> None:
+        self.actions = actions
+        self.action_tokens = action_tokens(actions)
+        # Contiguous (num_hands, num_actions) tables; rows are hands.
+        self.regret_sum = np.zeros((num_hands, len(actions)), dtype=dtype)
+        self.strategy_sum = np.zeros((num_hands, len(actions)), dtype=dtype)
+        self._strategy_cache: np.ndarray | None = None
+        # Last instantaneous regrets (predictive variants only), in regret_sum's stored units.
+        self.prediction: np.ndarray | None = None
+
+    def current_strategy(self) -> np.ndarray:
+        if self._strategy_cache is None:
+            regrets = self.regret_sum if self.prediction is None else self.regret_sum + self.prediction
+            self._strategy_cache = regret_matching(regrets)
+        return self._strategy_cache
+
+    def average_strategy(self) -> np.ndarray:
+        return normalize_rows(self.strategy_sum)
+
+    def mark_dirty(self) -> None:
+        self._strategy_cache = None
+
+
+class ArrayVectorCFRTrainer:
+    def __init__(self, game: RiverHoldemGame, config: VectorCFRConfig | None = None) -> None:
+        self.game = game
+        self.config = config or VectorCFRConfig(engine="array")
+        self.iteration = 0
+        self.dtype = storage_dtype(self.config.storage)
+        self.tree = game.flat_tree()
+        self.iso = HandIsomorphism(game) if self.config.suit_isomorphism else None
+        if self.iso is not None:
+            self.hands = [self.iso.representative_hands(0), self.iso.representative_hands(1)]
+            self.hand_weights = [as_vector(self.iso.class_weights[0]), as_vector(self.iso.class_weights[1])]
+            # Class index and class size per combo, for expanding opponent reach (see HandIsomorphism).
+            self.class_of = [np.asarray(self.iso.class_of[p], dtype=np.int64) for p in (0, 1)]
+            self.member_sizes = [as_vector(self.iso.member_sizes[p]) for p in (0, 1)]
+        else:
+            self.hands = game.hands
+            self.hand_weights = [as_vector(game.hand_weights[0]), as_vector(game.hand_weights[1])]
+        self.num_hands = [len(self.hands[0]), len(self.hands[1])]
+        self.infosets: Dict[int, Dict[str, ArrayInfoSet]] = {0: {}, 1: {}}
+        # Node id -> infoset; None at terminals. Keys are only kept for profile export.
+        self.node_infosets: List[ArrayInfoSet | None] = [None for _ in range(self.tree.num_nodes)]
+        for node in self.tree.decision_nodes:
+            player = self.tree.player[node]
+            actions = [self.tree.actions[child] for child in self.tree.children(node)]
+            infoset = ArrayInfoSet(self.num_hands[player], actions, self.dtype)
+            if self.config.use_predictive:
+                infoset.prediction = np.zeros_like(infoset.regret_sum)
+            self.infosets[player][self.tree.keys[node]] = infoset
+            self.node_infosets[node] = infoset
+        self.opp_summary: Dict[int, StrengthSummary] = {
+            0: build_strength_summary(game.hands[1]),
+            1: build_strength_summary(game.hands[0]),
+        }
+        self.removal = {
+            0: build_card_removal_index(self.hands[0], self.opp_summary[0]),
+            1: build_card_removal_index(self.hands[1], self.opp_summary[1]),
+        }
+        self.evaluators = {player: ArrayTerminalEvaluator(self.removal[player]) for player in (0, 1)}
+        self._pending_regret: Dict[int, Dict[int, np.ndarray]] = {0: {}, 1: {}}
+        self.discount: LazyDiscount | None = make_discount(self.config)
+        self.profiler: SolverProfiler | None = None
+        self.skip_stats = {"nodes": 0, "nodes_skipped": 0, "terminals": 0, "terminals_skipped": 0}
+
+    def _set_prediction(self, infoset: ArrayInfoSet, deltas: np.ndarray) -> None:
+        inv_pos = 1.0 / self.discount.pos if self.discount is not None else 1.0
+        infoset.prediction = deltas * inv_pos
+
+    def _accumulate_regret(self, player: int, node: int, infoset: ArrayInfoSet, deltas: np.ndarray) -> None:
+        if not self.config.use_plus:
+            if infoset.prediction is not None:
+                self._set_prediction(infoset, deltas)
+            if self.discount is None:
+                infoset.regret_sum += deltas
+            else:
+                # Same per-sign conversion as VectorCFRTrainer._accumulate_regret.
+                pos = self.discount.pos
+                neg = self.discount.neg
+                regrets = infoset.regret_sum
+                real = regrets * np.where(regrets > 0.0, pos, neg) + deltas
+                stored = real * np.where(real > 0.0, 1.0 / pos, 1.0 / neg)
+                np.copyto(stored, regrets, where=deltas == 0.0)
+                infoset.regret_sum = stored.astype(self.dtype, copy=False)
+            infoset.mark_dirty()
+            return
+        pending = self._pending_regret[player].get(node)
+        if pending is None:
+            self._pending_regret[player][node] = deltas
+        else:
+            pending += deltas
+
+    def _apply_regret_updates(self, player: int) -> None:
+        if not self.config.use_plus:
+            return
+        tick = perf_counter() if self.profiler is not None else 0.0
+        pos = self.discount.pos if self.discount is not None else 1.0
+        for node, deltas in self._pending_regret[player].items():
+            infoset = self.node_infosets[node]
+            if infoset.prediction is not None:
+                self._set_prediction(infoset, deltas)
+            # CFR+ flooring on the whole table at once.
+            if pos == 1.0:
+                np.maximum(infoset.regret_sum + deltas, 0.0, out=infoset.regret_sum)
+            else:
+                np.maximum(infoset.regret_sum * pos + deltas, 0.0, out=infoset.regret_sum)
+                infoset.regret_sum *= 1.0 / pos
+            infoset.mark_dirty()
+        self._pending_regret[player].clear()
+        if self.profiler is not None:
+            self.profiler.add("update", perf_counter() - tick)
+
+    def _advance_discount(self) -> None:
+        if self.discount is None:
+            return
+        self.discount.advance(self.iteration)
+        if not self.discount.needs_rescale():
+            return
+        discount = self.discount
+        for node in self.tree.decision_nodes:
+            infoset = self.node_infosets[node]
+            regrets = infoset.regret_sum
+            regrets *= np.where(regrets > 0.0, discount.pos, discount.neg)
+            infoset.strategy_sum *= discount.strat
+            if infoset.prediction is not None:
+                infoset.prediction *= discount.pos
+            infoset.mark_dirty()
+        discount.reset_factors()
+
+    def _terminal_values(self, node: int, update_player: int, opp_weights: np.ndarray) -> np.ndarray:
+        tree = self.tree
+        evaluator = self.evaluators[update_player]
+        if self.iso is not None:
+            opp = 1 - update_player
+            opp_weights = opp_weights[self.class_of[opp]] / self.member_sizes[opp]
+        pot_total = tree.pot[node]
+        contrib_player = tree.contrib(node, update_player)
+        if tree.terminal[node] == TERMINAL_FOLD:
+            if tree.fold_winner[node] == update_player:
+                return evaluator.fold_values(pot_total - contrib_player, opp_weights)
+            return evaluator.fold_values(-contrib_player, opp_weights)
+        if self.config.use_naive_eval:
+            return as_vector(
+                showdown_values_naive(
+                    self.hands[update_player],
+                    self.game.hands[1 - update_player],
+                    opp_weights.tolist(),
+                    pot_total,
+                    contrib_player,
+                )
+            )
+        return evaluator.showdown_values(opp_weights, pot_total, contrib_player)
+
+    def _traverse(self, update_player: int, root_reach_p: np.ndarray, root_reach_opp: np.ndarray) -> np.ndarray:
+        tree = self.tree
+        num_nodes = tree.num_nodes
+        reach_p: List[np.ndarray | None] = [None for _ in range(num_nodes)]
+        reach_opp: List[np.ndarray | None] = [None for _ in range(num_nodes)]
+        strategies: List[np.ndarray | None] = [None for _ in range(num_nodes)]
+        reach_p[0] = root_reach_p
+        reach_opp[0] = root_reach_opp
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.begin_pass()
+            pass_start = perf_counter()
+
+        # Forward pass in level order: push reach through current strategies.
+        for node in tree.decision_nodes:
+            infoset = self.node_infosets[node]
+            own = tree.player[node] == update_player
+            strategy = infoset.current_strategy()
+            strategies[node] = strategy
+            for a_idx, child in enumerate(tree.children(node)):
+                if own:
+                    reach_p[child] = reach_p[node] * strategy[:, a_idx]
+                    reach_opp[child] = reach_opp[node]
+                else:
+                    reach_p[child] = reach_p[node]
+                    reach_opp[child] = reach_opp[node] * strategy[:, a_idx]
+
+        if profiler is not None:
+            profiler.end_pass("forward", perf_counter() - pass_start)
+            pass_start = perf_counter()
+
+        regret_weight = (
+            float(self.iteration)
+            if self.config.linear_weighting and not self.config.use_plus and not self.config.use_dcfr
+            else 1.0
+        )
+        weight_scale = float(self.iteration) if self.config.linear_weighting and not self.config.use_dcfr else 1.0
+        if self.discount is not None:
+            weight_scale = 1.0 / self.discount.strat
+
+        # Backward pass in reverse level order: children are always finished before parents.
+        values: List[np.ndarray | None] = [None for _ in range(num_nodes)]
+        stats = self.skip_stats
+        for node in range(num_nodes - 1, -1, -1):
+            stats["nodes"] += 1
+            if tree.terminal[node] != TERMINAL_NONE:
+                stats["terminals"] += 1
+                if self.config.skip_zero_reach and not reach_opp[node].any():
+                    # Zero opponent reach: the counterfactual values are exactly zero.
+                    stats["nodes_skipped"] += 1
+                    stats["terminals_skipped"] += 1
+                    values[node] = np.zeros(self.num_hands[update_player])
+                elif profiler is None:
+                    values[node] = self._terminal_values(node, update_player, reach_opp[node])
+                else:
+                    profiler.visit()
+                    tick = perf_counter()
+                    values[node] = self._terminal_values(node, update_player, reach_opp[node])
+                    profiler.terminal(node, tree.terminal[node], perf_counter() - tick)
+                continue
+            if profiler is not None:
+                profiler.visit()
+            children = tree.children(node)
+            if tree.player[node] != update_player:
+                node_values = values[children.start].copy()
+                for child in children[1:]:
+                    node_values += values[child]
+            else:
+                if profiler is not None:
+                    tick = perf_counter()
+                infoset = self.node_infosets[node]
+                strategy = strategies[node]
+                action_values = np.empty((self.num_hands[update_player], len(children)))
+                for a_idx, child in enumerate(children):
+                    action_values[:, a_idx] = values[child]
+                node_values = (strategy * action_values).sum(axis=1)
+                deltas = action_values - node_values[:, None]
+                if regret_weight != 1.0:
+                    deltas *= regret_weight
+                self._accumulate_regret(update_player, node, infoset, deltas)
+                infoset.strategy_sum += (reach_p[node] * weight_scale)[:, None] * strategy
+                if profiler is not None:
+                    profiler.update(node, deltas.size, perf_counter() - tick)
+            for child in children:
+                values[child] = None
+            values[node] = node_values
+        if profiler is not None:
+            profiler.end_pass("backward", perf_counter() - pass_start)
+        return values[0]
+
+    def run(self, iterations: int) -> None:
+        for _ in range(iterations):
+            self.iteration += 1
+            if self.profiler is not None:
+                self.profiler.begin_iteration(self.iteration)
+            self._advance_discount()
+            if self.config.alternating:
+                for player in (0, 1):
+                    self._pending_regret[player].clear()
+                    self._traverse(player, self.hand_weights[player], self.hand_weights[1 - player])
+                    self._apply_regret_updates(player)
+            else:
+                for player in (0, 1):
+                    self._pending_regret[player].clear()
+                for player in (0, 1):
+                    self._traverse(player, self.hand_weights[player], self.hand_weights[1 - player])
+                for player in (0, 1):
+                    self._apply_regret_updates(player)
+            if self.profiler is not None:
+                self.profiler.end_iteration()
+
+    def snapshot_state(self) -> Tuple[dict, List[Tuple[str, np.ndarray]]]:
+        # Same layout as VectorCFRTrainer.snapshot_state: decision-node order, row-major tables.
+        nodes = self.tree.decision_nodes
+        regrets = np.concatenate([self.node_infosets[node].regret_sum.ravel() for node in nodes])
+        strategy = np.concatenate([self.node_infosets[node].strategy_sum.ravel() for node in nodes])
+        meta = {
+            "trainer": "vector_cfr",
+            "config": asdict(self.config),
+            "iteration": self.iteration,
+            "discount": self.discount.to_json() if self.discount is not None else None,
+        }
+        tables = [("regret_sum", regrets), ("strategy_sum", strategy)]
+        if self.config.use_predictive:
+            prediction = np.concatenate([self.node_infosets[node].prediction.ravel() for node in nodes])
+            tables.append(("prediction", prediction))
+        return meta, tables
+
+    def restore_state(self, meta: dict, tables: Dict[str, memoryview]) -> None:
+        check_trainer_meta(meta, "vector_cfr", self.config)
+        regrets = np.asarray(tables["regret_sum"], dtype=np.float64)
+        strategy = np.asarray(tables["strategy_sum"], dtype=np.float64)
+        prediction = np.asarray(tables["prediction"], dtype=np.float64) if self.config.use_predictive else None
+        offset = 0
+        for node in self.tree.decision_nodes:
+            infoset = self.node_infosets[node]
+            shape = infoset.regret_sum.shape
+            size = shape[0] * shape[1]
+            infoset.regret_sum = regrets[offset : offset + size].reshape(shape).astype(self.dtype)
+            infoset.strategy_sum = strategy[offset : offset + size].reshape(shape).astype(self.dtype)
+            if prediction is not None:
+                infoset.prediction = prediction[offset : offset + size].reshape(shape).copy()
+            infoset.mark_dirty()
+            offset += size
+        self.iteration = meta["iteration"]
+        if meta["discount"] is not None:
+            self.discount = LazyDiscount.from_json(meta["discount"])
+
+    def average_strategy_profile(self) -> Dict[int, Dict[str, Tuple[List[str], List[List[float]]]]]:
+        profile: Dict[int, Dict[str, Tuple[List[str], List[List[float]]]]] = {0: {}, 1: {}}
+        for player in (0, 1):
+            for key, infoset in self.infosets[player].items():
+                avg = infoset.average_strategy()
+                if self.iso is not None:
+                    avg = avg[self.class_of[player]]
+                profile[player][key] = (infoset.action_tokens, avg.tolist())
+        return profile
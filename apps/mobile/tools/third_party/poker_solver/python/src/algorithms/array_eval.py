@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from algorithms.vector_eval import BR_TIE_TOLERANCE, CardRemovalIndex
+from games.river_tree import TERMINAL_FOLD, TERMINAL_NONE, FlatRiverTree
+
+
+class ArrayTerminalEvaluator:
+    # Whole-array counterpart of showdown_values_card_removal/fold_values_card_removal.
+    # Operation order mirrors the list evaluator so both engines agree bit-for-bit.
+    def __init__(self, removal: CardRemovalIndex) -> None:
+        self.num_hands = len(removal.starts)
+        self.sorted_indices = np.asarray(removal.sorted_indices, dtype=np.int64)
+        self.card_order = np.asarray(removal.card_order, dtype=np.int64)
+        self.starts = np.asarray(removal.starts, dtype=np.int64)
+        self.ends = np.asarray(removal.ends, dtype=np.int64)
+        self.first_base = np.asarray(removal.first_base, dtype=np.int64)
+        self.first_start = np.asarray(removal.first_start, dtype=np.int64)
+        self.first_end = np.asarray(removal.first_end, dtype=np.int64)
+        self.first_top = np.asarray(removal.first_top, dtype=np.int64)
+        self.second_base = np.asarray(removal.second_base, dtype=np.int64)
+        self.second_start = np.asarray(removal.second_start, dtype=np.int64)
+        self.second_end = np.asarray(removal.second_end, dtype=np.int64)
+        self.second_top = np.asarray(removal.second_top, dtype=np.int64)
+        same = np.asarray(removal.same_index, dtype=np.int64)
+        self.same_mask = (same >= 0).astype(np.float64)
+        self.same_index = np.where(same >= 0, same, 0)
+
+    def _sums(self, opp_weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        prefix = np.zeros(len(self.sorted_indices) + 1)
+        np.cumsum(opp_weights[self.sorted_indices], out=prefix[1:])
+        card_prefix = np.zeros(len(self.card_order) + 1)
+        np.cumsum(opp_weights[self.card_order], out=card_prefix[1:])
+        return prefix, card_prefix
+
+    def _valid(self, opp_weights: np.ndarray, total: float, card_prefix: np.ndarray) -> np.ndarray:
+        blocked = (
+            card_prefix[self.first_top]
+            - card_prefix[self.first_base]
+            + card_prefix[self.second_top]
+            - card_prefix[self.second_base]
+        )
+        blocked -= opp_weights[self.same_index] * self.same_mask
+        return total - blocked
+
+    def valid_weights(self, opp_weights: np.ndarray) -> np.ndarray:
+        prefix, card_prefix = self._sums(opp_weights)
+        total = float(prefix[-1])
+        if total <= 0.0:
+            return np.zeros(self.num_hands)
+        return self._valid(opp_weights, total, card_prefix)
+
+    def fold_values(self, value: float, opp_weights: np.ndarray) -> np.ndarray:
+        return value * self.valid_weights(opp_weights)
+
+    def showdown_values(self, opp_weights: np.ndarray, pot_total: float, contrib_player: float) -> np.ndarray:
+        prefix, card_prefix = self._sums(opp_weights)
+        total = float(prefix[-1])
+        if total <= 0.0:
+            return np.zeros(self.num_hands)
+        same_weight = opp_weights[self.same_index] * self.same_mask
+        first_start = card_prefix[self.first_start]
+        second_start = card_prefix[self.second_start]
+        first_base = card_prefix[self.first_base]
+        second_base = card_prefix[self.second_base]
+        win = prefix[self.starts] - (first_start - first_base) - (second_start - second_base)
+        tie = (
+            prefix[self.ends]
+            - prefix[self.starts]
+            - (card_prefix[self.first_end] - first_start)
+            - (card_prefix[self.second_end] - second_start)
+            + same_weight
+        )
+        valid = (
+            total
+            - (card_prefix[self.first_top] - first_base)
+            - (card_prefix[self.second_top] - second_base)
+            + same_weight
+        )
+        return win * pot_total + tie * (pot_total / 2.0) - contrib_player * valid
+
+    # Batched variants: opp_weights is (K x opponent hands), one reach vector per row, and each
+    # row's result equals the single-vector method on that row (cumsum runs left to right).
+    def _batch_sums(self, opp_weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        prefix = np.zeros((opp_weights.shape[0], len(self.sorted_indices) + 1))
+        np.cumsum(opp_weights[:, self.sorted_indices], axis=1, out=prefix[:, 1:])
+        card_prefix = np.zeros((opp_weights.shape[0], len(self.card_order) + 1))
+        np.cumsum(opp_weights[:, self.card_order], axis=1, out=card_prefix[:, 1:])
+        return prefix, card_prefix
+
+    def fold_values_batch(self, value: float, opp_weights: np.ndarray) -> np.ndarray:
+        prefix, card_prefix = self._batch_sums(opp_weights)
+        total = prefix[:, -1:]
+        blocked = (
+            card_prefix[:, self.first_top]
+            - card_prefix[:, self.first_base]
+            + card_prefix[:, self.second_top]
+            - card_prefix[:, self.second_base]
+        )
+        blocked -= opp_weights[:, self.same_index] * self.same_mask
+        return np.where(total > 0.0, value * (total - blocked), 0.0)
+
+    def showdown_values_batch(self, opp_weights: np.ndarray, pot_total: float, contrib_player: float) -> np.ndarray:
+        prefix, card_prefix = self._batch_sums(opp_weights)
+        total = prefix[:, -1:]
+        same_weight = opp_weights[:, self.same_index] * self.same_mask
+        first_start = card_prefix[:, self.first_start]
+        second_start = card_prefix[:, self.second_start]
+        first_base = card_prefix[:, self.first_base]
+        second_base = card_prefix[:, self.second_base]
+        win = prefix[:, self.starts] - (first_start - first_base) - (second_start - second_base)
+        tie = (
+            prefix[:, self.ends]
+            - prefix[:, self.starts]
+            - (card_prefix[:, self.first_end] - first_start)
+            - (card_prefix[:, self.second_end] - second_start)
+            + same_weight
+        )
+        valid = (
+            total
+            - (card_prefix[:, self.first_top] - first_base)
+            - (card_prefix[:, self.second_top] - second_base)
+            + same_weight
+        )
+        return np.where(total > 0.0, win * pot_total + tie * (pot_total / 2.0) - contrib_player * valid, 0.0)
+
+
+def regret_matching(regret_sum: np.ndarray) -> np.ndarray:
+    # Row-wise regret matching; rows with no positive regret fall back to uniform.
+    positives = np.maximum(regret_sum, 0.0)
+    normalizing = positives.sum(axis=1, keepdims=True)
+    num_actions = regret_sum.shape[1]
+    safe = np.where(normalizing > 0.0, normalizing, 1.0)
+    return np.where(normalizing > 0.0, positives / safe, 1.0 / num_actions)
+
+
+def normalize_rows(totals: np.ndarray) -> np.ndarray:
+    normalizing = totals.sum(axis=1, keepdims=True)
+    num_actions = totals.shape[1]
+    safe = np.where(normalizing > 0.0, normalizing, 1.0)
+    return np.where(normalizing > 0.0, totals / safe, 1.0 / num_actions)
+
+
+def as_vector(values: List[float] | np.ndarray) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def array_best_response_batch(
+    tree: FlatRiverTree,
+    target_player: int,
+    strategy_sources: Sequence[Callable[[int], Sequence[Sequence[float]]]],
+    opp_weights: Sequence[float],
+    removal: CardRemovalIndex,
+) -> Tuple[List[List[float]], List[Dict[int, List[List[float]]]]]:
+    # Array engine of vector_eval.best_response_batch: reach and values are (K x hands) arrays,
+    # so each terminal is a handful of whole-batch array operations. Returns the same per-profile
+    # root values and best-response matrices as best_response_backward, as lists.
+    evaluator = ArrayTerminalEvaluator(removal)
+    num_batch = len(strategy_sources)
+    num_target = evaluator.num_hands
+    num_opp = len(opp_weights)
+    reach: List[np.ndarray | None] = [None for _ in range(tree.num_nodes)]
+    reach[0] = np.tile(as_vector(opp_weights), (num_batch, 1))
+    for node in tree.decision_nodes:
+        parent = reach[node]
+        # Only terminal reach is read by the backward pass.
+        reach[node] = None
+        children = tree.children(node)
+        if tree.player[node] == target_player or not parent.any():
+            for child in children:
+                reach[child] = parent
+            continue
+        strategy = np.zeros((num_batch, num_opp, len(children)))
+        for k, source in enumerate(strategy_sources):
+            if parent[k].any():
+                strategy[k] = source(node)
+        for a_idx, child in enumerate(children):
+            reach[child] = parent * strategy[:, :, a_idx]
+
+    values: List[np.ndarray | None] = [None for _ in range(tree.num_nodes)]
+    br_matrices: List[Dict[int, List[List[float]]]] = [{} for _ in range(num_batch)]
+    for node in range(tree.num_nodes - 1, -1, -1):
+        kind = tree.terminal[node]
+        if kind != TERMINAL_NONE:
+            node_reach = reach[node]
+            reach[node] = None
+            if not node_reach.any():
+                values[node] = np.zeros((num_batch, num_target))
+                continue
+            pot_total = tree.pot[node]
+            contrib = tree.contrib(node, target_player)
+            if kind == TERMINAL_FOLD:
+                payoff = pot_total - contrib if tree.fold_winner[node] == target_player else -contrib
+                values[node] = evaluator.fold_values_batch(payoff, node_reach)
+            else:
+                values[node] = evaluator.showdown_values_batch(node_reach, pot_total, contrib)
+            continue
+
+        children = tree.children(node)
+        action_vals = [values[child] for child in children]
+        for child in children:
+            values[child] = None
+        if tree.player[node] != target_player:
+            node_values = np.zeros((num_batch, num_target))
+            for child_values in action_vals:
+                node_values = node_values + child_values
+            values[node] = node_values
+            continue
+        # Same scan as the list engine: a later action wins only by more than BR_TIE_TOLERANCE.
+        best_val = action_vals[0]
+        best = np.zeros(best_val.shape, dtype=np.int64)
+        for a_idx in range(1, len(action_vals)):
+            value = action_vals[a_idx]
+            better = value - best_val > BR_TIE_TOLERANCE * np.maximum(1.0, np.abs(best_val))
+            best_val = np.where(better, value, best_val)
+            best[better] = a_idx
+        one_hot = (best[:, :, None] == np.arange(len(action_vals))).astype(np.float64)
+        for k in range(num_batch):
+            br_matrices[k][node] = one_hot[k].tolist()
+        values[node] = best_val
+    return values[0].tolist(), br_matrices
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import json
+import math
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Sequence
+
+from algorithms.profiler import SolverProfiler
+
+
+# Minimum spacing between adaptive evaluations, as a fraction of the iterations already run.
+EVAL_GROWTH = 0.25
+
+
+@dataclass
+class SolveBudget:
+    # Stop on whichever comes first. Without a time limit, evaluation follows the fixed
+    # checkpoint schedule; with one, evaluation is scheduled adaptively (see run_with_budget).
+    time_limit: float | None = None
+    target_exp: float | None = None
+    max_iters: int | None = None
+    # Upper bound on the share of wall time spent in average_strategy_profile + exploitability.
+    eval_share: float = 0.1
+    log_path: Path | None = None
+
+
+@dataclass
+class BudgetResult:
+    results: Dict[int, float] = field(default_factory=dict)
+    # One record per evaluation, as written to the JSONL log.
+    checkpoints: List[dict] = field(default_factory=list)
+    last_profile: object = None
+    status: str = "schedule_done"
+    iterations: int = 0
+    solve_seconds: float = 0.0
+    eval_seconds: float = 0.0
+    elapsed: float = 0.0
+
+
+def checkpoint_schedule(checkpoints: Sequence[int], keep_doubling: bool) -> Iterator[int]:
+    yield from checkpoints
+    if not keep_doubling:
+        return
+    target = checkpoints[-1]
+    while True:
+        target *= 2
+        yield target
+
+
+def next_eval_chunk(
+    budget: SolveBudget,
+    solve_seconds: float,
+    eval_seconds: float,
+    iter_seconds: float,
+    last_eval: float,
+    remaining: float,
+    iterations: int,
+) -> int:
+    # Iterations until the next evaluation: enough solving that one more evaluation keeps the
+    # cumulative eval share <= budget.eval_share, and at least EVAL_GROWTH x the iterations done
+    # so far so checkpoints stay geometrically spaced once evaluation is cheap. Clipped so the
+    # final evaluation still fits in the remaining time.
+    share = min(max(budget.eval_share, 1e-3), 0.9)
+    needed = (eval_seconds + last_eval) * (1.0 - share) / share - solve_seconds
+    chunk = max(1, math.ceil(needed / iter_seconds)) if iter_seconds > 0.0 else 1
+    chunk = max(chunk, math.ceil(iterations * EVAL_GROWTH))
+    affordable = int((remaining - last_eval) / iter_seconds) if iter_seconds > 0.0 else chunk
+    return min(chunk, affordable)
+
+
+class CheckpointLog:
+    # One JSON object per evaluation, flushed immediately so partial runs stay readable.
+    def __init__(self, path: Path | None) -> None:
+        self._out = path.open("a", encoding="utf-8") if path is not None else None
+
+    def write(self, record: dict) -> None:
+        if self._out is None:
+            return
+        self._out.write(json.dumps(record) + "\n")
+        self._out.flush()
+
+    def close(self) -> None:
+        if self._out is not None:
+            self._out.close()
+
+
+def run_with_budget(
+    trainer,
+    evaluate: Callable[[object], float],
+    budget: SolveBudget,
+    checkpoints: Sequence[int],
+    advance: Callable[[object, int], None] | None = None,
+    label: str = "",
+    profiler: SolverProfiler | None = None,
+    eval_details: Callable[[], dict] | None = None,
+) -> BudgetResult:
+    # With a profiler, evaluation time is split into average_strategy / exploitability, and solve
+    # time the trainer's own hook (if any) did not attribute to a phase is counted as "solve".
+    # eval_details, if given, is called after each evaluation and its fields are added to the
+    # checkpoint record (e.g. the confidence interval of a sampled metric).
+    advance = advance or (lambda t, n: t.run(n))
+    out = BudgetResult(iterations=getattr(trainer, "iteration", 0))
+    log = CheckpointLog(budget.log_path)
+    start = time.perf_counter()
+    iter_seconds = 0.0
+    last_eval = 0.0
+
+    def remaining() -> float:
+        return budget.time_limit - (time.perf_counter() - start)
+
+    def evaluate_now() -> float:
+        nonlocal last_eval
+        tick = time.perf_counter()
+        profile = trainer.average_strategy_profile()
+        averaged = time.perf_counter()
+        value = evaluate(profile)
+        last_eval = time.perf_counter() - tick
+        if profiler is not None:
+            profiler.evaluation(averaged - tick, tick + last_eval - averaged)
+        out.eval_seconds += last_eval
+        out.last_profile = profile
+        out.results[out.iterations] = value
+        record = {
+            "label": label,
+            "iteration": out.iterations,
+            "elapsed": time.perf_counter() - start,
+            "exploitability": value,
+            "solve_seconds": out.solve_seconds,
+            "eval_seconds": out.eval_seconds,
+        }
+        if eval_details is not None:
+            record.update(eval_details())
+        out.checkpoints.append(record)
+        log.write(record)
+        return value
+
+    def solve(iterations: int) -> None:
+        nonlocal iter_seconds
+        tracked = profiler.solve_seconds() if profiler is not None else 0.0
+        tick = time.perf_counter()
+        advance(trainer, iterations)
+        spent = time.perf_counter() - tick
+        if profiler is not None:
+            profiler.add("solve", spent - (profiler.solve_seconds() - tracked))
+            profiler.iterations += iterations
+        out.solve_seconds += spent
+        out.iterations += iterations
+        iter_seconds = spent / iterations
+
+    try:
+        if budget.time_limit is None:
+            schedule = checkpoint_schedule(checkpoints, budget.target_exp is not None or budget.max_iters is not None)
+            for target in schedule:
+                if budget.max_iters is not None:
+                    target = min(target, budget.max_iters)
+                if target <= out.iterations:
+                    if budget.max_iters is not None and out.iterations >= budget.max_iters:
+                        out.status = "max_iters"
+                        break
+                    continue
+                solve(target - out.iterations)
+                value = evaluate_now()
+                if budget.target_exp is not None and value <= budget.target_exp:
+                    out.status = "target_reached"
+                    break
+        else:
+            # Adaptive mode: a one-iteration probe measures iteration and evaluation cost, then
+            # each chunk is sized from the running totals.
+            chunk = 1
+            while True:
+                if budget.max_iters is not None:
+                    chunk = min(chunk, budget.max_iters - out.iterations)
+                if chunk <= 0:
+                    out.status = "max_iters"
+                    break
+                solve(chunk)
+                value = evaluate_now()
+                if budget.target_exp is not None and value <= budget.target_exp:
+                    out.status = "target_reached"
+                    break
+                if budget.max_iters is not None and out.iterations >= budget.max_iters:
+                    out.status = "max_iters"
+                    break
+                if remaining() <= 0.0:
+                    out.status = "time_limit"
+                    break
+                chunk = next_eval_chunk(
+                    budget, out.solve_seconds, out.eval_seconds, iter_seconds, last_eval, remaining(), out.iterations
+                )
+                if chunk <= 0:
+                    out.status = "time_limit"
+                    break
+    finally:
+        log.close()
+    out.elapsed = time.perf_counter() - start
+    return out
+
+
+def describe_result(result: BudgetResult) -> str:
+    share = result.eval_seconds / result.elapsed if result.elapsed > 0.0 else 0.0
+    return (
+        f"{result.status} after {result.iterations} iterations in {result.elapsed:.2f}s "
+        f"(eval {100.0 * share:.1f}% of wall time)"
+    )
@@ -3,7 +3,9 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Dict, List, Optional
 
+from algorithms.discount import LazyDiscount, make_discount
 from algorithms.infoset import InfoSet
+from algorithms.profiler import SolverProfiler
 
 
 @dataclass
@@ -15,6 +17,8 @@ class CFRConfig:
     dcfr_alpha: float = 1.5
     dcfr_beta: float = 0.0
     dcfr_gamma: float = 2.0
+    # Predictive regret matching (PCFR+ with use_plus); use_plus with use_dcfr is DCFR+.
+    use_predictive: bool = False
 
 
 class CFRTrainer:
@@ -23,7 +27,10 @@ class CFRTrainer:
         self.config = config or CFRConfig()
         self.infosets: Dict[str, InfoSet] = {}
         self.iteration = 0
+        self.profiler: SolverProfiler | None = None
         self._pending_regret: Dict[str, List[float]] = {}
+        # DCFR factors are cumulative; see algorithms.discount for the stored-value convention.
+        self.discount: LazyDiscount | None = make_discount(self.config)
 
     def _get_infoset(self, state, player: int) -> tuple[str, InfoSet]:
         key = self.game.infoset_key(state, player)
@@ -31,16 +38,25 @@ class CFRTrainer:
         if infoset is None:
             actions = self.game.legal_actions(state)
             infoset = InfoSet(actions)
+            if self.config.use_predictive:
+                infoset.prediction = [0.0 for _ in actions]
             self.infosets[key] = infoset
         return key, infoset
 
+    def _deferred_updates(self) -> bool:
+        return self.config.use_plus or self.config.use_predictive
+
     def _accumulate_regret(self, key: str, infoset: InfoSet, deltas: List[float]) -> None:
-        if not self.config.use_plus:
-            for idx, delta in enumerate(deltas):
-                infoset.regret_sum[idx] += delta
+        if not self._deferred_updates():
+            if self.discount is None:
+                for idx, delta in enumerate(deltas):
+                    infoset.regret_sum[idx] += delta
+            else:
+                self._add_discounted(infoset, deltas)
             return
 
-        # CFR+: defer flooring until after the traversal to avoid biasing updates.
+        # CFR+: defer flooring until after the traversal to avoid biasing updates. Predictive
+        # variants also need the whole iteration's regret (an infoset is reached once per deal).
         pending = self._pending_regret.get(key)
         if pending is None:
             pending = [0.0 for _ in infoset.actions]
@@ -48,15 +64,46 @@ class CFRTrainer:
             pending[idx] += delta
         self._pending_regret[key] = pending
 
+    def _add_discounted(self, infoset: InfoSet, deltas: List[float]) -> None:
+        pos = self.discount.pos
+        neg = self.discount.neg
+        regrets = infoset.regret_sum
+        for idx, delta in enumerate(deltas):
+            value = regrets[idx]
+            value = (value * pos if value > 0.0 else value * neg) + delta
+            regrets[idx] = value / pos if value > 0.0 else value / neg
+
     def _apply_regret_updates(self) -> None:
-        if not self.config.use_plus:
+        if not self._deferred_updates():
             return
+        pos = self.discount.pos if self.discount is not None else 1.0
         for key, deltas in self._pending_regret.items():
             infoset = self.infosets[key]
+            if infoset.prediction is not None:
+                infoset.prediction = [delta / pos for delta in deltas]
+            if not self.config.use_plus:
+                if self.discount is None:
+                    for idx, delta in enumerate(deltas):
+                        infoset.regret_sum[idx] += delta
+                else:
+                    self._add_discounted(infoset, deltas)
+                continue
             for idx, delta in enumerate(deltas):
-                infoset.regret_sum[idx] = max(0.0, infoset.regret_sum[idx] + delta)
+                infoset.regret_sum[idx] = max(0.0, infoset.regret_sum[idx] * pos + delta) / pos
         self._pending_regret.clear()
 
+    def _advance_discount(self) -> None:
+        if self.discount is None:
+            return
+        self.discount.advance(self.iteration)
+        if self.discount.needs_rescale():
+            for infoset in self.infosets.values():
+                if infoset.prediction is not None:
+                    infoset.prediction = [value * self.discount.pos for value in infoset.prediction]
+                self.discount.rescale_regrets(infoset.regret_sum)
+                self.discount.rescale_strategy(infoset.strategy_sum)
+            self.discount.reset_factors()
+
     def _cfr(self, state, reach_p0: float, reach_p1: float, update_player: Optional[int]) -> float:
         if self.game.is_terminal(state):
             return self.game.terminal_utility(state, 0)
@@ -74,13 +121,6 @@ class CFRTrainer:
 
         player = self.game.current_player(state)
         key, infoset = self._get_infoset(state, player)
-        if self.config.use_dcfr and (update_player is None or update_player == player):
-            infoset.apply_dcfr_discount(
-                self.iteration,
-                self.config.dcfr_alpha,
-                self.config.dcfr_beta,
-                self.config.dcfr_gamma,
-            )
         strategy = infoset.current_strategy()
         actions = infoset.actions
 
@@ -105,37 +145,61 @@ class CFRTrainer:
             node_util += strategy[idx] * util_value
 
         if update_player is None or update_player == player:
-            if player == 0:
-                opponent_reach = reach_p1
-                deltas = [opponent_reach * (util_value - node_util) for util_value in util]
-            else:
-                opponent_reach = reach_p0
-                deltas = [opponent_reach * (node_util - util_value) for util_value in util]
-            self._accumulate_regret(key, infoset, deltas)
-
-            weight = reach_p0 if player == 0 else reach_p1
-            if self.config.use_plus and self.config.linear_weighting and not self.config.use_dcfr:
-                weight *= self.iteration
-            for idx, _ in enumerate(actions):
-                infoset.strategy_sum[idx] += weight * strategy[idx]
-
+            self._update_infoset(key, infoset, player, strategy, util, node_util, reach_p0, reach_p1)
         return node_util
 
+    def _update_infoset(
+        self,
+        key: str,
+        infoset: InfoSet,
+        player: int,
+        strategy: List[float],
+        util: List[float],
+        node_util: float,
+        reach_p0: float,
+        reach_p1: float,
+    ) -> None:
+        # Post-order update at one visit of an update-player node: regrets, then strategy sums.
+        actions = infoset.actions
+        if player == 0:
+            opponent_reach = reach_p1
+            deltas = [opponent_reach * (util_value - node_util) for util_value in util]
+        else:
+            opponent_reach = reach_p0
+            deltas = [opponent_reach * (node_util - util_value) for util_value in util]
+        self._accumulate_regret(key, infoset, deltas)
+
+        weight = reach_p0 if player == 0 else reach_p1
+        if self.config.use_plus and self.config.linear_weighting and not self.config.use_dcfr:
+            weight *= self.iteration
+        if self.discount is not None:
+            weight /= self.discount.strat
+        for idx, _ in enumerate(actions):
+            infoset.strategy_sum[idx] += weight * strategy[idx]
+
+    def _root(self):
+        return self.game.initial_state()
+
     def run(self, iterations: int) -> None:
         for _ in range(iterations):
             self.iteration += 1
+            if self.profiler is not None:
+                self.profiler.begin_iteration(self.iteration)
+            self._advance_discount()
             if self.config.alternating:
                 # Alternating updates: separate traversals per player per iteration.
                 self._pending_regret.clear()
-                self._cfr(self.game.initial_state(), 1.0, 1.0, update_player=0)
+                self._cfr(self._root(), 1.0, 1.0, update_player=0)
                 self._apply_regret_updates()
                 self._pending_regret.clear()
-                self._cfr(self.game.initial_state(), 1.0, 1.0, update_player=1)
+                self._cfr(self._root(), 1.0, 1.0, update_player=1)
                 self._apply_regret_updates()
             else:
                 self._pending_regret.clear()
-                self._cfr(self.game.initial_state(), 1.0, 1.0, update_player=None)
+                self._cfr(self._root(), 1.0, 1.0, update_player=None)
                 self._apply_regret_updates()
+            if self.profiler is not None:
+                self.profiler.end_iteration()
 
     def average_strategy_profile(self) -> Dict[str, Dict[str, float]]:
         profile: Dict[str, Dict[str, float]] = {}
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import random
+from array import array
+from typing import List, Sequence, Tuple
+
+from games.river_holdem import RiverHoldemGame
+
+
+def build_alias(weights: Sequence[float]) -> Tuple[List[float], List[int]]:
+    # Vose's alias method: slot k keeps itself with probability prob[k], else yields alias[k].
+    count = len(weights)
+    total = sum(weights)
+    if count == 0 or total <= 0.0:
+        raise ValueError("No weight to sample from")
+    scaled = [weight * count / total for weight in weights]
+    prob = [1.0 for _ in range(count)]
+    alias = list(range(count))
+    small = [idx for idx, value in enumerate(scaled) if value < 1.0]
+    large = [idx for idx, value in enumerate(scaled) if value >= 1.0]
+    while small and large:
+        low = small.pop()
+        high = large.pop()
+        prob[low] = scaled[low]
+        alias[low] = high
+        scaled[high] = scaled[high] + scaled[low] - 1.0
+        if scaled[high] < 1.0:
+            small.append(high)
+        else:
+            large.append(high)
+    # Leftovers are 1.0 up to rounding and keep themselves.
+    return prob, alias
+
+
+class DealSampler:
+    # Draws (P0 hand, P1 hand) index pairs with probability proportional to
+    # weight0 * weight1 over non-blocking pairs, using one uniform variate per hand.
+    # P0 has an alias table over its marginal (weight times unblocked P1 mass); every P0 hand
+    # has a conditional alias table over the P1 hands it does not block. Conditional tables
+    # are stored flat: P0 hand i owns slots [offsets[i], offsets[i + 1]), and each slot holds
+    # the P1 hand index, its keep probability and the local alias.
+    def __init__(self, game: RiverHoldemGame, rng: random.Random) -> None:
+        self.rng = rng
+        p1_hands = game.hands[1]
+        p1_weights = game.hand_weights[1]
+        live = [idx for idx, weight in enumerate(p1_weights) if weight > 0.0]
+        self.offsets = array("l", [0])
+        self.p1_index = array("i")
+        self.p1_prob = array("d")
+        self.p1_alias = array("i")
+        p0_mass = []
+        for hand in game.hands[0]:
+            first, second = hand.cards
+            candidates = [
+                idx for idx in live if first not in p1_hands[idx].cards and second not in p1_hands[idx].cards
+            ]
+            weights = [p1_weights[idx] for idx in candidates]
+            mass = sum(weights)
+            if mass > 0.0:
+                prob, alias = build_alias(weights)
+                self.p1_index.extend(candidates)
+                self.p1_prob.extend(prob)
+                self.p1_alias.extend(alias)
+            self.offsets.append(len(self.p1_index))
+            p0_mass.append(mass)
+        self.p0_prob, self.p0_alias = build_alias(
+            [weight * mass for weight, mass in zip(game.hand_weights[0], p0_mass)]
+        )
+
+    def sample(self) -> Tuple[int, int]:
+        return self.sample_batch(1)[0]
+
+    def sample_batch(self, count: int) -> List[Tuple[int, int]]:
+        # Two variates per deal, P0 first; table lookups are hoisted out of the loop.
+        random_value = self.rng.random
+        p0_prob = self.p0_prob
+        p0_alias = self.p0_alias
+        offsets = self.offsets
+        p1_index = self.p1_index
+        p1_prob = self.p1_prob
+        p1_alias = self.p1_alias
+        num_p0 = len(p0_prob)
+        last_p0 = num_p0 - 1
+        deals = []
+        for _ in range(count):
+            scaled = random_value() * num_p0
+            slot = min(int(scaled), last_p0)
+            p0 = slot if scaled - slot < p0_prob[slot] else p0_alias[slot]
+            lo = offsets[p0]
+            size = offsets[p0 + 1] - lo
+            scaled = random_value() * size
+            slot = min(int(scaled), size - 1)
+            local = slot if scaled - slot < p1_prob[lo + slot] else p1_alias[lo + slot]
+            deals.append((p0, p1_index[lo + local]))
+        return deals
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from math import pow
+
+# Once a cumulative factor drops below this, trainers fold it back into their tables
+# (rescale) so stored values never overflow. With beta=0 negative regrets halve every
+# iteration, which reaches the floor after roughly 330 iterations; the others rarely do.
+RESCALE_FLOOR = 1e-100
+# float32 tables top out near 3e38, so they fold the factors in much earlier.
+FLOAT32_RESCALE_FLOOR = 1e-20
+
+
+@dataclass
+class LazyDiscount:
+    # DCFR discounting kept as cumulative scale factors instead of rescaling tables.
+    # Tables hold "stored" values; the real values are
+    #   regret   = stored * (pos if stored > 0 else neg)
+    #   strategy = stored * strat
+    # Discounting never flips a sign, so advancing the products is equivalent to rescaling
+    # every entry. Entries are converted only where they are written (value / factor), and
+    # regret matching and average normalization read stored values directly because one
+    # factor per sign cancels within a row.
+    alpha: float
+    beta: float
+    gamma: float
+    iteration: int = 0
+    pos: float = 1.0
+    neg: float = 1.0
+    strat: float = 1.0
+    floor: float = RESCALE_FLOOR
+
+    def advance(self, iteration: int) -> None:
+        for t in range(self.iteration + 1, iteration + 1):
+            pos_base = pow(float(t), self.alpha)
+            neg_base = pow(float(t), self.beta)
+            self.pos *= pos_base / (pos_base + 1.0)
+            self.neg *= neg_base / (neg_base + 1.0)
+            self.strat *= pow(float(t) / (float(t) + 1.0), self.gamma)
+        self.iteration = max(self.iteration, iteration)
+
+    def needs_rescale(self) -> bool:
+        return self.pos < self.floor or self.neg < self.floor or self.strat < self.floor
+
+    def rescale_regrets(self, row) -> None:
+        # Convert one stored regret row (list) to real values in place.
+        pos = self.pos
+        neg = self.neg
+        for idx, value in enumerate(row):
+            row[idx] = value * pos if value > 0.0 else value * neg
+
+    def rescale_strategy(self, row) -> None:
+        strat = self.strat
+        for idx, value in enumerate(row):
+            row[idx] = value * strat
+
+    def reset_factors(self) -> None:
+        # Call after every table has been rescaled.
+        self.pos = 1.0
+        self.neg = 1.0
+        self.strat = 1.0
+
+    def to_json(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_json(cls, data: dict) -> "LazyDiscount":
+        return cls(**data)
+
+
+def make_discount(config) -> LazyDiscount | None:
+    # Shared by CFRConfig and VectorCFRConfig: None unless use_dcfr is set.
+    if not config.use_dcfr:
+        return None
+    floor = FLOAT32_RESCALE_FLOOR if getattr(config, "storage", "list") == "float32" else RESCALE_FLOOR
+    return LazyDiscount(config.dcfr_alpha, config.dcfr_beta, config.dcfr_gamma, floor=floor)
@@ -4,6 +4,7 @@ from dataclasses import dataclass, field
 from typing import Dict, List
 
 from algorithms.evaluation import best_response_strategy
+from algorithms.profiler import SolverProfiler
 
 
 @dataclass
@@ -37,6 +38,7 @@ class FictitiousPlayTrainer:
         self.total_weight = {0: 0.0, 1: 0.0}
         self.last_weight = {0: 0.0, 1: 0.0}
         self.iteration = 0
+        self.profiler: SolverProfiler | None = None
 
     def _get_infoset(self, player: int, key: str, actions: List[str]) -> FPInfoSet:
         infoset = self.infosets[player].get(key)
@@ -84,6 +86,8 @@ class FictitiousPlayTrainer:
     def run(self, iterations: int) -> None:
         for _ in range(iterations):
             self.iteration += 1
+            if self.profiler is not None:
+                self.profiler.begin_iteration(self.iteration)
             if self.config.alternating:
                 br0 = self._best_response(0)
                 self._update_player(0, br0)
@@ -94,6 +98,8 @@ class FictitiousPlayTrainer:
                 br1 = self._best_response(1)
                 self._update_player(0, br0)
                 self._update_player(1, br1)
+            if self.profiler is not None:
+                self.profiler.end_iteration()
 
     def average_strategy_profile(self) -> Dict[str, Dict[str, float]]:
         profile: Dict[str, Dict[str, float]] = {}
@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+import math
+import random
+import time
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Dict, List, Tuple
+
+from algorithms.vector_eval import (
+    CardRemovalIndex,
+    ResolvedProfile,
+    build_card_removal_index,
+    build_strength_summary,
+    removal_prefix_sums,
+    resolve_profile,
+    valid_weights_card_removal,
+)
+from games.river_holdem import RiverHoldemGame
+from games.river_tree import TERMINAL_FOLD, TERMINAL_NONE, FlatRiverTree
+
+Profile = Dict[str, Tuple[List[str], List[List[float]]]]
+
+
+@dataclass
+class LBRConfig:
+    # Wall-clock budget per estimate; sampling stops at the budget or at max_samples hands per
+    # player, whichever comes first, but never before min_samples so the interval is defined.
+    time_budget: float = 5.0
+    max_samples: int = 1000
+    min_samples: int = 20
+    confidence: float = 0.95
+    # Every estimate restarts from this seed, so successive checkpoints share their samples.
+    seed: int = 0
+
+
+@dataclass
+class LBREstimate:
+    # value is on the exploitability scale, (lbr0 + lbr1 - base pot) / 2: a lower bound on
+    # exploitability up to the sampling error given by half_width.
+    value: float
+    half_width: float
+    player_values: Tuple[float, float]
+    samples: Tuple[int, int]
+    seconds: float
+
+    def as_record(self) -> dict:
+        return {
+            "metric": "lbr",
+            "ci_half_width": self.half_width,
+            "lbr_values": list(self.player_values),
+            "lbr_samples": list(self.samples),
+            "lbr_seconds": self.seconds,
+        }
+
+    def describe(self) -> str:
+        return f"{self.value:.6f} +/- {self.half_width:.6f} ({self.samples[0]}+{self.samples[1]} hands)"
+
+
+class LocalBestResponse:
+    # Sampled local best response on the river tree. A sample is one hand of the LBR player;
+    # given that hand, play is evaluated exactly over the opponent's hands and actions: the
+    # opponent follows the profile, and the LBR player keeps the opponent's range updated by
+    # Bayes' rule and takes, at each of its nodes, the action with the best one-step-lookahead
+    # value. Lookahead lets the opponent answer once from the profile and then values any
+    # unfinished line as the LBR player calling down to showdown. LBR is a legal strategy, so
+    # its value never exceeds the best response's: estimates bound exploitability from below.
+    # Hands are drawn without replacement and combined with the joint weights of
+    # vector_eval.weighted_br_value (range weight times unblocked opponent mass) in a ratio
+    # estimator, so the interval shrinks to zero once every hand has been played.
+    def __init__(
+        self,
+        game: RiverHoldemGame,
+        config: LBRConfig | None = None,
+        removal: Dict[int, CardRemovalIndex] | None = None,
+    ) -> None:
+        self.game = game
+        self.config = config or LBRConfig()
+        self.tree = game.flat_tree()
+        if removal is None:
+            removal = {
+                player: build_card_removal_index(game.hands[player], build_strength_summary(game.hands[1 - player]))
+                for player in (0, 1)
+            }
+        self.removal = removal
+        self.joint: List[List[float]] = []
+        for player in (0, 1):
+            valid = valid_weights_card_removal(removal[player], game.hand_weights[1 - player])
+            self.joint.append([weight * mass for weight, mass in zip(game.hand_weights[player], valid)])
+
+    def estimate(self, profile: Dict[int, Profile | ResolvedProfile]) -> LBREstimate:
+        config = self.config
+        start = time.perf_counter()
+        rng = random.Random(config.seed)
+        walks = {}
+        order = {}
+        for player in (0, 1):
+            opp = 1 - player
+            opponent_profile = profile[opp]
+            if not isinstance(opponent_profile, ResolvedProfile):
+                opponent_profile = resolve_profile(self.tree, opponent_profile, opp, len(self.game.hands[opp]))
+            walks[player] = _LBRWalk(self.tree, player, self.removal[player], opponent_profile, self.game)
+            order[player] = [hand for hand, joint in enumerate(self.joint[player]) if joint > 0.0]
+            rng.shuffle(order[player])
+        samples: Dict[int, List[Tuple[float, float]]] = {0: [], 1: []}
+        while True:
+            # Alternate players; a player whose hands are exhausted is exact and stops sampling.
+            pending = [player for player in (0, 1) if len(samples[player]) < len(order[player])]
+            if not pending:
+                break
+            for player in pending:
+                hand = order[player][len(samples[player])]
+                samples[player].append((self.joint[player][hand], walks[player].hand_value(hand)))
+            count = min(len(samples[player]) for player in pending)
+            if count >= config.max_samples:
+                break
+            if count >= config.min_samples and time.perf_counter() - start >= config.time_budget:
+                break
+
+        z = NormalDist().inv_cdf(0.5 + config.confidence / 2.0)
+        means = []
+        variance = 0.0
+        for player in (0, 1):
+            drawn = samples[player]
+            weight = sum(joint for joint, _ in drawn)
+            mean = sum(joint * value for joint, value in drawn) / weight if weight > 0.0 else 0.0
+            means.append(mean)
+            count = len(drawn)
+            if 1 < count < len(order[player]):
+                # Ratio-estimator variance with the finite-population correction.
+                spread = sum((joint * (value - mean)) ** 2 for joint, value in drawn) / (count - 1)
+                mean_joint = weight / count
+                variance += (1.0 - count / len(order[player])) * spread / (count * mean_joint**2)
+        return LBREstimate(
+            value=(means[0] + means[1] - float(self.game.base_pot)) / 2.0,
+            half_width=z * math.sqrt(variance) / 2.0,
+            player_values=(means[0], means[1]),
+            samples=(len(samples[0]), len(samples[1])),
+            seconds=time.perf_counter() - start,
+        )
+
+
+class _LBRWalk:
+    # One player's LBR against one opponent profile. The opponent's reach at a node does not
+    # depend on the LBR hand (LBR actions leave it unchanged), so each visited node's reach and
+    # its card-removal prefix sums are built once and shared by every sampled hand; a hand then
+    # reads its blocked, won and tied opponent mass in O(1) per node, with the arithmetic of
+    # vector_eval.showdown_values_card_removal. Values are scaled by the unblocked opponent
+    # mass, which leaves comparisons between actions unchanged.
+    def __init__(
+        self,
+        tree: FlatRiverTree,
+        player: int,
+        removal: CardRemovalIndex,
+        opponent: ResolvedProfile,
+        game: RiverHoldemGame,
+    ) -> None:
+        self.tree = tree
+        self.player = player
+        self.removal = removal
+        self.opponent = opponent
+        self.root_weights = list(game.hand_weights[1 - player])
+        self.reach: Dict[int, List[float]] = {}
+        self.sums: Dict[int, Tuple[List[float], List[float], List[float]]] = {}
+
+    def _reach(self, node: int) -> List[float]:
+        reach = self.reach.get(node)
+        if reach is not None:
+            return reach
+        if node == 0:
+            reach = self.root_weights
+        else:
+            parent = self.tree.parent[node]
+            reach = self._reach(parent)
+            if self.tree.player[parent] != self.player:
+                a_idx = node - self.tree.child_start[parent]
+                strategy = self.opponent.strategy_at(parent)
+                reach = [weight * row[a_idx] for weight, row in zip(reach, strategy)]
+        self.reach[node] = reach
+        return reach
+
+    def _sums(self, node: int) -> Tuple[List[float], List[float], List[float]]:
+        sums = self.sums.get(node)
+        if sums is None:
+            reach = self._reach(node)
+            prefix, card_prefix = removal_prefix_sums(self.removal, reach)
+            sums = self.sums[node] = (reach, prefix, card_prefix)
+        return sums
+
+    def _masses(self, node: int, hand: int) -> Tuple[float, float, float]:
+        # (won, tied, unblocked) opponent mass for one hand at one node.
+        index = self.removal
+        weights, prefix, card_prefix = self._sums(node)
+        total = prefix[-1]
+        if total <= 0.0:
+            return 0.0, 0.0, 0.0
+        start = index.starts[hand]
+        end = index.ends[hand]
+        first_base = card_prefix[index.first_base[hand]]
+        second_base = card_prefix[index.second_base[hand]]
+        first_start = card_prefix[index.first_start[hand]]
+        second_start = card_prefix[index.second_start[hand]]
+        same = index.same_index[hand]
+        same_weight = weights[same] if same >= 0 else 0.0
+        won = prefix[start] - (first_start - first_base) - (second_start - second_base)
+        tied = (
+            prefix[end]
+            - prefix[start]
+            - (card_prefix[index.first_end[hand]] - first_start)
+            - (card_prefix[index.second_end[hand]] - second_start)
+            + same_weight
+        )
+        valid = (
+            total
+            - (card_prefix[index.first_top[hand]] - first_base)
+            - (card_prefix[index.second_top[hand]] - second_base)
+            + same_weight
+        )
+        return won, tied, valid
+
+    def _showdown(self, node: int, hand: int, pot_total: float, contrib: float) -> float:
+        won, tied, valid = self._masses(node, hand)
+        return won * pot_total + tied * (pot_total / 2.0) - contrib * valid
+
+    def _terminal(self, node: int, hand: int) -> float:
+        tree = self.tree
+        pot_total = tree.pot[node]
+        contrib = tree.contrib(node, self.player)
+        if tree.terminal[node] == TERMINAL_FOLD:
+            payoff = pot_total - contrib if tree.fold_winner[node] == self.player else -contrib
+            return payoff * self._masses(node, hand)[2]
+        return self._showdown(node, hand, pot_total, contrib)
+
+    def _call_down(self, node: int, hand: int) -> float:
+        # Leaf value of an unfinished line: match the opponent's contribution and show down.
+        tree = self.tree
+        contrib = tree.contrib(node, self.player)
+        to_call = max(tree.contrib(node, 1 - self.player) - contrib, 0)
+        return self._showdown(node, hand, tree.pot[node] + to_call, contrib + to_call)
+
+    def _lookahead(self, node: int, hand: int) -> float:
+        tree = self.tree
+        if tree.terminal[node] != TERMINAL_NONE:
+            return self._terminal(node, hand)
+        if tree.player[node] == self.player:
+            return self._call_down(node, hand)
+        value = 0.0
+        for child in tree.children(node):
+            if tree.terminal[child] != TERMINAL_NONE:
+                value += self._terminal(child, hand)
+            else:
+                value += self._call_down(child, hand)
+        return value
+
+    def _play(self, node: int, hand: int) -> float:
+        tree = self.tree
+        if tree.terminal[node] != TERMINAL_NONE:
+            return self._terminal(node, hand)
+        children = tree.children(node)
+        if tree.player[node] != self.player:
+            return sum(self._play(child, hand) for child in children if self._sums(child)[1][-1] > 0.0)
+        # First maximum, as in exact best response.
+        best = max(children, key=lambda child: self._lookahead(child, hand))
+        return self._play(best, hand)
+
+    def hand_value(self, hand: int) -> float:
+        # Expected payoff of the LBR policy for one hand, per unit of unblocked opponent mass.
+        valid = self._masses(0, hand)[2]
+        if valid <= 0.0:
+            return 0.0
+        return self._play(0, hand) / valid
+
+
+class LBRMetric:
+    # run_with_budget adapter: calling it scores a profile by its LBR estimate, and details()
+    # returns the last estimate's interval and sample counts for the checkpoint record.
+    def __init__(
+        self,
+        game: RiverHoldemGame,
+        config: LBRConfig | None = None,
+        removal: Dict[int, CardRemovalIndex] | None = None,
+    ) -> None:
+        self.lbr = LocalBestResponse(game, config, removal)
+        self.last: LBREstimate | None = None
+
+    def __call__(self, profile: Dict[int, Profile | ResolvedProfile]) -> float:
+        self.last = self.lbr.estimate(profile)
+        return self.last.value
+
+    def details(self) -> dict:
+        return self.last.as_record() if self.last is not None else {}
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from typing import Dict, List
+
+from algorithms.cfr import CFRConfig
+from algorithms.discount import LazyDiscount, make_discount
+from algorithms.profiler import SolverProfiler
+from games.game_tree import NODE_CHANCE, NODE_TERMINAL
+from games.leduc import LeducPoker
+from games.leduc_public import NUM_RANKS, LeducPublicTree, leduc_public_tree
+
+Rows = List[List[float]]
+
+
+@dataclass
+class LeducVectorCFRConfig:
+    use_plus: bool = False
+    linear_weighting: bool = False
+    alternating: bool = True
+    use_dcfr: bool = False
+    dcfr_alpha: float = 1.5
+    dcfr_beta: float = 0.0
+    dcfr_gamma: float = 2.0
+    # Predictive regret matching; with use_plus this is PCFR+ (see VectorCFRConfig).
+    use_predictive: bool = False
+
+
+def leduc_vector_config(config: CFRConfig) -> LeducVectorCFRConfig:
+    # The same variant as a CFRTrainer config. Vanilla CFR and DCFR apply regrets once per
+    # traversal here, whereas CFRTrainer applies them at every visit, so only the deferred
+    # variants (CFR+, DCFR+, PCFR+) reproduce CFRTrainer's numbers.
+    return LeducVectorCFRConfig(**{field.name: getattr(config, field.name) for field in fields(LeducVectorCFRConfig)})
+
+
+def _matvec(matrix: Rows, vector: List[float]) -> List[float]:
+    return [sum(weight * value for weight, value in zip(row, vector)) for row in matrix]
+
+
+def _regret_matching(regrets: Rows, prediction: Rows | None) -> Rows:
+    strategy = []
+    for r_idx, row in enumerate(regrets):
+        if prediction is not None:
+            row = [r + m for r, m in zip(row, prediction[r_idx])]
+        positives = [max(r, 0.0) for r in row]
+        normalizing = sum(positives)
+        if normalizing > 0.0:
+            strategy.append([r / normalizing for r in positives])
+        else:
+            strategy.append([1.0 / len(row) for _ in row])
+    return strategy
+
+
+def _normalize_rows(sums: Rows) -> Rows:
+    strategy = []
+    for row in sums:
+        normalizing = sum(row)
+        if normalizing > 0.0:
+            strategy.append([s / normalizing for s in row])
+        else:
+            strategy.append([1.0 / len(row) for _ in row])
+    return strategy
+
+
+class LeducVectorCFRTrainer:
+    # Vector-form CFR on Leduc's public tree (games.leduc_public): one traversal per update
+    # player carries a reach vector per private rank, terminals are 3x3 chance-weighted payoff
+    # matrices, and each decision node holds one (rank x action) row table, i.e. the regrets of
+    # NUM_RANKS LeducPoker infosets at once. Update rules follow VectorCFRTrainer. The private
+    # deal and the board are folded into the terminal matrices, so values are exact expected
+    # counterfactual values and regrets differ from CFRTrainer's only by a per-infoset scale.
+    def __init__(self, game: LeducPoker, config: LeducVectorCFRConfig | None = None) -> None:
+        self.game = game
+        self.config = config or LeducVectorCFRConfig()
+        self.tree: LeducPublicTree = leduc_public_tree(game)
+        self.iteration = 0
+        self.profiler: SolverProfiler | None = None
+        self.regret_sum: Dict[int, Rows] = {}
+        self.strategy_sum: Dict[int, Rows] = {}
+        self.prediction: Dict[int, Rows] = {}
+        for node in self.tree.decision_nodes:
+            num_actions = self.tree.child_count[node]
+            self.regret_sum[node] = [[0.0] * num_actions for _ in range(NUM_RANKS)]
+            self.strategy_sum[node] = [[0.0] * num_actions for _ in range(NUM_RANKS)]
+            if self.config.use_predictive:
+                self.prediction[node] = [[0.0] * num_actions for _ in range(NUM_RANKS)]
+        self.discount: LazyDiscount | None = make_discount(self.config)
+
+    def current_strategies(self) -> Dict[int, Rows]:
+        return {
+            node: _regret_matching(self.regret_sum[node], self.prediction.get(node))
+            for node in self.tree.decision_nodes
+        }
+
+    def _advance_discount(self) -> None:
+        if self.discount is None:
+            return
+        self.discount.advance(self.iteration)
+        if not self.discount.needs_rescale():
+            return
+        discount = self.discount
+        for node in self.tree.decision_nodes:
+            for row in self.regret_sum[node]:
+                discount.rescale_regrets(row)
+            for row in self.strategy_sum[node]:
+                discount.rescale_strategy(row)
+            for row in self.prediction.get(node, ()):
+                for a_idx, value in enumerate(row):
+                    row[a_idx] = value * discount.pos
+        discount.reset_factors()
+
+    def _apply_regret(self, node: int, deltas: Rows) -> None:
+        # Same stored-value conventions as VectorCFRTrainer (see algorithms.discount).
+        pos = self.discount.pos if self.discount is not None else 1.0
+        neg = self.discount.neg if self.discount is not None else 1.0
+        if node in self.prediction:
+            self.prediction[node] = [[delta / pos for delta in row] for row in deltas]
+        for row, delta_row in zip(self.regret_sum[node], deltas):
+            for a_idx, delta in enumerate(delta_row):
+                value = row[a_idx]
+                value = (value * pos if value > 0.0 else value * neg) + delta
+                if self.config.use_plus:
+                    value = max(0.0, value)
+                row[a_idx] = value / pos if value > 0.0 else value / neg
+
+    def _traverse(self, update_player: int, strategies: Dict[int, Rows]) -> Dict[int, Rows]:
+        # Returns the regret deltas per own decision node; strategy sums are updated in place.
+        tree = self.tree
+        reach_p: List[List[float] | None] = [None] * tree.num_nodes
+        reach_opp: List[List[float] | None] = [None] * tree.num_nodes
+        reach_p[0] = [1.0] * NUM_RANKS
+        reach_opp[0] = [1.0] * NUM_RANKS
+        for node in range(tree.num_nodes):
+            actor = tree.player[node]
+            if actor == NODE_TERMINAL:
+                continue
+            for a_idx, child in enumerate(tree.children(node)):
+                if actor == NODE_CHANCE:
+                    reach_p[child] = reach_p[node]
+                    reach_opp[child] = reach_opp[node]
+                    continue
+                strategy = strategies[node]
+                own = reach_p[node] if actor == update_player else reach_opp[node]
+                child_reach = [own[r] * strategy[r][a_idx] for r in range(NUM_RANKS)]
+                if actor == update_player:
+                    reach_p[child] = child_reach
+                    reach_opp[child] = reach_opp[node]
+                else:
+                    reach_p[child] = reach_p[node]
+                    reach_opp[child] = child_reach
+
+        regret_weight = (
+            float(self.iteration)
+            if self.config.linear_weighting and not self.config.use_plus and not self.config.use_dcfr
+            else 1.0
+        )
+        weight_scale = float(self.iteration) if self.config.linear_weighting and not self.config.use_dcfr else 1.0
+        if self.discount is not None:
+            weight_scale = 1.0 / self.discount.strat
+
+        payoff = tree.payoff[update_player]
+        values: List[List[float] | None] = [None] * tree.num_nodes
+        deltas: Dict[int, Rows] = {}
+        for node in range(tree.num_nodes - 1, -1, -1):
+            actor = tree.player[node]
+            if actor == NODE_TERMINAL:
+                values[node] = _matvec(payoff[node], reach_opp[node])
+                continue
+            child_values = [values[child] for child in tree.children(node)]
+            if actor != update_player:
+                values[node] = [sum(column) for column in zip(*child_values)]
+                continue
+            strategy = strategies[node]
+            node_values = [
+                sum(strategy[r][a_idx] * child_values[a_idx][r] for a_idx in range(len(child_values)))
+                for r in range(NUM_RANKS)
+            ]
+            deltas[node] = [
+                [(child_values[a_idx][r] - node_values[r]) * regret_weight for a_idx in range(len(child_values))]
+                for r in range(NUM_RANKS)
+            ]
+            reach = reach_p[node]
+            for r, row in enumerate(self.strategy_sum[node]):
+                weight = reach[r] * weight_scale
+                for a_idx, prob in enumerate(strategy[r]):
+                    row[a_idx] += weight * prob
+            values[node] = node_values
+        return deltas
+
+    def run(self, iterations: int) -> None:
+        for _ in range(iterations):
+            self.iteration += 1
+            if self.profiler is not None:
+                self.profiler.begin_iteration(self.iteration)
+            self._advance_discount()
+            if self.config.alternating:
+                for player in (0, 1):
+                    for node, node_deltas in self._traverse(player, self.current_strategies()).items():
+                        self._apply_regret(node, node_deltas)
+            else:
+                strategies = self.current_strategies()
+                updates = [self._traverse(player, strategies) for player in (0, 1)]
+                for player_deltas in updates:
+                    for node, node_deltas in player_deltas.items():
+                        self._apply_regret(node, node_deltas)
+            if self.profiler is not None:
+                self.profiler.end_iteration()
+
+    def average_strategy_profile(self) -> Dict[str, Dict[str, float]]:
+        # Keyed like CFRTrainer, so algorithms.evaluation and the tabular evaluator accept it.
+        profile: Dict[str, Dict[str, float]] = {}
+        for node in self.tree.decision_nodes:
+            actions = self.tree.actions[node]
+            for r, row in enumerate(_normalize_rows(self.strategy_sum[node])):
+                profile[self.tree.keys[node][r]] = {action: row[idx] for idx, action in enumerate(actions)}
+        return profile
+
+
+def public_profile_rows(tree: LeducPublicTree, profile: Dict[str, Dict[str, float]]) -> Dict[int, Rows]:
+    # (rank x action) rows per decision node; infosets missing from the profile play uniformly.
+    strategies = {}
+    for node in tree.decision_nodes:
+        actions = tree.actions[node]
+        rows = []
+        for key in tree.keys[node]:
+            probs = profile.get(key)
+            rows.append([1.0 / len(actions) for _ in actions] if probs is None else [probs[a] for a in actions])
+        strategies[node] = rows
+    return strategies
+
+
+def leduc_best_response_value(tree: LeducPublicTree, strategies: Dict[int, Rows], br_player: int) -> float:
+    # One forward pass of the opponent's reach vector and one backward pass where the best
+    # responder takes the per-rank maximum (each (node, rank) is one infoset).
+    reach: List[List[float] | None] = [None] * tree.num_nodes
+    reach[0] = [1.0] * NUM_RANKS
+    for node in range(tree.num_nodes):
+        actor = tree.player[node]
+        if actor == NODE_TERMINAL:
+            continue
+        for a_idx, child in enumerate(tree.children(node)):
+            if actor == NODE_CHANCE or actor == br_player:
+                reach[child] = reach[node]
+            else:
+                strategy = strategies[node]
+                reach[child] = [reach[node][o] * strategy[o][a_idx] for o in range(NUM_RANKS)]
+    payoff = tree.payoff[br_player]
+    values: List[List[float] | None] = [None] * tree.num_nodes
+    for node in range(tree.num_nodes - 1, -1, -1):
+        actor = tree.player[node]
+        if actor == NODE_TERMINAL:
+            values[node] = _matvec(payoff[node], reach[node])
+            continue
+        child_values = [values[child] for child in tree.children(node)]
+        if actor == br_player:
+            values[node] = [max(column) for column in zip(*child_values)]
+        else:
+            values[node] = [sum(column) for column in zip(*child_values)]
+    return sum(values[0])
+
+
+def leduc_vector_exploitability(game: LeducPoker, profile: Dict[str, Dict[str, float]]) -> float:
+    # Same value as algorithms.evaluation.exploitability on LeducPoker.
+    tree = leduc_public_tree(game)
+    strategies = public_profile_rows(tree, profile)
+    return 0.5 * (leduc_best_response_value(tree, strategies, 0) + leduc_best_response_value(tree, strategies, 1))
@@ -5,6 +5,7 @@ from dataclasses import dataclass
 from typing import Dict, List
 
 from algorithms.infoset import InfoSet
+from algorithms.profiler import SolverProfiler
 
 
 @dataclass
@@ -19,6 +20,7 @@ class ExternalSamplingMCCFRTrainer:
         self.infosets: Dict[str, InfoSet] = {}
         self.rng = random.Random(self.config.seed)
         self.iteration = 0
+        self.profiler: SolverProfiler | None = None
 
     def _get_infoset(self, state, player: int) -> InfoSet:
         key = self.game.infoset_key(state, player)
@@ -79,8 +81,12 @@ class ExternalSamplingMCCFRTrainer:
     def run(self, iterations: int) -> None:
         for _ in range(iterations):
             self.iteration += 1
+            if self.profiler is not None:
+                self.profiler.begin_iteration(self.iteration)
             self._traverse(self.game.initial_state(), target_player=0, player_reach=1.0)
             self._traverse(self.game.initial_state(), target_player=1, player_reach=1.0)
+            if self.profiler is not None:
+                self.profiler.end_iteration()
 
     def average_strategy_profile(self) -> Dict[str, Dict[str, float]]:
         profile: Dict[str, Dict[str, float]] = {}
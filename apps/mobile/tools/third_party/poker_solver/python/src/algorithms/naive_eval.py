@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import Dict, List, Sequence, Tuple
 
 from algorithms.vector_eval import (
+    BR_TIE_TOLERANCE,
     action_tokens,
     build_blocked_indices,
     build_strength_summary,
@@ -91,7 +92,7 @@ def best_response_naive(
             best_val = action_vals[0][h_idx]
             for a_idx in range(1, len(actions)):
                 value = action_vals[a_idx][h_idx]
-                if value > best_val:
+                if value - best_val > BR_TIE_TOLERANCE * max(1.0, abs(best_val)):
                     best_val = value
                     best_idx = a_idx
             row = [0.0 for _ in range(len(actions))]
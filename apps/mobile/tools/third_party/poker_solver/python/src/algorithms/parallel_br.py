@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from array import array
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Tuple
+
+from algorithms.vector_eval import (
+    CardRemovalIndex,
+    StrengthSummary,
+    best_response_backward,
+    best_response_reach,
+    finish_best_response,
+    slice_card_removal_index,
+    valid_weights_card_removal,
+    weighted_br_value,
+)
+from games.river_holdem import RiverHoldemGame
+from games.river_tree import TERMINAL_NONE, FlatRiverTree
+
+Profile = Dict[str, Tuple[List[str], List[List[float]]]]
+
+# Per-process copies of the static inputs, installed once by the pool initializer.
+_worker_tree: FlatRiverTree | None = None
+_worker_shards: Dict[int, List[CardRemovalIndex]] = {}
+
+
+def _init_worker(tree: FlatRiverTree, shards: Dict[int, List[CardRemovalIndex]]) -> None:
+    global _worker_tree, _worker_shards
+    _worker_tree = tree
+    _worker_shards = shards
+
+
+def _run_shard(
+    shm_name: str,
+    target_player: int,
+    shard: int,
+    offsets: Dict[int, int],
+    num_opp: int,
+) -> Tuple[List[float], Dict[int, List[List[float]]]]:
+    tree = _worker_tree
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        view = shm.buf.cast("d")
+        # Only terminal reach is read by the backward pass; copy it out so the view can be released.
+        reach: List[List[float] | None] = [None for _ in range(tree.num_nodes)]
+        for node, offset in offsets.items():
+            reach[node] = view[offset : offset + num_opp].tolist()
+        view.release()
+    finally:
+        shm.close()
+    return best_response_backward(tree, target_player, _worker_shards[target_player][shard], reach)
+
+
+def _shard_bounds(num_hands: int, num_shards: int) -> List[Tuple[int, int]]:
+    num_shards = max(1, min(num_shards, num_hands))
+    bounds = []
+    for shard in range(num_shards):
+        bounds.append((num_hands * shard // num_shards, num_hands * (shard + 1) // num_shards))
+    return bounds
+
+
+class ParallelBestResponse:
+    # Process-pool best response: the parent runs the (cheap) opponent-reach forward pass
+    # and publishes terminal reach vectors in one shared-memory block; workers run the
+    # backward pass on contiguous slices of the target player's hands. Every hand's value
+    # is computed by the same code on the same inputs as the serial path, and results are
+    # concatenated in hand order, so values and exploitability match it bit-for-bit.
+    def __init__(
+        self,
+        game: RiverHoldemGame,
+        summaries: Dict[int, StrengthSummary],
+        removal: Dict[int, CardRemovalIndex],
+        workers: int,
+    ) -> None:
+        self.game = game
+        self.summaries = summaries
+        self.removal = removal
+        self.workers = max(1, workers)
+        self.tree = game.flat_tree()
+        self.terminals = [node for node in range(self.tree.num_nodes) if self.tree.terminal[node] != TERMINAL_NONE]
+        self.bounds = {player: _shard_bounds(len(game.hands[player]), self.workers) for player in (0, 1)}
+        shards = {
+            player: [slice_card_removal_index(removal[player], lo, hi) for lo, hi in self.bounds[player]]
+            for player in (0, 1)
+        }
+        self.valid_weights = {
+            player: valid_weights_card_removal(removal[player], game.hand_weights[1 - player]) for player in (0, 1)
+        }
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.tree, shards),
+        )
+
+    def close(self) -> None:
+        self._pool.shutdown()
+
+    def __enter__(self) -> "ParallelBestResponse":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _submit(self, targets: Dict[int, Profile]) -> Dict[int, Tuple[List[float], Dict[int, List[List[float]]]]]:
+        # All shards of every requested best response go to the pool together.
+        num_terminals = len(self.terminals)
+        layout: Dict[int, Dict[int, int]] = {}
+        size = 0
+        for player in targets:
+            num_opp = len(self.game.hands[1 - player])
+            layout[player] = {node: size + idx * num_opp for idx, node in enumerate(self.terminals)}
+            size += num_terminals * num_opp
+        shm = shared_memory.SharedMemory(create=True, size=max(8, size * 8))
+        try:
+            view = shm.buf.cast("d")
+            for player, opponent_profile in targets.items():
+                opp_weights = self.game.hand_weights[1 - player]
+                reach = best_response_reach(self.tree, player, opponent_profile, opp_weights)
+                num_opp = len(opp_weights)
+                for node, offset in layout[player].items():
+                    view[offset : offset + num_opp] = array("d", reach[node])
+            view.release()
+
+            futures: Dict[int, List[Future]] = {}
+            for player in targets:
+                num_opp = len(self.game.hands[1 - player])
+                futures[player] = [
+                    self._pool.submit(_run_shard, shm.name, player, shard, layout[player], num_opp)
+                    for shard in range(len(self.bounds[player]))
+                ]
+            results = {}
+            for player, player_futures in futures.items():
+                values: List[float] = []
+                br_matrices: Dict[int, List[List[float]]] = {}
+                for future in player_futures:
+                    shard_values, shard_matrices = future.result()
+                    values.extend(shard_values)
+                    for node, rows in shard_matrices.items():
+                        br_matrices.setdefault(node, []).extend(rows)
+                results[player] = (values, br_matrices)
+            return results
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def best_response(self, target_player: int, opponent_profile: Profile) -> Tuple[List[float], Profile]:
+        values, br_matrices = self._submit({target_player: opponent_profile})[target_player]
+        return finish_best_response(self.tree, values, br_matrices, self.valid_weights[target_player])
+
+    def exploitability(self, profile: Dict[int, Profile]) -> float:
+        # Both best responses run at once.
+        results = self._submit({0: profile[1], 1: profile[0]})
+        br_values = []
+        for player in (0, 1):
+            values, br_matrices = results[player]
+            values, _ = finish_best_response(self.tree, values, br_matrices, self.valid_weights[player])
+            br_values.append(weighted_br_value(self.game, player, self.removal[player], values))
+        return (br_values[0] + br_values[1] - float(self.game.base_pot)) / 2.0
@@ -0,0 +1,420 @@
+from __future__ import annotations
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Sequence, Tuple
+
+from algorithms.discount import LazyDiscount
+from algorithms.snapshot import flatten_rows
+from algorithms.storage import RowTable
+from algorithms.vector_cfr import VectorCFRConfig, VectorCFRTrainer, VectorInfoSet
+from games.river_holdem import RiverHoldemGame
+from games.river_tree import TERMINAL_NONE, FlatRiverTree
+
+# Per-node pending-update flags in the shared block.
+_PENDING_NONE = 0.0
+_PENDING_DELTAS = 1.0
+# Predictive variants only: the node was skipped (zero opponent reach), so its prediction is zeroed.
+_PENDING_CLEAR = 2.0
+
+
+def check_parallel_config(config: VectorCFRConfig) -> None:
+    if config.workers < 1:
+        raise ValueError(f"Parallel vector CFR needs at least one worker, got {config.workers}")
+    if config.alternating:
+        raise ValueError("Parallel vector CFR needs alternating=False (alternating traversals depend on each other)")
+    if config.engine != "list":
+        raise ValueError(f"Parallel vector CFR runs the list engine, not {config.engine!r}")
+    if config.storage == "float32":
+        raise ValueError("Parallel vector CFR keeps float64 shared tables; use storage 'list' or 'float64'")
+
+
+def split_tree(tree: FlatRiverTree, workers: int) -> Tuple[List[int], List[int]]:
+    # (top, frontier): top decision nodes are traversed by the parent, and the subtree under every
+    # frontier node is one task per player. The root is always split; after that the largest
+    # decision subtree is split while it holds more than 1/(2 * workers) of the tree's nodes, so
+    # each worker gets about two similar-sized tasks per player. Both lists are in level order.
+    sizes = [1 for _ in range(tree.num_nodes)]
+    for node in range(tree.num_nodes - 1, -1, -1):
+        if tree.terminal[node] == TERMINAL_NONE:
+            sizes[node] += sum(sizes[child] for child in tree.children(node))
+    limit = tree.num_nodes / (2 * max(1, workers))
+    top = [0]
+    frontier = list(tree.children(0))
+    while True:
+        candidates = [node for node in frontier if tree.terminal[node] == TERMINAL_NONE]
+        if not candidates:
+            break
+        largest = max(candidates, key=lambda node: (sizes[node], -node))
+        if sizes[largest] <= limit:
+            break
+        frontier.remove(largest)
+        top.append(largest)
+        frontier.extend(tree.children(largest))
+    return sorted(top), sorted(frontier)
+
+
+class SharedTableCFRTrainer(VectorCFRTrainer):
+    # VectorCFRTrainer whose regret, strategy-sum and prediction tables live in one float64
+    # shared-memory block, so several processes update one solve. Every regret change is
+    # deferred: traversals write each node's instantaneous regrets to a shared pending table
+    # and flag the node, and apply_pending folds them in afterwards with the trainer's own update
+    # rules. Strategy sums are written during traversals; each node's are written by one process.
+    # The current strategy is shared too: whoever changes a node's regrets recomputes it once
+    # (publish_strategies), and every process serves that table until the next change.
+    # Block layout: regret_sum | strategy_sum | prediction (predictive only) | pending | current
+    # strategy | flags, every table in decision-node order.
+    def __init__(self, game: RiverHoldemGame, config: VectorCFRConfig, shm_name: str | None = None) -> None:
+        super().__init__(game, config)
+        tree = self.tree
+        self._offsets: Dict[int, int] = {}
+        self._flag_index: Dict[int, int] = {}
+        entries = 0
+        for idx, node in enumerate(tree.decision_nodes):
+            self._offsets[node] = entries
+            self._flag_index[node] = idx
+            entries += self.num_hands[tree.player[node]] * tree.child_count[node]
+        self._regions = ["regret_sum", "strategy_sum"]
+        if self.config.use_predictive:
+            self._regions.append("prediction")
+        self._entries = entries
+        size = (len(self._regions) + 2) * entries + len(tree.decision_nodes)
+        self._owner = shm_name is None
+        if self._owner:
+            self._shm = shared_memory.SharedMemory(create=True, size=max(8, size * 8))
+        else:
+            self._shm = shared_memory.SharedMemory(name=shm_name)
+        self._view: memoryview | None = self._shm.buf.cast("d")
+        self._pending_rows: Dict[int, RowTable] = {}
+        self._current_rows: Dict[int, RowTable] = {}
+        self._flags: memoryview | None = None
+        self._bind_tables(copy=self._owner)
+        if self._owner:
+            self.publish_strategies(tree.decision_nodes)
+
+    @property
+    def shm_name(self) -> str:
+        return self._shm.name
+
+    def _bind_tables(self, copy: bool) -> None:
+        # Points every infoset's tables at its slices of the block; copy=True first writes the
+        # current (process-local) values there.
+        view = self._view
+        entries = self._entries
+        pending = len(self._regions) * entries
+        current = pending + entries
+        for node in self.tree.decision_nodes:
+            infoset = self.node_infosets[node]
+            cols = len(infoset.actions)
+            lo = self._offsets[node]
+            hi = lo + self.num_hands[self.tree.player[node]] * cols
+            for region, name in enumerate(self._regions):
+                data = view[region * entries + lo : region * entries + hi]
+                if copy:
+                    data[:] = flatten_rows(getattr(infoset, name))
+                setattr(infoset, name, RowTable(data, cols))
+            self._pending_rows[node] = RowTable(view[pending + lo : pending + hi], cols)
+            self._current_rows[node] = RowTable(view[current + lo : current + hi], cols)
+            infoset.set_strategy(self._current_rows[node])
+        flags = current + entries
+        self._flags = view[flags : flags + len(self.tree.decision_nodes)]
+        if copy:
+            self._flags[:] = array("d", [_PENDING_NONE]) * len(self.tree.decision_nodes)
+
+    def detach(self) -> None:
+        # Copies the tables into process-local arrays and closes the block (unlinking it when
+        # this trainer created it); the trainer stays readable afterwards.
+        if self._view is None:
+            return
+        for node in self.tree.decision_nodes:
+            infoset = self.node_infosets[node]
+            for name in self._regions:
+                shared = getattr(infoset, name)
+                setattr(infoset, name, RowTable(array("d", shared.data), shared.cols))
+            del shared
+            infoset.mark_dirty()
+        self._pending_rows = {}
+        self._current_rows = {}
+        self._flags = None
+        self._view.release()
+        self._view = None
+        try:
+            self._shm.close()
+        except BufferError:
+            # Rows still referenced elsewhere (say, by the frames of an interrupted traversal)
+            # keep the mapping alive until they are freed; the name is unlinked regardless.
+            pass
+        if self._owner:
+            self._shm.unlink()
+
+    def restore_state(self, meta: dict, tables: Dict[str, Sequence[float]]) -> None:
+        # The base restore builds fresh tables; their values are moved into the block.
+        super().restore_state(meta, tables)
+        self._bind_tables(copy=True)
+        self.publish_strategies(self.tree.decision_nodes)
+
+    def _advance_discount(self) -> None:
+        super()._advance_discount()
+        # A rescale rewrote every stored regret and reset the factors to 1 (advancing alone
+        # always leaves pos below 1), so every strategy is recomputed from the rescaled values.
+        if self.discount is not None and self.discount.pos == 1.0:
+            self.publish_strategies(self.tree.decision_nodes)
+
+    def publish_strategies(self, nodes: Sequence[int]) -> None:
+        # Recomputes these nodes' current strategies from the tables and shares them.
+        for node in nodes:
+            infoset = self.node_infosets[node]
+            infoset.mark_dirty()
+            current = self._current_rows[node]
+            current.data[:] = flatten_rows(infoset.current_strategy())
+            infoset.set_strategy(current)
+
+    def sync(self, iteration: int, discount: dict | None) -> None:
+        # Worker side: the parent owns the iteration counter and the discount factors.
+        self.iteration = iteration
+        self.discount = LazyDiscount.from_json(discount) if discount is not None else None
+
+    def _set_prediction(self, infoset: VectorInfoSet, deltas: List[List[float]]) -> None:
+        # In place, so the shared prediction table is updated.
+        inv_pos = 1.0 / self.discount.pos if self.discount is not None else 1.0
+        for row, delta_row in zip(infoset.prediction, deltas):
+            for a_idx, delta in enumerate(delta_row):
+                row[a_idx] = delta * inv_pos
+
+    def _accumulate_regret(self, player: int, node: int, infoset: VectorInfoSet, deltas: List[List[float]]) -> None:
+        # Each node is visited once per traversal, so its pending table is overwritten.
+        self._pending_rows[node].data[:] = array("d", [delta for row in deltas for delta in row])
+        self._flags[self._flag_index[node]] = _PENDING_DELTAS
+
+    def _clear_prediction(self, node: int) -> None:
+        self._flags[self._flag_index[node]] = _PENDING_CLEAR
+
+    def apply_pending(self, nodes: Sequence[int]) -> None:
+        # Folds the flagged pending updates of these nodes into the tables, exactly as the
+        # serial trainer would have at the end of the iteration, clears their flags and
+        # publishes their new strategies.
+        tree = self.tree
+        flags = self._flags
+        updated = []
+        for node in nodes:
+            flag = flags[self._flag_index[node]]
+            if flag == _PENDING_NONE:
+                continue
+            flags[self._flag_index[node]] = _PENDING_NONE
+            updated.append(node)
+            infoset = self.node_infosets[node]
+            player = tree.player[node]
+            if flag == _PENDING_CLEAR:
+                for row in infoset.prediction:
+                    for a_idx in range(len(row)):
+                        row[a_idx] = 0.0
+            elif self.config.use_plus:
+                self._pending_regret[player][node] = self._pending_rows[node]
+            else:
+                VectorCFRTrainer._accumulate_regret(self, player, node, infoset, self._pending_rows[node])
+        for player in (0, 1):
+            self._apply_regret_updates(player)
+        self.publish_strategies(updated)
+
+    def traverse_subtree(
+        self,
+        update_player: int,
+        root: int,
+        reach_p: List[float],
+        reach_opp: List[float],
+    ) -> Tuple[List[float], Dict[str, int]]:
+        # One task: the update player's traversal below root. Returns root values and node counts.
+        self.skip_stats = {name: 0 for name in self.skip_stats}
+        values = self._traverse(update_player, reach_p, reach_opp, root)
+        return values, self.skip_stats
+
+
+# Per-process trainer attached to the parent's shared block, installed by the pool initializer.
+_worker: SharedTableCFRTrainer | None = None
+
+
+def _init_worker(game: RiverHoldemGame, config: VectorCFRConfig, shm_name: str) -> None:
+    global _worker
+    _worker = SharedTableCFRTrainer(game, config, shm_name)
+
+
+def _run_traversal(
+    iteration: int,
+    discount: dict | None,
+    update_player: int,
+    root: int,
+    reach_p: List[float],
+    reach_opp: List[float],
+) -> Tuple[List[float], Dict[str, int]]:
+    _worker.sync(iteration, discount)
+    return _worker.traverse_subtree(update_player, root, reach_p, reach_opp)
+
+
+def _run_apply(iteration: int, discount: dict | None, nodes: List[int]) -> None:
+    _worker.sync(iteration, discount)
+    _worker.apply_pending(nodes)
+
+
+class ParallelVectorCFRTrainer(SharedTableCFRTrainer):
+    # Simultaneous-update vector CFR (alternating=False) over a process pool. Each iteration:
+    #   1. the parent runs the forward pass over the top of the tree (split_tree) for both
+    #      players and submits one task per (player, frontier subtree) with that subtree's root
+    #      reach; workers read the iteration-start regrets, write strategy sums and pending
+    #      regrets for their subtree's nodes, and return the subtree's root values;
+    #   2. the parent waits for every task (the barrier), combines the values over the top nodes
+    #      in level order and writes the top nodes' pending updates;
+    #   3. workers apply all pending updates, one chunk of decision nodes each, and the parent
+    #      waits again before the next iteration.
+    # Every node is computed by the same code on the same inputs whichever process runs it, so
+    # results do not depend on the worker count. Both traversals of an iteration see only the
+    # regrets from before it. That reproduces the serial trainer exactly for CFR+ and DCFR+;
+    # there, vanilla CFR/DCFR regrets and predictions from player 0's traversal already reach
+    # player 1's, so those variants follow the textbook simultaneous update here instead.
+    # Subtree traversals are not profiled; the profiler only records iteration times.
+    def __init__(self, game: RiverHoldemGame, config: VectorCFRConfig | None = None) -> None:
+        config = config or VectorCFRConfig(alternating=False, workers=2)
+        check_parallel_config(config)
+        super().__init__(game, config)
+        self.workers = config.workers
+        self.top, self.frontier = split_tree(self.tree, self.workers)
+        self._apply_chunks = self._chunk_nodes()
+        self._pool: ProcessPoolExecutor | None = None
+
+    def _chunk_nodes(self) -> List[List[int]]:
+        # Decision nodes in contiguous chunks of about equal table size, one per worker.
+        tree = self.tree
+        sizes = [self.num_hands[tree.player[node]] * tree.child_count[node] for node in tree.decision_nodes]
+        target = sum(sizes) / self.workers
+        chunks: List[List[int]] = [[]]
+        filled = 0.0
+        for node, size in zip(tree.decision_nodes, sizes):
+            if filled >= target * len(chunks) and len(chunks) < self.workers:
+                chunks.append([])
+            chunks[-1].append(node)
+            filled += size
+        return chunks
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+        self.detach()
+
+    def __enter__(self) -> "ParallelVectorCFRTrainer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _top_forward(self, update_player: int) -> Tuple[Dict[int, List[float]], Dict[int, List[float]]]:
+        # Reach of both sides at every top and frontier node, as VectorCFRTrainer._traverse
+        # computes it.
+        tree = self.tree
+        reach_p = {0: list(self.hand_weights[update_player])}
+        reach_opp = {0: list(self.hand_weights[1 - update_player])}
+        for node in self.top:
+            own = tree.player[node] == update_player
+            strategy = self.node_infosets[node].current_strategy()
+            parent_reach = reach_p[node] if own else reach_opp[node]
+            for a_idx, child in enumerate(tree.children(node)):
+                child_reach = [weight * strategy[h][a_idx] for h, weight in enumerate(parent_reach)]
+                reach_p[child] = child_reach if own else reach_p[node]
+                reach_opp[child] = reach_opp[node] if own else child_reach
+        return reach_p, reach_opp
+
+    def _top_backward(
+        self,
+        update_player: int,
+        reach_p: Dict[int, List[float]],
+        reach_opp: Dict[int, List[float]],
+        values: Dict[int, List[float] | None],
+    ) -> None:
+        # The backward pass of VectorCFRTrainer._traverse over the top nodes, given the
+        # frontier values; pending regrets go to the shared table like the workers'.
+        tree = self.tree
+        num_hands = self.num_hands[update_player]
+        regret_weight, weight_scale = self._update_weights()
+        stats = self.skip_stats
+        zeros = [0.0 for _ in range(num_hands)]
+        for node in reversed(self.top):
+            stats["nodes"] += 1
+            own = tree.player[node] == update_player
+            infoset = self.node_infosets[node]
+            strategy = infoset.current_strategy()
+            active_p = [h for h, weight in enumerate(reach_p[node]) if weight != 0.0]
+            if self.config.skip_zero_reach and not any(weight != 0.0 for weight in reach_opp[node]):
+                stats["nodes_skipped"] += 1
+                values[node] = None
+                if own:
+                    self._accumulate_strategy(infoset, strategy, reach_p[node], active_p, weight_scale)
+                    if infoset.prediction is not None:
+                        self._clear_prediction(node)
+                continue
+            action_values = [zeros if values[child] is None else values[child] for child in tree.children(node)]
+            node_values = [0.0 for _ in range(num_hands)]
+            if not own:
+                for child_values in action_values:
+                    for h_idx, value in enumerate(child_values):
+                        node_values[h_idx] += value
+                values[node] = node_values
+                continue
+            num_actions = len(action_values)
+            for h_idx in range(num_hands):
+                value = 0.0
+                for a_idx in range(num_actions):
+                    value += strategy[h_idx][a_idx] * action_values[a_idx][h_idx]
+                node_values[h_idx] = value
+            deltas = [
+                [(action_values[a_idx][h_idx] - node_values[h_idx]) * regret_weight for a_idx in range(num_actions)]
+                for h_idx in range(num_hands)
+            ]
+            self._accumulate_regret(update_player, node, infoset, deltas)
+            self._accumulate_strategy(infoset, strategy, reach_p[node], active_p, weight_scale)
+            values[node] = node_values
+
+    def run(self, iterations: int) -> None:
+        # Settings can be switched after construction (run_river_exploitability.make_trainer).
+        check_parallel_config(self.config)
+        if self._view is None:
+            raise ValueError("Parallel vector CFR trainer is closed")
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.game, self.config, self.shm_name),
+            )
+        pool = self._pool
+        for _ in range(iterations):
+            self.iteration += 1
+            if self.profiler is not None:
+                self.profiler.begin_iteration(self.iteration)
+            self._advance_discount()
+            discount = self.discount.to_json() if self.discount is not None else None
+            reach = {player: self._top_forward(player) for player in (0, 1)}
+            futures = {
+                player: [
+                    pool.submit(
+                        _run_traversal,
+                        self.iteration,
+                        discount,
+                        player,
+                        node,
+                        reach[player][0][node],
+                        reach[player][1][node],
+                    )
+                    for node in self.frontier
+                ]
+                for player in (0, 1)
+            }
+            for player in (0, 1):
+                values: Dict[int, List[float] | None] = {}
+                for node, future in zip(self.frontier, futures[player]):
+                    values[node], stats = future.result()
+                    for name, count in stats.items():
+                        self.skip_stats[name] += count
+                self._top_backward(player, reach[player][0], reach[player][1], values)
+            for future in [pool.submit(_run_apply, self.iteration, discount, chunk) for chunk in self._apply_chunks]:
+                future.result()
+            if self.profiler is not None:
+                self.profiler.end_iteration()
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, List
+
+from games.river_tree import TERMINAL_FOLD, TERMINAL_NONE, TERMINAL_SHOWDOWN
+
+# Exclusive phases. Trainers with a profiler hook split "solve" into forward (reach
+# propagation), terminal (terminal evaluation), update (regret and strategy-sum writes) and
+# backward (value aggregation); run_with_budget adds the evaluation phases.
+PHASES = ("forward", "terminal", "update", "backward", "solve", "average_strategy", "exploitability")
+_TERMINAL_KINDS = {TERMINAL_FOLD: "fold", TERMINAL_SHOWDOWN: "showdown"}
+
+
+class SolverProfiler:
+    # Opt-in counters for one solve. Set `trainer.profiler` (None by default) to collect them;
+    # trainers check for None once per node, so profiling off costs one comparison per visit.
+    # Phase times and counters cover every iteration; per-node times are only accumulated on
+    # every `sample_interval`-th iteration, which is enough to rank hot spots.
+    def __init__(self, sample_interval: int = 10) -> None:
+        self.sample_interval = max(1, sample_interval)
+        self.counters = {"nodes_visited": 0, "terminal_fold": 0, "terminal_showdown": 0, "entries_updated": 0}
+        self.phase_seconds = {phase: 0.0 for phase in PHASES}
+        self.per_iteration: List[dict] = []
+        self.node_seconds: Dict[int, float] = {}
+        self.sampled_iterations = 0
+        # Iterations solved while profiling (per_iteration only has trainers with a hook).
+        self.iterations = 0
+        self.tree = None
+        self._iteration = 0
+        self._sampling = False
+        self._nested = 0.0
+        self._iteration_start: Dict[str, float] = {}
+        self._iteration_tick = 0.0
+
+    def attach(self, trainer) -> bool:
+        # Installs the profiler on trainers that have the hook and labels hot spots with their
+        # compiled tree. Returns False for trainers without one (only budget phases are timed).
+        # The hook is a `profiler` attribute, None by default, that every trainer's run() passes
+        # iteration boundaries to, so per-iteration wall time is always recorded. Vector CFR
+        # (list and array engines) also reports every phase, counters and hot spots; vector FP and
+        # the turn solver time their own passes (see their constructors); the rest stop there.
+        if not hasattr(trainer, "profiler"):
+            return False
+        trainer.profiler = self
+        self.tree = getattr(trainer, "tree", None)
+        return True
+
+    def begin_iteration(self, iteration: int) -> None:
+        self._iteration = iteration
+        self._sampling = (iteration - 1) % self.sample_interval == 0
+        if self._sampling:
+            self.sampled_iterations += 1
+        self._iteration_start = dict(self.phase_seconds)
+        self._iteration_tick = perf_counter()
+
+    def end_iteration(self) -> None:
+        # Wall time is recorded for every trainer; phase splits only for those that time phases.
+        record = {"iteration": self._iteration, "seconds": perf_counter() - self._iteration_tick}
+        for phase in PHASES:
+            spent = self.phase_seconds[phase] - self._iteration_start.get(phase, 0.0)
+            if spent > 0.0:
+                record[phase] = spent
+        self.per_iteration.append(record)
+
+    def begin_pass(self) -> None:
+        self._nested = 0.0
+
+    def end_pass(self, phase: str, seconds: float) -> None:
+        # `seconds` covers the whole pass; terminal and update time recorded inside it is
+        # already counted under its own phase.
+        self.phase_seconds[phase] += seconds - self._nested
+        self._nested = 0.0
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phase_seconds[phase] += seconds
+
+    def solve_seconds(self) -> float:
+        return sum(self.phase_seconds[phase] for phase in ("forward", "terminal", "update", "backward", "solve"))
+
+    def evaluation(self, average_seconds: float, exploitability_seconds: float) -> None:
+        # Evaluations run between iterations; they are charged to the last finished one.
+        self.phase_seconds["average_strategy"] += average_seconds
+        self.phase_seconds["exploitability"] += exploitability_seconds
+        if self.per_iteration:
+            record = self.per_iteration[-1]
+            record["average_strategy"] = record.get("average_strategy", 0.0) + average_seconds
+            record["exploitability"] = record.get("exploitability", 0.0) + exploitability_seconds
+
+    def visit(self, count: int = 1) -> None:
+        self.counters["nodes_visited"] += count
+
+    def terminal(self, node: int, kind: int, seconds: float) -> None:
+        self.counters["terminal_fold" if kind == TERMINAL_FOLD else "terminal_showdown"] += 1
+        self.phase_seconds["terminal"] += seconds
+        self._nested += seconds
+        if self._sampling:
+            self.node_seconds[node] = self.node_seconds.get(node, 0.0) + seconds
+
+    def update(self, node: int, entries: int, seconds: float) -> None:
+        self.counters["entries_updated"] += entries
+        self.phase_seconds["update"] += seconds
+        self._nested += seconds
+        if self._sampling:
+            self.node_seconds[node] = self.node_seconds.get(node, 0.0) + seconds
+
+    def hot_spots(self, top: int = 10) -> List[dict]:
+        sampled = sum(self.node_seconds.values())
+        rows = []
+        for node, seconds in sorted(self.node_seconds.items(), key=lambda item: -item[1])[:top]:
+            row = {"node": node, "seconds": seconds, "share": seconds / sampled if sampled > 0.0 else 0.0}
+            tree = self.tree
+            if tree is not None:
+                kind = tree.terminal[node]
+                row["key"] = tree.keys[node]
+                row["kind"] = f"P{tree.player[node]} update" if kind == TERMINAL_NONE else _TERMINAL_KINDS[kind]
+            rows.append(row)
+        return rows
+
+    def report(self, top: int = 10) -> dict:
+        solve = self.solve_seconds()
+        throughput = {}
+        if solve > 0.0 and self.counters["nodes_visited"]:
+            throughput = {
+                "nodes_per_second": self.counters["nodes_visited"] / solve,
+                "entries_per_second": self.counters["entries_updated"] / solve,
+                "terminals_per_second": (self.counters["terminal_fold"] + self.counters["terminal_showdown"]) / solve,
+            }
+        return {
+            "iterations": self.iterations or len(self.per_iteration),
+            "phases": dict(self.phase_seconds),
+            "counters": dict(self.counters),
+            "throughput": throughput,
+            "sample_interval": self.sample_interval,
+            "sampled_iterations": self.sampled_iterations,
+            "hot_spots": self.hot_spots(top),
+            "per_iteration": self.per_iteration,
+        }
+
+    def write(self, path: Path, top: int = 10) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as out:
+            json.dump(self.report(top), out, indent=2)
+
+    def format_summary(self, top: int = 10) -> str:
+        report = self.report(top)
+        total = sum(report["phases"].values()) or 1.0
+        lines = [
+            "phases: "
+            + ", ".join(
+                f"{phase} {seconds:.2f}s ({seconds / total:.0%})"
+                for phase, seconds in report["phases"].items()
+                if seconds > 0.0
+            )
+        ]
+        counters = report["counters"]
+        if not counters["nodes_visited"]:
+            return lines[0]
+        lines.append(
+            f"counters: {counters['nodes_visited']} nodes, {counters['terminal_fold']} fold / "
+            f"{counters['terminal_showdown']} showdown evals, {counters['entries_updated']} hand-action updates"
+        )
+        if report["throughput"]:
+            lines.append(
+                f"throughput: {report['throughput']['nodes_per_second']:.0f} nodes/s, "
+                f"{report['throughput']['entries_per_second']:.0f} updates/s"
+            )
+        if report["hot_spots"]:
+            lines.append(f"hot spots ({report['sampled_iterations']} sampled iterations):")
+            for row in report["hot_spots"]:
+                label = f"{row.get('kind', '')} {row.get('key', row['node'])}".strip()
+                lines.append(f"  {row['share']:6.1%}  {row['seconds']:8.3f}s  node {row['node']:>4}  {label}")
+        return "\n".join(lines)
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import random
-from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from array import array
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Sequence, Tuple
 
+from algorithms.deal_sampler import DealSampler
 from algorithms.infoset import InfoSet
+from algorithms.profiler import SolverProfiler
+from algorithms.snapshot import check_trainer_meta, rng_state_from_json, rng_state_to_json
 from algorithms.vector_eval import uniform_strategy
 from games.river_holdem import Action, RiverHoldemGame, RiverState, card_str
 
@@ -19,28 +23,16 @@ class ExternalSamplingMCCFRTrainer:
         self.game = game
         self.config = config or RiverMCCFRConfig()
         self.rng = random.Random(self.config.seed)
+        self.iteration = 0
+        self.profiler: SolverProfiler | None = None
         self.infosets: Dict[str, InfoSet] = {}
         self.hand_index: Dict[int, Dict[str, int]] = {0: {}, 1: {}}
-        self._p0_sampling_weights: List[float] = []
         for player in (0, 1):
             for idx, hand in enumerate(game.hands[player]):
                 key = self._hand_key(hand.cards)
                 self.hand_index[player][key] = idx
-        self._build_p0_sampling_weights()
-
-    def _build_p0_sampling_weights(self) -> None:
-        p0_weights = self.game.hand_weights[0]
-        p1_weights = self.game.hand_weights[1]
-        self._p0_sampling_weights = [0.0 for _ in self.game.hands[0]]
-        for i, p0_hand in enumerate(self.game.hands[0]):
-            blocked = set(p0_hand.cards)
-            valid_sum = 0.0
-            for hand, weight in zip(self.game.hands[1], p1_weights):
-                if blocked.intersection(hand.cards):
-                    continue
-                valid_sum += weight
-            # Sample P0 proportional to its weight times valid P1 mass.
-            self._p0_sampling_weights[i] = p0_weights[i] * valid_sum
+        # Shares self.rng, so snapshots of the RNG state also cover deal sampling.
+        self.sampler = DealSampler(game, self.rng)
 
     def _get_infoset(self, key: str, actions: List[Action]) -> InfoSet:
         infoset = self.infosets.get(key)
@@ -57,31 +49,8 @@ class ExternalSamplingMCCFRTrainer:
     def _hand_key(self, cards: Tuple[int, int]) -> str:
         return f"{card_str(cards[0])}{card_str(cards[1])}"
 
-    def _sample_hand_index(self, weights: List[float]) -> int:
-        total = sum(weights)
-        if total <= 0.0:
-            raise ValueError("No weight to sample from")
-        threshold = self.rng.random() * total
-        cumulative = 0.0
-        for idx, weight in enumerate(weights):
-            cumulative += weight
-            if threshold <= cumulative:
-                return idx
-        return len(weights) - 1
-
     def _sample_hands(self) -> Tuple[int, int]:
-        p1_weights = self.game.hand_weights[1]
-        p0_index = self._sample_hand_index(self._p0_sampling_weights)
-        p0_hand = self.game.hands[0][p0_index]
-        blocked = set(p0_hand.cards)
-        filtered_weights = []
-        for hand, weight in zip(self.game.hands[1], p1_weights):
-            if blocked.intersection(hand.cards):
-                filtered_weights.append(0.0)
-            else:
-                filtered_weights.append(weight)
-        p1_index = self._sample_hand_index(filtered_weights)
-        return p0_index, p1_index
+        return self.sampler.sample()
 
     def _utility(self, state: RiverState, p0_index: int, p1_index: int, player: int) -> float:
         pot_total = self.game.pot_total(state)
@@ -157,10 +126,52 @@ class ExternalSamplingMCCFRTrainer:
 
     def run(self, iterations: int) -> None:
         for _ in range(iterations):
+            self.iteration += 1
+            if self.profiler is not None:
+                self.profiler.begin_iteration(self.iteration)
             p0_index, p1_index = self._sample_hands()
             root = self.game.initial_state()
             self._traverse(root, 0, p0_index, p1_index, 1.0)
             self._traverse(root, 1, p0_index, p1_index, 1.0)
+            if self.profiler is not None:
+                self.profiler.end_iteration()
+
+    def snapshot_state(self) -> Tuple[dict, List[Tuple[str, array]]]:
+        # Keys are "p<player>:<hand>|<history>"; action tokens depend only on the history, so
+        # they are stored once per history instead of once per infoset.
+        regrets = array("d")
+        strategy = array("d")
+        history_actions: Dict[str, List[str]] = {}
+        for key, infoset in self.infosets.items():
+            history_actions.setdefault(key.split("|", 1)[1], infoset.actions)
+            regrets.extend(infoset.regret_sum)
+            strategy.extend(infoset.strategy_sum)
+        meta = {
+            "trainer": "river_mccfr",
+            "config": asdict(self.config),
+            "iteration": self.iteration,
+            "rng_state": rng_state_to_json(self.rng.getstate()),
+            "keys": list(self.infosets),
+            "history_actions": history_actions,
+        }
+        return meta, [("regret_sum", regrets), ("strategy_sum", strategy)]
+
+    def restore_state(self, meta: dict, tables: Dict[str, Sequence[float]]) -> None:
+        check_trainer_meta(meta, "river_mccfr", self.config)
+        regrets = tables["regret_sum"]
+        strategy = tables["strategy_sum"]
+        history_actions = meta["history_actions"]
+        self.infosets = {}
+        offset = 0
+        for key in meta["keys"]:
+            infoset = InfoSet(list(history_actions[key.split("|", 1)[1]]))
+            size = len(infoset.actions)
+            infoset.regret_sum = list(regrets[offset : offset + size])
+            infoset.strategy_sum = list(strategy[offset : offset + size])
+            self.infosets[key] = infoset
+            offset += size
+        self.rng.setstate(rng_state_from_json(meta["rng_state"]))
+        self.iteration = meta["iteration"]
 
     def average_strategy_profile(self) -> Dict[int, Dict[str, Tuple[List[str], List[List[float]]]]]:
         profile: Dict[int, Dict[str, Tuple[List[str], List[List[float]]]]] = {0: {}, 1: {}}
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import struct
+import tempfile
+from array import array
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+from games.river_holdem import RiverHoldemGame
+
+# Trainer snapshot container (little-endian):
+#   magic (8 bytes), version u32, metadata length u32, UTF-8 JSON metadata, zero padding to 8,
+#   then every table as raw float64 in the order listed in metadata["tables"].
+# Metadata holds scalars (iteration, weights, RNG state, keys); the tables hold all regret and
+# strategy sums, so writing a snapshot is one sequential dump proportional to table size.
+MAGIC = b"PSSNAP\x00\x01"
+VERSION = 1
+_PREFIX = struct.Struct("<8sII")
+
+Tables = List[Tuple[str, object]]
+
+
+def game_fingerprint(game: RiverHoldemGame) -> str:
+    # Snapshots only resume into the same game: board, ranges, weights and betting tree.
+    digest = hashlib.sha256()
+    digest.update(repr(tuple(game.board)).encode("ascii"))
+    for player in (0, 1):
+        digest.update(repr([hand.cards for hand in game.hands[player]]).encode("ascii"))
+        digest.update(array("d", game.hand_weights[player]).tobytes())
+    digest.update("|".join(game.flat_tree().keys).encode("utf-8"))
+    digest.update("|".join(game.flat_tree().tokens).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _table_bytes(values) -> bytes:
+    # Accepts array('d'), NumPy float64 arrays (any shape) or flat float sequences.
+    if isinstance(values, array) and values.typecode == "d":
+        return values.tobytes()
+    tobytes = getattr(values, "tobytes", None)
+    if tobytes is not None and getattr(values, "dtype", None) is not None:
+        return values.astype("<f8", copy=False).tobytes()
+    return array("d", values).tobytes()
+
+
+def flatten_rows(rows: Sequence[Sequence[float]]) -> array:
+    flat = array("d")
+    for row in rows:
+        flat.extend(row)
+    return flat
+
+
+def unflatten_rows(flat: Sequence[float], num_rows: int, num_cols: int) -> List[List[float]]:
+    values = list(flat)
+    return [values[r * num_cols : (r + 1) * num_cols] for r in range(num_rows)]
+
+
+def write_snapshot(path: Path, meta: dict, tables: Tables) -> None:
+    blobs = [(name, _table_bytes(values)) for name, values in tables]
+    meta = dict(meta)
+    meta["tables"] = [[name, len(blob) // 8] for name, blob in blobs]
+    meta_bytes = json.dumps(meta, separators=(",", ":")).encode("utf-8")
+    pad = -(_PREFIX.size + len(meta_bytes)) % 8
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Temp file + fsync + rename: a crash mid-write leaves the previous snapshot intact.
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            out.write(_PREFIX.pack(MAGIC, VERSION, len(meta_bytes)))
+            out.write(meta_bytes)
+            out.write(b"\x00" * pad)
+            for _, blob in blobs:
+                out.write(blob)
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+def read_snapshot(path: Path) -> Tuple[dict, Dict[str, memoryview]]:
+    with path.open("rb") as f:
+        data = f.read()
+    magic, version, meta_len = _PREFIX.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a trainer snapshot")
+    if version != VERSION:
+        raise ValueError(f"Unsupported snapshot version {version}")
+    meta_end = _PREFIX.size + meta_len
+    meta = json.loads(data[_PREFIX.size : meta_end].decode("utf-8"))
+    offset = meta_end + (-meta_end % 8)
+    view = memoryview(data)
+    tables: Dict[str, memoryview] = {}
+    for name, count in meta["tables"]:
+        tables[name] = view[offset : offset + 8 * count].cast("d")
+        offset += 8 * count
+    if offset != len(data):
+        raise ValueError(f"{path} is truncated or corrupt")
+    return meta, tables
+
+
+def rng_state_to_json(state) -> list:
+    version, internal, gauss_next = state
+    return [version, list(internal), gauss_next]
+
+
+def rng_state_from_json(data: list):
+    version, internal, gauss_next = data
+    return (version, tuple(internal), gauss_next)
+
+
+def save_trainer(path: Path, trainer, algo: str) -> None:
+    meta, tables = trainer.snapshot_state()
+    meta["algo"] = algo
+    meta["game"] = game_fingerprint(trainer.game)
+    write_snapshot(path, meta, tables)
+
+
+def load_trainer(path: Path, trainer, algo: str) -> None:
+    meta, tables = read_snapshot(path)
+    if meta.get("algo") != algo:
+        raise ValueError(f"Snapshot was written by --algo {meta.get('algo')}, not {algo}")
+    if meta.get("game") != game_fingerprint(trainer.game):
+        raise ValueError("Snapshot belongs to a different game (board, ranges or betting tree changed)")
+    trainer.restore_state(meta, tables)
+
+
+def check_trainer_meta(meta: dict, trainer_name: str, config) -> None:
+    if meta.get("trainer") != trainer_name:
+        raise ValueError(f"Snapshot holds a {meta.get('trainer')} trainer, not {trainer_name}")
+    if meta.get("config") != json.loads(json.dumps(asdict(config))):
+        raise ValueError("Snapshot trainer config differs from the requested one")
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from typing import Iterator, Sequence
+
+# Table storage for the vector trainers' per-infoset (hands x actions) sums:
+#   "list"     list of Python float lists (reference layout, ~32 bytes per entry plus row lists)
+#   "float64"  one contiguous array('d') per table, 8 bytes per entry
+#   "float32"  one contiguous array('f') per table, 4 bytes per entry; values are rounded on store
+STORAGE_MODES = ("list", "float64", "float32")
+_TYPECODES = {"float64": "d", "float32": "f"}
+
+
+def check_storage(storage: str) -> None:
+    if storage not in STORAGE_MODES:
+        raise ValueError(f"Unknown table storage: {storage!r} (expected one of {', '.join(STORAGE_MODES)})")
+
+
+class RowTable:
+    # A hands x actions table in one contiguous array. Rows are memoryview slices, so
+    # `table[h][a] += x`, `len(table[h])` and iterating rows behave like the list layout.
+    __slots__ = ("data", "cols", "_view")
+
+    def __init__(self, data: array, cols: int) -> None:
+        self.data = data
+        self.cols = cols
+        self._view = memoryview(data)
+
+    def __len__(self) -> int:
+        return len(self.data) // self.cols
+
+    def __getitem__(self, row: int) -> memoryview:
+        lo = row * self.cols
+        return self._view[lo : lo + self.cols]
+
+    def __iter__(self) -> Iterator[memoryview]:
+        view = self._view
+        cols = self.cols
+        for lo in range(0, len(self.data), cols):
+            yield view[lo : lo + cols]
+
+    def __getstate__(self):
+        return self.data, self.cols
+
+    def __setstate__(self, state) -> None:
+        self.__init__(*state)
+
+
+def make_rows(storage: str, num_rows: int, num_cols: int, fill: float = 0.0):
+    if storage == "list":
+        return [[fill for _ in range(num_cols)] for _ in range(num_rows)]
+    return RowTable(array(_TYPECODES[storage], [fill]) * (num_rows * num_cols), num_cols)
+
+
+def rows_from_flat(storage: str, flat: Sequence[float], num_rows: int, num_cols: int):
+    # Inverse of snapshot.flatten_rows in the requested layout.
+    if storage == "list":
+        values = list(flat)
+        return [values[r * num_cols : (r + 1) * num_cols] for r in range(num_rows)]
+    return RowTable(array(_TYPECODES[storage], flat), num_cols)
+
+
+def table_bytes(storage: str, num_rows: int, num_cols: int) -> int:
+    # Resident size of one table after training has touched every entry (so each list entry is
+    # its own float object). Measured from the same constructors the trainers use.
+    if storage == "list":
+        outer = sys.getsizeof([None for _ in range(num_rows)])
+        row = sys.getsizeof([0.0 for _ in range(num_cols)]) + num_cols * sys.getsizeof(0.5)
+        return outer + num_rows * row
+    empty = array(_TYPECODES[storage])
+    header = sys.getsizeof(empty) + sys.getsizeof(RowTable(empty, 1)) + sys.getsizeof(memoryview(empty))
+    return header + empty.itemsize * num_rows * num_cols
+
+
+def tree_table_bytes(tree, num_hands: Sequence[int], storage: str, tables: int) -> int:
+    # `tables` same-shaped (hands x actions) tables at every decision node of a compiled tree.
+    total = 0
+    for node in tree.decision_nodes:
+        total += table_bytes(storage, num_hands[tree.player[node]], tree.child_count[node])
+    return total * tables
+
+
+def traversal_bytes(tree, num_hands: Sequence[int]) -> int:
+    # Rough peak of one vector CFR traversal, in list floats whatever the storage: a reach and a
+    # value vector per node, plus the regret deltas of every node the update player acts at.
+    hands = max(num_hands)
+    vectors = 2 * tree.num_nodes * (sys.getsizeof([0.0 for _ in range(hands)]) + hands * sys.getsizeof(0.5))
+    deltas = 0
+    for player in (0, 1):
+        player_deltas = 0
+        for node in tree.decision_nodes:
+            if tree.player[node] == player:
+                player_deltas += table_bytes("list", num_hands[player], tree.child_count[node])
+        deltas = max(deltas, player_deltas)
+    return vectors + deltas
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import random
+from array import array
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Sequence, Tuple
+
+from algorithms.deal_sampler import DealSampler
+from algorithms.profiler import SolverProfiler
+from algorithms.snapshot import check_trainer_meta, rng_state_from_json, rng_state_to_json
+from games.river_holdem import RiverHoldemGame
+from games.river_tree import TERMINAL_FOLD, TERMINAL_NONE
+
+
+@dataclass
+class TableMCCFRConfig:
+    seed: int = 7
+    # "external" samples opponent actions and enumerates the target's; "outcome" samples one
+    # terminal history per deal and player (cheaper per deal, higher variance).
+    sampling: str = "external"
+    # Deals sampled per iteration; every deal is traversed once for each player.
+    batch_size: int = 16
+    # Outcome sampling only: share of the target player's sampling policy spread uniformly.
+    exploration: float = 0.6
+
+
+class TableMCCFRTrainer:
+    # River MCCFR on the compiled betting tree. Regret and strategy sums live in one flat table
+    # per decision node, indexed [hand * num_actions + action] with hands in game order, so a
+    # visit is two integer lookups instead of building a string key and an InfoSet.
+    def __init__(self, game: RiverHoldemGame, config: TableMCCFRConfig | None = None) -> None:
+        self.game = game
+        self.config = config or TableMCCFRConfig()
+        if self.config.sampling not in ("external", "outcome"):
+            raise ValueError(f"Unknown MCCFR sampling scheme: {self.config.sampling}")
+        if self.config.batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.rng = random.Random(self.config.seed)
+        self.iteration = 0
+        self.profiler: SolverProfiler | None = None
+        self.tree = game.flat_tree()
+        self.num_hands = [len(game.hands[0]), len(game.hands[1])]
+        self.strengths = [[hand.strength for hand in game.hands[player]] for player in (0, 1)]
+        self.regret_sum: List[List[float] | None] = [None for _ in range(self.tree.num_nodes)]
+        self.strategy_sum: List[List[float] | None] = [None for _ in range(self.tree.num_nodes)]
+        for node in self.tree.decision_nodes:
+            size = self.num_hands[self.tree.player[node]] * self.tree.child_count[node]
+            self.regret_sum[node] = [0.0] * size
+            self.strategy_sum[node] = [0.0] * size
+        self.sampler = DealSampler(game, self.rng)
+
+    def _payoff(self, node: int, target: int, hands: Tuple[int, int]) -> float:
+        tree = self.tree
+        contrib = tree.contrib(node, target)
+        if tree.terminal[node] == TERMINAL_FOLD:
+            return float(tree.pot[node] - contrib) if tree.fold_winner[node] == target else float(-contrib)
+        own = self.strengths[target][hands[target]]
+        other = self.strengths[1 - target][hands[1 - target]]
+        if own == other:
+            return tree.pot[node] / 2.0 - contrib
+        return float(tree.pot[node] - contrib) if own > other else float(-contrib)
+
+    @staticmethod
+    def _matched(regrets: List[float], base: int, count: int) -> List[float]:
+        positives = [value if value > 0.0 else 0.0 for value in regrets[base : base + count]]
+        normalizing = sum(positives)
+        if normalizing > 0.0:
+            return [value / normalizing for value in positives]
+        return [1.0 / count] * count
+
+    def _sample_index(self, probs: List[float]) -> int:
+        threshold = self.rng.random()
+        cumulative = 0.0
+        for idx, prob in enumerate(probs):
+            cumulative += prob
+            if threshold < cumulative:
+                return idx
+        return len(probs) - 1
+
+    def _external(self, node: int, target: int, hands: Tuple[int, int], reach: float) -> float:
+        tree = self.tree
+        if tree.terminal[node] != TERMINAL_NONE:
+            return self._payoff(node, target, hands)
+        player = tree.player[node]
+        start = tree.child_start[node]
+        count = tree.child_count[node]
+        base = hands[player] * count
+        regrets = self.regret_sum[node]
+        strategy = self._matched(regrets, base, count)
+        if player != target:
+            return self._external(start + self._sample_index(strategy), target, hands, reach)
+        utils = [self._external(start + a_idx, target, hands, reach * strategy[a_idx]) for a_idx in range(count)]
+        node_util = 0.0
+        for prob, util in zip(strategy, utils):
+            node_util += prob * util
+        strategy_sum = self.strategy_sum[node]
+        for a_idx in range(count):
+            regrets[base + a_idx] += utils[a_idx] - node_util
+            strategy_sum[base + a_idx] += reach * strategy[a_idx]
+        return node_util
+
+    def _outcome(
+        self,
+        node: int,
+        target: int,
+        hands: Tuple[int, int],
+        reach_target: float,
+        reach_opp: float,
+        sample_prob: float,
+    ) -> Tuple[float, float]:
+        # Returns (sampled utility / probability of sampling the terminal, tail reach of the
+        # current strategy from this node to that terminal). Deals are drawn with their chance
+        # probability, so chance cancels out of every estimate.
+        tree = self.tree
+        if tree.terminal[node] != TERMINAL_NONE:
+            return self._payoff(node, target, hands) / sample_prob, 1.0
+        player = tree.player[node]
+        start = tree.child_start[node]
+        count = tree.child_count[node]
+        base = hands[player] * count
+        regrets = self.regret_sum[node]
+        strategy = self._matched(regrets, base, count)
+        if player == target:
+            explore = self.config.exploration
+            policy = [explore / count + (1.0 - explore) * prob for prob in strategy]
+            a_idx = self._sample_index(policy)
+            util, tail = self._outcome(
+                start + a_idx, target, hands, reach_target * strategy[a_idx], reach_opp, sample_prob * policy[a_idx]
+            )
+            weighted = util * reach_opp
+            # Sampled counterfactual regret: W * tail * (1[a == b] - sigma(a)) for every action b.
+            sampled = weighted * tail
+            for b_idx in range(count):
+                regrets[base + b_idx] -= sampled * strategy[a_idx]
+            regrets[base + a_idx] += sampled
+            return util, tail * strategy[a_idx]
+        a_idx = self._sample_index(strategy)
+        util, tail = self._outcome(
+            start + a_idx, target, hands, reach_target, reach_opp * strategy[a_idx], sample_prob * strategy[a_idx]
+        )
+        # Stochastically weighted averaging: the opponent's own reach over the probability of
+        # sampling this prefix gives an unbiased estimate of its reach-weighted strategy.
+        weight = reach_opp / sample_prob
+        strategy_sum = self.strategy_sum[node]
+        for b_idx in range(count):
+            strategy_sum[base + b_idx] += weight * strategy[b_idx]
+        return util, tail * strategy[a_idx]
+
+    def run(self, iterations: int) -> None:
+        outcome = self.config.sampling == "outcome"
+        for _ in range(iterations):
+            self.iteration += 1
+            if self.profiler is not None:
+                self.profiler.begin_iteration(self.iteration)
+            for hands in self.sampler.sample_batch(self.config.batch_size):
+                for target in (0, 1):
+                    if outcome:
+                        self._outcome(0, target, hands, 1.0, 1.0, 1.0)
+                    else:
+                        self._external(0, target, hands, 1.0)
+            if self.profiler is not None:
+                self.profiler.end_iteration()
+
+    def snapshot_state(self) -> Tuple[dict, List[Tuple[str, array]]]:
+        # Tables in decision-node order; the compiled tree fixes every shape.
+        regrets = array("d")
+        strategy = array("d")
+        for node in self.tree.decision_nodes:
+            regrets.extend(self.regret_sum[node])
+            strategy.extend(self.strategy_sum[node])
+        meta = {
+            "trainer": "table_mccfr",
+            "config": asdict(self.config),
+            "iteration": self.iteration,
+            "rng_state": rng_state_to_json(self.rng.getstate()),
+        }
+        return meta, [("regret_sum", regrets), ("strategy_sum", strategy)]
+
+    def restore_state(self, meta: dict, tables: Dict[str, Sequence[float]]) -> None:
+        check_trainer_meta(meta, "table_mccfr", self.config)
+        regrets = tables["regret_sum"]
+        strategy = tables["strategy_sum"]
+        offset = 0
+        for node in self.tree.decision_nodes:
+            size = len(self.regret_sum[node])
+            self.regret_sum[node] = list(regrets[offset : offset + size])
+            self.strategy_sum[node] = list(strategy[offset : offset + size])
+            offset += size
+        self.rng.setstate(rng_state_from_json(meta["rng_state"]))
+        self.iteration = meta["iteration"]
+
+    def average_strategy_profile(self) -> Dict[int, Dict[str, Tuple[List[str], List[List[float]]]]]:
+        # Rows are normalized straight from the tables; unvisited hands get a uniform row.
+        tree = self.tree
+        profile: Dict[int, Dict[str, Tuple[List[str], List[List[float]]]]] = {0: {}, 1: {}}
+        for node in tree.decision_nodes:
+            player = tree.player[node]
+            count = tree.child_count[node]
+            sums = self.strategy_sum[node]
+            uniform = [1.0 / count] * count
+            matrix = []
+            for base in range(0, len(sums), count):
+                row = sums[base : base + count]
+                total = sum(row)
+                matrix.append([value / total for value in row] if total > 0.0 else uniform[:])
+            profile[player][tree.keys[node]] = (tree.child_tokens(node), matrix)
+        return profile
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from typing import Dict, List
+
+from algorithms.cfr import CFRConfig, CFRTrainer
+from algorithms.infoset import InfoSet
+from games.game_tree import NODE_CHANCE, NODE_TERMINAL, FlatGameTree, game_tree
+
+
+class TabularCFRTrainer(CFRTrainer):
+    # CFRTrainer over a compiled game tree (games.game_tree): nodes are integer ids, chance
+    # probabilities and terminal utilities are read from arrays, and infosets are resolved by
+    # index instead of building keys from states. The traversal visits nodes in the same order
+    # and runs the same updates, so CFR, CFR+, DCFR, DCFR+ and PCFR+ reproduce CFRTrainer
+    # exactly (vanilla CFR and DCFR update regrets mid-traversal, so the order matters).
+    def __init__(self, game, config: CFRConfig | None = None) -> None:
+        super().__init__(game, config)
+        self.tree = game_tree(game)
+        self._keys = self.tree.infoset_keys
+        self._table: List[InfoSet] = []
+        for key, actions in zip(self.tree.infoset_keys, self.tree.infoset_actions):
+            infoset = InfoSet(list(actions))
+            if self.config.use_predictive:
+                infoset.prediction = [0.0 for _ in actions]
+            self.infosets[key] = infoset
+            self._table.append(infoset)
+
+    def _root(self) -> int:
+        return 0
+
+    def _cfr(self, node: int, reach_p0: float, reach_p1: float, update_player: int | None) -> float:
+        tree = self.tree
+        player = tree.player[node]
+        if player == NODE_TERMINAL:
+            return tree.utility[node]
+        start = tree.child_start[node]
+        end = start + tree.child_count[node]
+        if player == NODE_CHANCE:
+            prob = tree.chance_prob
+            value = 0.0
+            for child in range(start, end):
+                value += prob[child] * self._cfr(child, reach_p0, reach_p1, update_player)
+            return value
+
+        index = tree.infoset[node]
+        infoset = self._table[index]
+        strategy = infoset.current_strategy()
+        util: List[float] = []
+        node_util = 0.0
+        for idx, child in enumerate(range(start, end)):
+            if player == 0:
+                util_value = self._cfr(child, reach_p0 * strategy[idx], reach_p1, update_player)
+            else:
+                util_value = self._cfr(child, reach_p0, reach_p1 * strategy[idx], update_player)
+            util.append(util_value)
+            node_util += strategy[idx] * util_value
+
+        if update_player is None or update_player == player:
+            self._update_infoset(self._keys[index], infoset, player, strategy, util, node_util, reach_p0, reach_p1)
+        return node_util
+
+
+def profile_rows(tree: FlatGameTree, profile: Dict[str, Dict[str, float]]) -> List[List[float]]:
+    # Strategy row per infoset in tree order; infosets missing from the profile play uniformly,
+    # as in algorithms.evaluation.
+    rows = []
+    for key, actions in zip(tree.infoset_keys, tree.infoset_actions):
+        probs = profile.get(key)
+        if probs is None:
+            rows.append([1.0 / len(actions) for _ in actions])
+        else:
+            rows.append([probs[action] for action in actions])
+    return rows
+
+
+def tabular_best_response_value(tree: FlatGameTree, rows: List[List[float]], br_player: int) -> float:
+    # Exact best response in two sweeps over the level-ordered arrays: a forward pass for the
+    # chance-times-opponent reach of every node, then a backward pass one depth at a time.
+    # Each depth first sums reach-weighted child values per best-responder infoset, then picks
+    # the best action (first maximum, as algorithms.evaluation does) for all of its nodes.
+    player = tree.player
+    infoset = tree.infoset
+    prob = tree.chance_prob
+    child_start = tree.child_start
+    child_count = tree.child_count
+    reach = [0.0] * tree.num_nodes
+    reach[0] = 1.0
+    for node in range(tree.num_nodes):
+        actor = player[node]
+        if actor == NODE_TERMINAL:
+            continue
+        node_reach = reach[node]
+        start = child_start[node]
+        if actor == NODE_CHANCE:
+            for child in range(start, start + child_count[node]):
+                reach[child] = node_reach * prob[child]
+        elif actor == br_player:
+            for child in range(start, start + child_count[node]):
+                reach[child] = node_reach
+        else:
+            for idx, weight in enumerate(rows[infoset[node]]):
+                reach[start + idx] = node_reach * weight
+
+    sign = 1.0 if br_player == 0 else -1.0
+    utility = tree.utility
+    value = [0.0] * tree.num_nodes
+    levels = tree.level_start
+    for level in range(len(levels) - 2, -1, -1):
+        totals: Dict[int, List[float]] = {}
+        br_nodes: Dict[int, List[int]] = {}
+        for node in range(levels[level], levels[level + 1]):
+            actor = player[node]
+            if actor == NODE_TERMINAL:
+                value[node] = sign * utility[node]
+                continue
+            start = child_start[node]
+            count = child_count[node]
+            if actor == NODE_CHANCE:
+                total = 0.0
+                for child in range(start, start + count):
+                    total += prob[child] * value[child]
+                value[node] = total
+            elif actor == br_player:
+                index = infoset[node]
+                row = totals.get(index)
+                if row is None:
+                    row = totals[index] = [0.0] * count
+                    br_nodes[index] = []
+                node_reach = reach[node]
+                for idx in range(count):
+                    row[idx] += node_reach * value[start + idx]
+                br_nodes[index].append(node)
+            else:
+                total = 0.0
+                for idx, weight in enumerate(rows[infoset[node]]):
+                    total += weight * value[start + idx]
+                value[node] = total
+        for index, row in totals.items():
+            best = max(range(len(row)), key=lambda i: row[i])
+            for node in br_nodes[index]:
+                value[node] = value[child_start[node] + best]
+    return value[0]
+
+
+def tabular_exploitability(game, profile: Dict[str, Dict[str, float]]) -> float:
+    # Same value as algorithms.evaluation.exploitability for any profile keyed by infoset key.
+    tree = game_tree(game)
+    rows = profile_rows(tree, profile)
+    br0 = tabular_best_response_value(tree, rows, 0)
+    br1 = tabular_best_response_value(tree, rows, 1)
+    return 0.5 * (br0 + br1)
@@ -0,0 +1,539 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from multiprocessing import Pipe, Process
+from time import perf_counter
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from algorithms.profiler import SolverProfiler
+from algorithms.storage import check_storage
+from algorithms.vector_cfr import VectorInfoSet
+from algorithms.vector_eval import (
+    CardRemovalIndex,
+    best_response_backward,
+    best_response_reach,
+    build_card_removal_index,
+    build_strength_summary,
+    fold_values_card_removal,
+    showdown_values_card_removal,
+    valid_weights_card_removal,
+)
+from games.river_tree import TERMINAL_FOLD, TERMINAL_NONE, FlatRiverTree
+from games.turn_river import TurnRiverGame
+
+Profile = Dict[str, Tuple[List[str], List[List[float]]]]
+# Per chance node: (update player's reach, opponent's reach) where the turn betting closed.
+ChanceReach = Dict[int, Tuple[List[float], List[float]]]
+
+
+@dataclass
+class TurnRiverCFRConfig:
+    use_plus: bool = False
+    linear_weighting: bool = False
+    # Runout evaluators (per-river-card strength summaries and card-removal indices) are built
+    # on first use and kept in an LRU of this many entries per process.
+    runout_cache_size: int = 48
+    # Processes that own the river subtrees; runouts are dealt round-robin to them.
+    workers: int = 1
+    # Regret/strategy table layout (algorithms.storage).
+    storage: str = "list"
+
+
+@dataclass
+class RunoutTables:
+    card: int
+    # Per player: whether each turn hand survives this river card.
+    live: List[List[bool]]
+    removal: Dict[int, CardRemovalIndex]
+
+
+def build_runout_tables(game: TurnRiverGame, card: int) -> RunoutTables:
+    hands = game.runout_hands(card)
+    removal = {
+        player: build_card_removal_index(hands[player], build_strength_summary(hands[1 - player]))
+        for player in (0, 1)
+    }
+    live = [[card not in hand.cards for hand in game.hands[player]] for player in (0, 1)]
+    return RunoutTables(card=card, live=live, removal=removal)
+
+
+class RunoutCache:
+    # Same LRU shape as the batch CLI's BoardCache: most recently used entries at the end.
+    def __init__(self, game: TurnRiverGame, max_entries: int) -> None:
+        self.game = game
+        self.max_entries = max(1, max_entries)
+        self.entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, card: int) -> RunoutTables:
+        tables = self.entries.get(card)
+        if tables is not None:
+            self.entries.move_to_end(card)
+            self.hits += 1
+            return tables
+        self.misses += 1
+        tables = build_runout_tables(self.game, card)
+        self.entries[card] = tables
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return tables
+
+
+def turn_removal_index(game: TurnRiverGame) -> Dict[int, CardRemovalIndex]:
+    # Turn fold terminals only need blockers: every turn hand has the same (zero) strength.
+    return {
+        player: build_card_removal_index(game.hands[player], build_strength_summary(game.hands[1 - player]))
+        for player in (0, 1)
+    }
+
+
+def _mask(values: Sequence[float], live: Sequence[bool]) -> List[float]:
+    return [value if alive else 0.0 for value, alive in zip(values, live)]
+
+
+def _make_infosets(tree: FlatRiverTree, num_hands: Sequence[int], storage: str) -> List[VectorInfoSet | None]:
+    infosets: List[VectorInfoSet | None] = [None for _ in range(tree.num_nodes)]
+    for node in tree.decision_nodes:
+        actions = [tree.actions[child] for child in tree.children(node)]
+        infosets[node] = VectorInfoSet(num_hands[tree.player[node]], actions, storage)
+    return infosets
+
+
+def _forward(
+    tree: FlatRiverTree,
+    infosets: List[VectorInfoSet | None],
+    update_player: int,
+    root_p: List[float],
+    root_opp: List[float],
+) -> Tuple[List[List[float] | None], List[List[float] | None], List[List[List[float]] | None]]:
+    # Level-order reach propagation through current strategies (see VectorCFRTrainer._traverse).
+    reach_p: List[List[float] | None] = [None for _ in range(tree.num_nodes)]
+    reach_opp: List[List[float] | None] = [None for _ in range(tree.num_nodes)]
+    strategies: List[List[List[float]] | None] = [None for _ in range(tree.num_nodes)]
+    reach_p[0] = root_p
+    reach_opp[0] = root_opp
+    for node in tree.decision_nodes:
+        strategy = infosets[node].current_strategy()
+        strategies[node] = strategy
+        own = tree.player[node] == update_player
+        parent = reach_p[node] if own else reach_opp[node]
+        live = any(parent)
+        for a_idx, child in enumerate(tree.children(node)):
+            child_reach = [parent[h] * strategy[h][a_idx] for h in range(len(parent))] if live else parent
+            reach_p[child] = child_reach if own else reach_p[node]
+            reach_opp[child] = reach_opp[node] if own else child_reach
+    return reach_p, reach_opp, strategies
+
+
+@dataclass
+class _UpdateRule:
+    use_plus: bool
+    regret_weight: float
+    strategy_weight: float
+
+
+def _rule(config: TurnRiverCFRConfig, iteration: int) -> _UpdateRule:
+    # Same weighting as VectorCFRTrainer without DCFR: linear CFR scales regrets, CFR+ only averages.
+    linear = config.linear_weighting
+    return _UpdateRule(
+        use_plus=config.use_plus,
+        regret_weight=float(iteration) if linear and not config.use_plus else 1.0,
+        strategy_weight=float(iteration) if linear else 1.0,
+    )
+
+
+def _backward(
+    tree: FlatRiverTree,
+    infosets: List[VectorInfoSet | None],
+    update_player: int,
+    num_hands: int,
+    reach_p: List[List[float] | None],
+    strategies: List[List[List[float]] | None],
+    leaf_values: Callable[[int], List[float]],
+    rule: _UpdateRule,
+) -> List[float]:
+    # Reverse level order; regrets and strategy sums of the update player are written in place.
+    values: List[List[float] | None] = [None for _ in range(tree.num_nodes)]
+    for node in range(tree.num_nodes - 1, -1, -1):
+        if tree.terminal[node] != TERMINAL_NONE:
+            values[node] = leaf_values(node)
+            continue
+        children = tree.children(node)
+        action_values = [values[child] for child in children]
+        for child in children:
+            values[child] = None
+        if tree.player[node] != update_player:
+            node_values = [0.0 for _ in range(num_hands)]
+            for child_values in action_values:
+                for h_idx, value in enumerate(child_values):
+                    node_values[h_idx] += value
+            values[node] = node_values
+            continue
+        infoset = infosets[node]
+        strategy = strategies[node]
+        own_reach = reach_p[node]
+        node_values = [0.0 for _ in range(num_hands)]
+        for h_idx in range(num_hands):
+            probs = strategy[h_idx]
+            value = 0.0
+            for a_idx, child_values in enumerate(action_values):
+                value += probs[a_idx] * child_values[h_idx]
+            node_values[h_idx] = value
+            regrets = infoset.regret_sum[h_idx]
+            for a_idx, child_values in enumerate(action_values):
+                delta = (child_values[h_idx] - value) * rule.regret_weight
+                regrets[a_idx] = max(0.0, regrets[a_idx] + delta) if rule.use_plus else regrets[a_idx] + delta
+            weight = own_reach[h_idx] * rule.strategy_weight
+            if weight != 0.0:
+                sums = infoset.strategy_sum[h_idx]
+                for a_idx, prob in enumerate(probs):
+                    sums[a_idx] += weight * prob
+        infoset.mark_dirty()
+        values[node] = node_values
+    return values[0]
+
+
+class RunoutSolver:
+    # Owns the river infosets of a fixed set of runouts for every chance node and solves those
+    # subtrees given the reach where the turn betting closed. Infosets are allocated on first
+    # visit; evaluators come from a bounded RunoutCache. Runs in-process or inside a worker.
+    def __init__(self, game: TurnRiverGame, config: TurnRiverCFRConfig, runouts: Sequence[int]) -> None:
+        self.game = game
+        self.config = config
+        self.runouts = list(runouts)
+        self.num_hands = [len(game.hands[0]), len(game.hands[1])]
+        self.cache = RunoutCache(game, config.runout_cache_size)
+        self.infosets: Dict[Tuple[int, int], List[VectorInfoSet | None]] = {}
+
+    def _infosets(self, node: int, card: int) -> List[VectorInfoSet | None]:
+        infosets = self.infosets.get((node, card))
+        if infosets is None:
+            infosets = _make_infosets(self.game.river_trees[node], self.num_hands, self.config.storage)
+            self.infosets[(node, card)] = infosets
+        return infosets
+
+    def solve(
+        self, update_player: int, iteration: int, chance_reach: ChanceReach, reverse: bool
+    ) -> Dict[int, Dict[int, List[float]]]:
+        # Per runout card, each chance node's river values with dead hands zeroed (not yet divided
+        # by the number of river deals). The caller sums cards in game.runouts order, so the total
+        # does not depend on how runouts are sharded. Alternate traversals walk the runouts in
+        # reverse, so an LRU smaller than the runout count still reuses its most recent entries.
+        game = self.game
+        rule = _rule(self.config, iteration)
+        num_hands = self.num_hands[update_player]
+        card_values: Dict[int, Dict[int, List[float]]] = {}
+        for card in reversed(self.runouts) if reverse else self.runouts:
+            tables = self.cache.get(card)
+            live_p = tables.live[update_player]
+            live_opp = tables.live[1 - update_player]
+            removal = tables.removal[update_player]
+            node_values: Dict[int, List[float]] = {}
+            for node, (reach_p, reach_opp) in chance_reach.items():
+                reach_opp = _mask(reach_opp, live_opp)
+                turn_contrib = game.turn_contrib(node, update_player)
+                tree = game.river_trees[node]
+                if tree is None:
+                    values = showdown_values_card_removal(removal, reach_opp, game.turn_tree.pot[node], turn_contrib)
+                else:
+                    values = self._solve_river(
+                        tree, self._infosets(node, card), update_player, num_hands,
+                        _mask(reach_p, live_p), reach_opp, removal, turn_contrib, rule,
+                    )
+                node_values[node] = _mask(values, live_p)
+            card_values[card] = node_values
+        return card_values
+
+    def _solve_river(
+        self,
+        tree: FlatRiverTree,
+        infosets: List[VectorInfoSet | None],
+        update_player: int,
+        num_hands: int,
+        root_p: List[float],
+        root_opp: List[float],
+        removal: CardRemovalIndex,
+        turn_contrib: int,
+        rule: _UpdateRule,
+    ) -> List[float]:
+        reach_p, reach_opp, strategies = _forward(tree, infosets, update_player, root_p, root_opp)
+
+        def leaf_values(node: int) -> List[float]:
+            opp_weights = reach_opp[node]
+            if not any(opp_weights):
+                return [0.0 for _ in range(num_hands)]
+            contrib = turn_contrib + tree.contrib(node, update_player)
+            if tree.terminal[node] == TERMINAL_FOLD:
+                payoff = tree.pot[node] - contrib if tree.fold_winner[node] == update_player else -contrib
+                return fold_values_card_removal(removal, payoff, opp_weights)
+            return showdown_values_card_removal(removal, opp_weights, tree.pot[node], contrib)
+
+        return _backward(tree, infosets, update_player, num_hands, reach_p, strategies, leaf_values, rule)
+
+    def average_profile(self) -> Dict[int, Profile]:
+        profile: Dict[int, Profile] = {0: {}, 1: {}}
+        for (node, card), infosets in self.infosets.items():
+            tree = self.game.river_trees[node]
+            prefix = self.game.river_prefix(node, card)
+            for river_node in tree.decision_nodes:
+                infoset = infosets[river_node]
+                key = f"{prefix}|{tree.keys[river_node]}"
+                profile[tree.player[river_node]][key] = (infoset.action_tokens, infoset.average_strategy())
+        return profile
+
+    def cache_stats(self) -> Tuple[int, int]:
+        return self.cache.hits, self.cache.misses
+
+
+def _worker_main(conn, game: TurnRiverGame, config: TurnRiverCFRConfig, runouts: List[int]) -> None:
+    solver = RunoutSolver(game, config, runouts)
+    while True:
+        name, args = conn.recv()
+        if name == "close":
+            break
+        try:
+            result = getattr(solver, name)(*args)
+        except Exception as exc:  # reported to the parent, which re-raises it
+            result = exc
+        conn.send(result)
+    conn.close()
+
+
+class _LocalRunouts:
+    # In-process stand-in with the same send/receive protocol as _WorkerRunouts.
+    def __init__(self, solver: RunoutSolver) -> None:
+        self.solver = solver
+        self._result = None
+
+    def send(self, name: str, *args) -> None:
+        self._result = getattr(self.solver, name)(*args)
+
+    def receive(self):
+        return self._result
+
+    def close(self) -> None:
+        pass
+
+
+class _WorkerRunouts:
+    def __init__(self, game: TurnRiverGame, config: TurnRiverCFRConfig, runouts: List[int]) -> None:
+        self.conn, child = Pipe()
+        self.process = Process(target=_worker_main, args=(child, game, config, runouts), daemon=True)
+        self.process.start()
+        child.close()
+
+    def send(self, name: str, *args) -> None:
+        self.conn.send((name, args))
+
+    def receive(self):
+        result = self.conn.recv()
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    def close(self) -> None:
+        if self.process.is_alive():
+            self.conn.send(("close", ()))
+            self.process.join()
+        self.conn.close()
+
+
+class TurnRiverCFRTrainer:
+    # Vector-form CFR over turn + river. The parent keeps the turn infosets; each traversal runs
+    # the turn forward pass, hands the reach at every chance node to the runout owners (worker
+    # processes when config.workers > 1, all solving their runouts concurrently), and finishes
+    # the turn backward pass on the summed river values divided by the number of river deals.
+    def __init__(self, game: TurnRiverGame, config: TurnRiverCFRConfig | None = None) -> None:
+        self.game = game
+        self.config = config or TurnRiverCFRConfig()
+        check_storage(self.config.storage)
+        self.iteration = 0
+        self.num_hands = [len(game.hands[0]), len(game.hands[1])]
+        self.turn_infosets = _make_infosets(game.turn_tree, self.num_hands, self.config.storage)
+        self.turn_removal = turn_removal_index(game)
+        workers = max(1, min(self.config.workers, len(game.runouts)))
+        shards = [game.runouts[w::workers] for w in range(workers)]
+        if workers == 1:
+            self.runouts = [_LocalRunouts(RunoutSolver(game, self.config, shards[0]))]
+        else:
+            self.runouts = [_WorkerRunouts(game, self.config, shard) for shard in shards]
+        self._reverse = False
+        # Profiler phases: forward and backward cover the turn tree, terminal the river solves behind
+        # its chance nodes (all shards, wall time).
+        self.profiler: SolverProfiler | None = None
+
+    def close(self) -> None:
+        for runouts in self.runouts:
+            runouts.close()
+
+    def __enter__(self) -> "TurnRiverCFRTrainer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _traverse(self, update_player: int) -> None:
+        game = self.game
+        tree = game.turn_tree
+        num_hands = self.num_hands[update_player]
+        rule = _rule(self.config, self.iteration)
+        profiler = self.profiler
+        tick = perf_counter() if profiler is not None else 0.0
+        reach_p, reach_opp, strategies = _forward(
+            tree, self.turn_infosets, update_player,
+            list(game.hand_weights[update_player]), list(game.hand_weights[1 - update_player]),
+        )
+        if profiler is not None:
+            now = perf_counter()
+            profiler.add("forward", now - tick)
+            tick = now
+        chance_reach = {node: (reach_p[node], reach_opp[node]) for node in game.chance_nodes}
+        for runouts in self.runouts:
+            runouts.send("solve", update_player, self.iteration, chance_reach, self._reverse)
+        self._reverse = not self._reverse
+        card_values: Dict[int, Dict[int, List[float]]] = {}
+        for runouts in self.runouts:
+            card_values.update(runouts.receive())
+        # Floating-point sums depend on order: add cards in game.runouts order for any sharding.
+        chance_values = {node: [0.0 for _ in range(num_hands)] for node in game.chance_nodes}
+        for card in game.runouts:
+            for node, values in card_values[card].items():
+                total = chance_values[node]
+                for h_idx, value in enumerate(values):
+                    total[h_idx] += value
+        if profiler is not None:
+            now = perf_counter()
+            profiler.add("terminal", now - tick)
+            tick = now
+        scale = 1.0 / game.river_deal_count
+        removal = self.turn_removal[update_player]
+
+        def leaf_values(node: int) -> List[float]:
+            if node in chance_values:
+                return [value * scale for value in chance_values[node]]
+            contrib = tree.contrib(node, update_player)
+            payoff = tree.pot[node] - contrib if tree.fold_winner[node] == update_player else -contrib
+            return fold_values_card_removal(removal, payoff, reach_opp[node])
+
+        _backward(tree, self.turn_infosets, update_player, num_hands, reach_p, strategies, leaf_values, rule)
+        if profiler is not None:
+            profiler.visit(tree.num_nodes)
+            profiler.add("backward", perf_counter() - tick)
+
+    def run(self, iterations: int) -> None:
+        for _ in range(iterations):
+            self.iteration += 1
+            if self.profiler is not None:
+                self.profiler.begin_iteration(self.iteration)
+            for player in (0, 1):
+                self._traverse(player)
+            if self.profiler is not None:
+                self.profiler.end_iteration()
+
+    def cache_stats(self) -> Tuple[int, int]:
+        hits = misses = 0
+        for runouts in self.runouts:
+            runouts.send("cache_stats")
+        for runouts in self.runouts:
+            shard_hits, shard_misses = runouts.receive()
+            hits += shard_hits
+            misses += shard_misses
+        return hits, misses
+
+    def average_strategy_profile(self) -> Dict[int, Profile]:
+        tree = self.game.turn_tree
+        profile: Dict[int, Profile] = {0: {}, 1: {}}
+        for node in tree.decision_nodes:
+            infoset = self.turn_infosets[node]
+            profile[tree.player[node]][tree.keys[node]] = (infoset.action_tokens, infoset.average_strategy())
+        for runouts in self.runouts:
+            runouts.send("average_profile")
+        for runouts in self.runouts:
+            for player, entries in runouts.receive().items():
+                profile[player].update(entries)
+        return profile
+
+
+def _river_profiles(game: TurnRiverGame, profile: Profile) -> Dict[str, Profile]:
+    # Split "<turn line>|<card>|<river line>" keys into one river-tree profile per runout.
+    split: Dict[str, Profile] = {}
+    for key, entry in profile.items():
+        prefix, sep, river_key = key.rpartition("|")
+        if sep:
+            split.setdefault(prefix, {})[river_key] = entry
+    return split
+
+
+def turn_river_best_response_value(
+    game: TurnRiverGame,
+    target_player: int,
+    opponent_profile: Profile,
+    cache: RunoutCache,
+    turn_removal: Dict[int, CardRemovalIndex],
+) -> float:
+    # Expected best-response value of the target player, normalized like weighted_br_value.
+    tree = game.turn_tree
+    opp = 1 - target_player
+    num_target = len(game.hands[target_player])
+    river_profiles = _river_profiles(game, opponent_profile)
+    turn_reach = best_response_reach(tree, target_player, opponent_profile, game.hand_weights[opp])
+    chance_values = {node: [0.0 for _ in range(num_target)] for node in game.chance_nodes}
+    for card in game.runouts:
+        tables = cache.get(card)
+        live_target = tables.live[target_player]
+        removal = tables.removal[target_player]
+        for node in game.chance_nodes:
+            reach = _mask(turn_reach[node], tables.live[opp])
+            turn_contrib = game.turn_contrib(node, target_player)
+            river_tree = game.river_trees[node]
+            if river_tree is None:
+                values = showdown_values_card_removal(removal, reach, tree.pot[node], turn_contrib)
+            else:
+                river_profile = river_profiles.get(game.river_prefix(node, card), {})
+                river_reach = best_response_reach(river_tree, target_player, river_profile, reach)
+                values, _ = best_response_backward(river_tree, target_player, removal, river_reach)
+                # River-tree contributions start at zero; every river terminal also costs the turn
+                # contribution, once per unit of opponent mass that reaches the river.
+                valid = valid_weights_card_removal(removal, reach)
+                values = [value - turn_contrib * mass for value, mass in zip(values, valid)]
+            total = chance_values[node]
+            for h_idx, value in enumerate(values):
+                if live_target[h_idx]:
+                    total[h_idx] += value
+    scale = 1.0 / game.river_deal_count
+    removal = turn_removal[target_player]
+    values: List[List[float] | None] = [None for _ in range(tree.num_nodes)]
+    for node in range(tree.num_nodes - 1, -1, -1):
+        if node in chance_values:
+            values[node] = [value * scale for value in chance_values[node]]
+            continue
+        if tree.terminal[node] != TERMINAL_NONE:
+            contrib = tree.contrib(node, target_player)
+            payoff = tree.pot[node] - contrib if tree.fold_winner[node] == target_player else -contrib
+            values[node] = fold_values_card_removal(removal, payoff, turn_reach[node])
+            continue
+        action_values = [values[child] for child in tree.children(node)]
+        if tree.player[node] == target_player:
+            values[node] = [max(column) for column in zip(*action_values)]
+        else:
+            values[node] = [sum(column) for column in zip(*action_values)]
+    weights = game.hand_weights[target_player]
+    valid = valid_weights_card_removal(removal, game.hand_weights[opp])
+    total_weight = sum(weight * mass for weight, mass in zip(weights, valid))
+    if total_weight <= 0.0:
+        return 0.0
+    return sum(weight * value for weight, value in zip(weights, values[0])) / total_weight
+
+
+def turn_river_exploitability(
+    game: TurnRiverGame,
+    profile: Dict[int, Profile],
+    cache: RunoutCache,
+    turn_removal: Dict[int, CardRemovalIndex] | None = None,
+) -> float:
+    turn_removal = turn_removal or turn_removal_index(game)
+    br0 = turn_river_best_response_value(game, 0, profile[1], cache, turn_removal)
+    br1 = turn_river_best_response_value(game, 1, profile[0], cache, turn_removal)
+    return (br0 + br1 - float(game.base_pot)) / 2.0
@@ -1,19 +1,26 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from math import pow
-from typing import Dict, List, Tuple
+from array import array
+from dataclasses import asdict, dataclass
+from time import perf_counter
+from typing import Dict, List, Sequence, Tuple
 
+from algorithms.discount import LazyDiscount, make_discount
 from algorithms.naive_eval import showdown_values_naive
+from algorithms.profiler import SolverProfiler
+from algorithms.snapshot import check_trainer_meta, flatten_rows, unflatten_rows
+from algorithms.storage import check_storage, make_rows, rows_from_flat
 from algorithms.vector_eval import (
     StrengthSummary,
     action_tokens,
-    build_blocked_indices,
+    build_card_removal_index,
     build_strength_summary,
-    fold_values,
-    showdown_values,
+    fold_values_card_removal,
+    showdown_values_card_removal,
 )
-from games.river_holdem import Action, RiverHoldemGame, RiverState
+from games.river_holdem import Action, RiverHoldemGame
+from games.river_tree import TERMINAL_FOLD, TERMINAL_NONE
+from games.suit_iso import HandIsomorphism
 
 
 @dataclass
@@ -26,23 +33,54 @@ class VectorCFRConfig:
     dcfr_alpha: float = 1.5
     dcfr_beta: float = 0.0
     dcfr_gamma: float = 2.0
+    # Predictive regret matching: play [R + m]^+ where m is the last instantaneous regret.
+    # With use_plus this is PCFR+. use_plus together with use_dcfr is DCFR+ (discount, then floor).
+    use_predictive: bool = False
+    # Skip terminal evaluation and regret updates below nodes the opponent reaches with zero
+    # probability for every hand (their counterfactual values are exactly zero).
+    skip_zero_reach: bool = True
+    # Solve on suit-isomorphism classes (games.suit_iso): one row per class of strategically
+    # identical hands; average_strategy_profile expands back to every combo.
+    suit_isomorphism: bool = False
+    # "list" keeps the pure-Python reference tables; "array" uses NumPy (see algorithms.array_cfr).
+    engine: str = "list"
+    # Regret/strategy table layout (algorithms.storage): "list", "float64" or "float32".
+    # The array engine maps "float32" to float32 arrays and anything else to float64.
+    storage: str = "list"
+    # With alternating=False and the list engine, workers > 1 runs each iteration's traversals in
+    # that many processes over shared-memory tables (see algorithms.parallel_cfr).
+    workers: int = 1
+
+
+def format_skip_stats(stats: Dict[str, int]) -> str:
+    nodes = max(stats["nodes"], 1)
+    terminals = max(stats["terminals"], 1)
+    return (
+        f"skipped {stats['nodes_skipped'] / nodes:.1%} of node visits and "
+        f"{stats['terminals_skipped'] / terminals:.1%} of terminal evaluations"
+    )
 
 
 class VectorInfoSet:
-    def __init__(self, num_hands: int, actions: List[Action]) -> None:
+    def __init__(self, num_hands: int, actions: List[Action], storage: str = "list") -> None:
         self.actions = actions
         self.action_tokens = action_tokens(actions)
-        self.regret_sum = [[0.0 for _ in actions] for _ in range(num_hands)]
-        self.strategy_sum = [[0.0 for _ in actions] for _ in range(num_hands)]
+        # See algorithms.storage; the current-strategy cache uses the same layout as the sums.
+        self.storage = storage
+        self.regret_sum = make_rows(storage, num_hands, len(actions))
+        self.strategy_sum = make_rows(storage, num_hands, len(actions))
         self._strategy_cache: List[List[float]] | None = None
-        self.last_dcfr_iter = 0
+        # Last instantaneous regrets (predictive variants only), in the same stored units as regret_sum.
+        self.prediction: List[List[float]] | None = None
 
     def current_strategy(self) -> List[List[float]]:
         # Cache current strategy because it is reused within a traversal.
         if self._strategy_cache is not None:
             return self._strategy_cache
         strategy = []
-        for regrets in self.regret_sum:
+        for h_idx, regrets in enumerate(self.regret_sum):
+            if self.prediction is not None:
+                regrets = [r + m for r, m in zip(regrets, self.prediction[h_idx])]
             positives = [max(r, 0.0) for r in regrets]
             normalizing = sum(positives)
             if normalizing > 0.0:
@@ -50,6 +88,9 @@ class VectorInfoSet:
             else:
                 num_actions = len(regrets)
                 strategy.append([1.0 / num_actions for _ in range(num_actions)])
+        if self.storage != "list":
+            flat = [prob for row in strategy for prob in row]
+            strategy = rows_from_flat(self.storage, flat, len(strategy), len(self.actions))
         self._strategy_cache = strategy
         return strategy
 
@@ -67,67 +108,95 @@ class VectorInfoSet:
     def mark_dirty(self) -> None:
         self._strategy_cache = None
 
-    def apply_dcfr_discount(self, iteration: int, alpha: float, beta: float, gamma: float) -> None:
-        if self.last_dcfr_iter == iteration:
-            return
-        # Apply DCFR decay per iteration; keeps regrets/averages from growing unbounded.
-        for t in range(self.last_dcfr_iter + 1, iteration + 1):
-            pos_base = pow(float(t), alpha)
-            neg_base = pow(float(t), beta)
-            pos_scale = pos_base / (pos_base + 1.0)
-            neg_scale = neg_base / (neg_base + 1.0)
-            strat_scale = pow(float(t) / (float(t) + 1.0), gamma)
-            for h_idx, row in enumerate(self.regret_sum):
-                for a_idx, regret in enumerate(row):
-                    if regret > 0.0:
-                        row[a_idx] = regret * pos_scale
-                    elif regret < 0.0:
-                        row[a_idx] = regret * neg_scale
-            for h_idx, row in enumerate(self.strategy_sum):
-                for a_idx, value in enumerate(row):
-                    row[a_idx] = value * strat_scale
-        self.last_dcfr_iter = iteration
-        self.mark_dirty()
+    def set_strategy(self, strategy) -> None:
+        # Installs a current strategy computed elsewhere (algorithms.parallel_cfr shares one table
+        # between processes); it is served until the next mark_dirty.
+        self._strategy_cache = strategy
 
 
 class VectorCFRTrainer:
     def __init__(self, game: RiverHoldemGame, config: VectorCFRConfig | None = None) -> None:
         self.game = game
         self.config = config or VectorCFRConfig()
+        if self.config.engine != "list":
+            raise ValueError(f"Use make_vector_cfr_trainer for engine {self.config.engine!r}")
+        check_storage(self.config.storage)
         self.iteration = 0
-        self.num_hands = [len(game.hands[0]), len(game.hands[1])]
-        self.hand_weights = game.hand_weights
+        self.iso = HandIsomorphism(game) if self.config.suit_isomorphism else None
+        if self.iso is not None:
+            self.hands = [self.iso.representative_hands(0), self.iso.representative_hands(1)]
+            self.hand_weights = self.iso.class_weights
+        else:
+            self.hands = game.hands
+            self.hand_weights = game.hand_weights
+        self.num_hands = [len(self.hands[0]), len(self.hands[1])]
         self.infosets: Dict[int, Dict[str, VectorInfoSet]] = {0: {}, 1: {}}
+        # Opponent summaries always cover every combo so card removal stays exact.
         self.opp_summary: Dict[int, StrengthSummary] = {
             0: build_strength_summary(game.hands[1]),
             1: build_strength_summary(game.hands[0]),
         }
-        self.blocked_indices = {
-            0: build_blocked_indices(game.hands[0], self.opp_summary[0]),
-            1: build_blocked_indices(game.hands[1], self.opp_summary[1]),
+        self.removal = {
+            0: build_card_removal_index(self.hands[0], self.opp_summary[0]),
+            1: build_card_removal_index(self.hands[1], self.opp_summary[1]),
         }
-        self._pending_regret: Dict[int, Dict[str, List[List[float]]]] = {0: {}, 1: {}}
-
-    def _get_infoset(self, player: int, state: RiverState) -> Tuple[str, VectorInfoSet]:
-        key = self.game.infoset_key(state, player)
-        infoset = self.infosets[player].get(key)
-        if infoset is None:
-            actions = self.game.legal_actions(state)
-            infoset = VectorInfoSet(self.num_hands[player], actions)
-            self.infosets[player][key] = infoset
-        return key, infoset
-
-    def _accumulate_regret(self, player: int, key: str, infoset: VectorInfoSet, deltas: List[List[float]]) -> None:
+        self._pending_regret: Dict[int, Dict[int, List[List[float]]]] = {0: {}, 1: {}}
+        # Infosets are bound to compiled node ids; string keys are kept only for profile export.
+        self.tree = game.flat_tree()
+        self.node_infosets: List[VectorInfoSet | None] = [None for _ in range(self.tree.num_nodes)]
+        for node in self.tree.decision_nodes:
+            player = self.tree.player[node]
+            actions = [self.tree.actions[child] for child in self.tree.children(node)]
+            infoset = VectorInfoSet(self.num_hands[player], actions, self.config.storage)
+            if self.config.use_predictive:
+                infoset.prediction = [[0.0 for _ in actions] for _ in range(self.num_hands[player])]
+            self.infosets[player][self.tree.keys[node]] = infoset
+            self.node_infosets[node] = infoset
+        # DCFR discounts live in cumulative factors; tables are never rescaled per iteration.
+        self.discount: LazyDiscount | None = make_discount(self.config)
+        # Node visits over all traversals; "skipped" nodes had no values computed.
+        self.skip_stats = {"nodes": 0, "nodes_skipped": 0, "terminals": 0, "terminals_skipped": 0}
+        # Optional per-phase timing and counters (algorithms.profiler); None keeps traversals unprofiled.
+        self.profiler: SolverProfiler | None = None
+        self._subtrees: Dict[int, Tuple[Sequence[int], Sequence[int]]] = {
+            0: (range(self.tree.num_nodes), self.tree.decision_nodes)
+        }
+
+    def _set_prediction(self, infoset: VectorInfoSet, deltas: List[List[float]]) -> None:
+        # The prediction is added to stored positive regrets, so it is kept in the same units.
+        inv_pos = 1.0 / self.discount.pos if self.discount is not None else 1.0
+        infoset.prediction = [[delta * inv_pos for delta in row] for row in deltas]
+
+    def _accumulate_regret(self, player: int, node: int, infoset: VectorInfoSet, deltas: List[List[float]]) -> None:
         if not self.config.use_plus:
-            for h_idx in range(self.num_hands[player]):
-                row = infoset.regret_sum[h_idx]
-                delta_row = deltas[h_idx]
-                for a_idx, delta in enumerate(delta_row):
-                    row[a_idx] += delta
+            if infoset.prediction is not None:
+                self._set_prediction(infoset, deltas)
+            if self.discount is None:
+                for h_idx in range(self.num_hands[player]):
+                    row = infoset.regret_sum[h_idx]
+                    delta_row = deltas[h_idx]
+                    for a_idx, delta in enumerate(delta_row):
+                        row[a_idx] += delta
+            else:
+                # Read the real value with the factor for its sign, store with the factor for the new sign.
+                # Zero deltas (skipped entries) leave the stored value untouched.
+                pos = self.discount.pos
+                neg = self.discount.neg
+                inv_pos = 1.0 / pos
+                inv_neg = 1.0 / neg
+                for h_idx in range(self.num_hands[player]):
+                    row = infoset.regret_sum[h_idx]
+                    delta_row = deltas[h_idx]
+                    for a_idx, delta in enumerate(delta_row):
+                        if delta == 0.0:
+                            continue
+                        value = row[a_idx]
+                        value = (value * pos if value > 0.0 else value * neg) + delta
+                        row[a_idx] = value * inv_pos if value > 0.0 else value * inv_neg
             infoset.mark_dirty()
             return
 
-        pending = self._pending_regret[player].get(key)
+        pending = self._pending_regret[player].get(node)
         if pending is None:
             pending = [[0.0 for _ in infoset.actions] for _ in range(self.num_hands[player])]
         for h_idx in range(self.num_hands[player]):
@@ -135,149 +204,287 @@ class VectorCFRTrainer:
             delta_row = deltas[h_idx]
             for a_idx, delta in enumerate(delta_row):
                 row[a_idx] += delta
-        self._pending_regret[player][key] = pending
+        self._pending_regret[player][node] = pending
 
     def _apply_regret_updates(self, player: int) -> None:
         if not self.config.use_plus:
             return
-        for key, deltas in self._pending_regret[player].items():
-            infoset = self.infosets[player][key]
+        tick = perf_counter() if self.profiler is not None else 0.0
+        # Floored regrets are never negative, so only the positive factor applies.
+        pos = self.discount.pos if self.discount is not None else 1.0
+        inv_pos = 1.0 / pos
+        for node, deltas in self._pending_regret[player].items():
+            infoset = self.node_infosets[node]
+            if infoset.prediction is not None:
+                self._set_prediction(infoset, deltas)
             for h_idx in range(self.num_hands[player]):
                 row = infoset.regret_sum[h_idx]
                 delta_row = deltas[h_idx]
-                for a_idx, delta in enumerate(delta_row):
-                    row[a_idx] = max(0.0, row[a_idx] + delta)
+                if pos == 1.0:
+                    for a_idx, delta in enumerate(delta_row):
+                        row[a_idx] = max(0.0, row[a_idx] + delta)
+                else:
+                    for a_idx, delta in enumerate(delta_row):
+                        row[a_idx] = max(0.0, row[a_idx] * pos + delta) * inv_pos
             infoset.mark_dirty()
         self._pending_regret[player].clear()
+        if self.profiler is not None:
+            self.profiler.add("update", perf_counter() - tick)
+
+    def _advance_discount(self) -> None:
+        if self.discount is None:
+            return
+        self.discount.advance(self.iteration)
+        if not self.discount.needs_rescale():
+            return
+        # Rare: fold the factors into the tables before stored values grow out of range.
+        discount = self.discount
+        for node in self.tree.decision_nodes:
+            infoset = self.node_infosets[node]
+            for row in infoset.regret_sum:
+                discount.rescale_regrets(row)
+            for row in infoset.strategy_sum:
+                discount.rescale_strategy(row)
+            if infoset.prediction is not None:
+                for row in infoset.prediction:
+                    for a_idx, value in enumerate(row):
+                        row[a_idx] = value * discount.pos
+            infoset.mark_dirty()
+        discount.reset_factors()
 
     def _terminal_values(
         self,
-        state: RiverState,
+        node: int,
         update_player: int,
         opp_weights: List[float],
     ) -> List[float]:
-        summary = self.opp_summary[update_player]
-        pot_total = self.game.pot_total(state)
-        contrib_player = state.contrib[update_player]
-        if state.terminal_winner is not None:
-            if state.terminal_winner == update_player:
-                return fold_values(pot_total - contrib_player, self.blocked_indices[update_player], opp_weights)
-            return fold_values(-contrib_player, self.blocked_indices[update_player], opp_weights)
+        tree = self.tree
+        removal = self.removal[update_player]
+        if self.iso is not None:
+            opp_weights = self.iso.expand_reach(1 - update_player, opp_weights)
+        pot_total = tree.pot[node]
+        contrib_player = tree.contrib(node, update_player)
+        if tree.terminal[node] == TERMINAL_FOLD:
+            if tree.fold_winner[node] == update_player:
+                return fold_values_card_removal(removal, pot_total - contrib_player, opp_weights)
+            return fold_values_card_removal(removal, -contrib_player, opp_weights)
 
         if self.config.use_naive_eval:
             # O(N^2) fallback for debugging.
             return showdown_values_naive(
-                self.game.hands[update_player],
+                self.hands[update_player],
                 self.game.hands[1 - update_player],
                 opp_weights,
                 pot_total,
                 contrib_player,
             )
-        # Vector-form showdown eval uses sorted strengths and prefix sums.
-        return showdown_values(
-            self.game.hands[update_player],
-            summary,
-            self.blocked_indices[update_player],
-            opp_weights,
-            pot_total,
-            contrib_player,
-        )
+        # Vector-form showdown eval: strength-sorted prefix sums with per-card removal.
+        return showdown_values_card_removal(removal, opp_weights, pot_total, contrib_player)
 
-    def _traverse(
+    def _accumulate_strategy(
         self,
-        state: RiverState,
-        update_player: int,
-        reach_p: List[float],
-        reach_opp: List[float],
-    ) -> List[float]:
-        if self.game.is_terminal(state):
-            return self._terminal_values(state, update_player, reach_opp)
+        infoset: VectorInfoSet,
+        strategy: List[List[float]],
+        node_reach: List[float],
+        active: List[int],
+        weight_scale: float,
+    ) -> None:
+        num_actions = len(infoset.actions)
+        for h_idx in active:
+            weight = node_reach[h_idx] * weight_scale
+            if weight == 0.0:
+                continue
+            row = infoset.strategy_sum[h_idx]
+            strat_row = strategy[h_idx]
+            for a_idx in range(num_actions):
+                row[a_idx] += weight * strat_row[a_idx]
 
-        player = self.game.current_player(state)
-        if player != update_player:
-            key, infoset = self._get_infoset(player, state)
-            strategy = infoset.current_strategy()
-            actions = infoset.actions
-            values = [0.0 for _ in range(self.num_hands[update_player])]
-            for a_idx, action in enumerate(actions):
-                # Opponent branch: propagate their reach through their strategy.
-                next_reach_opp = [reach_opp[h] * strategy[h][a_idx] for h in range(self.num_hands[player])]
-                child_values = self._traverse(
-                    self.game.next_state(state, action),
-                    update_player,
-                    reach_p,
-                    next_reach_opp,
-                )
-                for h_idx, value in enumerate(child_values):
-                    values[h_idx] += value
-            return values
-
-        key, infoset = self._get_infoset(player, state)
-        if self.config.use_dcfr:
-            infoset.apply_dcfr_discount(
-                self.iteration,
-                self.config.dcfr_alpha,
-                self.config.dcfr_beta,
-                self.config.dcfr_gamma,
-            )
-        strategy = infoset.current_strategy()
-        actions = infoset.actions
-        action_values: List[List[float]] = []
-        for a_idx, action in enumerate(actions):
-            next_reach_p = [reach_p[h] * strategy[h][a_idx] for h in range(self.num_hands[player])]
-            child_values = self._traverse(
-                self.game.next_state(state, action),
-                update_player,
-                next_reach_p,
-                reach_opp,
-            )
-            action_values.append(child_values)
+    def _subtree(self, root: int) -> Tuple[Sequence[int], Sequence[int]]:
+        # (all nodes, decision nodes) below and including root, in level order.
+        cached = self._subtrees.get(root)
+        if cached is None:
+            tree = self.tree
+            nodes = [root]
+            for node in nodes:
+                if tree.terminal[node] == TERMINAL_NONE:
+                    nodes.extend(tree.children(node))
+            nodes.sort()
+            decision = [node for node in nodes if tree.terminal[node] == TERMINAL_NONE]
+            cached = self._subtrees[root] = (nodes, decision)
+        return cached
 
-        node_values = [0.0 for _ in range(self.num_hands[player])]
-        for h_idx in range(self.num_hands[player]):
-            value = 0.0
-            for a_idx in range(len(actions)):
-                value += strategy[h_idx][a_idx] * action_values[a_idx][h_idx]
-            node_values[h_idx] = value
+    def _clear_prediction(self, node: int) -> None:
+        # Matches a full traversal, whose instantaneous regrets here are zero.
+        infoset = self.node_infosets[node]
+        infoset.prediction = [[0.0 for _ in row] for row in infoset.prediction]
+        infoset.mark_dirty()
 
-        deltas = []
-        # Regret deltas are computed per hand/action for the updating player.
+    def _update_weights(self) -> Tuple[float, float]:
+        # (regret delta weight, average-strategy weight) for the current iteration.
         regret_weight = (
             float(self.iteration)
             if self.config.linear_weighting and not self.config.use_plus and not self.config.use_dcfr
             else 1.0
         )
-        for h_idx in range(self.num_hands[player]):
-            row = []
-            for a_idx in range(len(actions)):
-                row.append((action_values[a_idx][h_idx] - node_values[h_idx]) * regret_weight)
-            deltas.append(row)
-        self._accumulate_regret(player, key, infoset, deltas)
-
         weight_scale = (
             float(self.iteration) if self.config.linear_weighting and not self.config.use_dcfr else 1.0
         )
-        for h_idx in range(self.num_hands[player]):
-            weight = reach_p[h_idx] * weight_scale
-            if weight == 0.0:
+        if self.discount is not None:
+            # Stored strategy sums are real sums divided by the cumulative strategy factor.
+            weight_scale = 1.0 / self.discount.strat
+        return regret_weight, weight_scale
+
+    def _traverse(
+        self,
+        update_player: int,
+        root_reach_p: List[float],
+        root_reach_opp: List[float],
+        root: int = 0,
+    ) -> List[float]:
+        # root > 0 traverses only that node's subtree, starting from the given reach.
+        tree = self.tree
+        nodes, decision_nodes = self._subtree(root)
+        num_nodes = tree.num_nodes
+        num_hands = self.num_hands[update_player]
+        skip_zero = self.config.skip_zero_reach
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.begin_pass()
+            pass_start = perf_counter()
+        reach_p: List[List[float] | None] = [None for _ in range(num_nodes)]
+        reach_opp: List[List[float] | None] = [None for _ in range(num_nodes)]
+        # Compact index sets of the hands with non-zero reach; children only touch these entries.
+        active_p: List[List[int] | None] = [None for _ in range(num_nodes)]
+        active_opp: List[List[int] | None] = [None for _ in range(num_nodes)]
+        strategies: List[List[List[float]] | None] = [None for _ in range(num_nodes)]
+        reach_p[root] = root_reach_p
+        reach_opp[root] = root_reach_opp
+        active_p[root] = [h for h, weight in enumerate(root_reach_p) if weight != 0.0]
+        active_opp[root] = [h for h, weight in enumerate(root_reach_opp) if weight != 0.0]
+
+        # Forward pass in level order: propagate each side's reach through its current strategy.
+        for node in decision_nodes:
+            children = tree.children(node)
+            own = tree.player[node] == update_player
+            infoset = self.node_infosets[node]
+            strategy = infoset.current_strategy()
+            strategies[node] = strategy
+            parent_reach = reach_p[node] if own else reach_opp[node]
+            parent_active = active_p[node] if own else active_opp[node]
+            for a_idx, child in enumerate(children):
+                if not parent_active:
+                    child_reach = parent_reach
+                    child_active = parent_active
+                elif len(parent_active) == len(parent_reach):
+                    child_reach = [parent_reach[h] * strategy[h][a_idx] for h in range(len(parent_reach))]
+                    child_active = [h for h in parent_active if child_reach[h] != 0.0]
+                else:
+                    child_reach = [0.0 for _ in range(len(parent_reach))]
+                    for h in parent_active:
+                        child_reach[h] = parent_reach[h] * strategy[h][a_idx]
+                    child_active = [h for h in parent_active if child_reach[h] != 0.0]
+                if own:
+                    reach_p[child] = child_reach
+                    active_p[child] = child_active
+                    reach_opp[child] = reach_opp[node]
+                    active_opp[child] = active_opp[node]
+                else:
+                    reach_p[child] = reach_p[node]
+                    active_p[child] = active_p[node]
+                    reach_opp[child] = child_reach
+                    active_opp[child] = child_active
+
+        if profiler is not None:
+            profiler.end_pass("forward", perf_counter() - pass_start)
+            pass_start = perf_counter()
+
+        regret_weight, weight_scale = self._update_weights()
+
+        # Backward pass in reverse level order: every child is valued before its parent.
+        # values[node] stays None where the values are identically zero.
+        stats = self.skip_stats
+        zeros = [0.0 for _ in range(num_hands)]
+        values: List[List[float] | None] = [None for _ in range(num_nodes)]
+        for node in reversed(nodes):
+            terminal = tree.terminal[node] != TERMINAL_NONE
+            stats["nodes"] += 1
+            if terminal:
+                stats["terminals"] += 1
+            if skip_zero and not active_opp[node]:
+                stats["nodes_skipped"] += 1
+                if terminal:
+                    stats["terminals_skipped"] += 1
+                elif tree.player[node] == update_player:
+                    # Own reach can still be positive here, so the average strategy is updated.
+                    infoset = self.node_infosets[node]
+                    self._accumulate_strategy(infoset, strategies[node], reach_p[node], active_p[node], weight_scale)
+                    if infoset.prediction is not None:
+                        self._clear_prediction(node)
                 continue
-            row = infoset.strategy_sum[h_idx]
-            strat_row = strategy[h_idx]
-            for a_idx in range(len(actions)):
-                row[a_idx] += weight * strat_row[a_idx]
+            if profiler is not None:
+                profiler.visit()
+            if terminal:
+                if profiler is None:
+                    values[node] = self._terminal_values(node, update_player, reach_opp[node])
+                else:
+                    tick = perf_counter()
+                    values[node] = self._terminal_values(node, update_player, reach_opp[node])
+                    profiler.terminal(node, tree.terminal[node], perf_counter() - tick)
+                continue
+            children = tree.children(node)
+            action_values = [zeros if values[child] is None else values[child] for child in children]
+            for child in children:
+                values[child] = None
+            if tree.player[node] != update_player:
+                node_values = [0.0 for _ in range(num_hands)]
+                for child_values in action_values:
+                    if child_values is zeros:
+                        continue
+                    for h_idx, value in enumerate(child_values):
+                        node_values[h_idx] += value
+                values[node] = node_values
+                continue
+
+            if profiler is not None:
+                tick = perf_counter()
+            infoset = self.node_infosets[node]
+            strategy = strategies[node]
+            num_actions = len(children)
+            node_values = [0.0 for _ in range(num_hands)]
+            for h_idx in range(num_hands):
+                value = 0.0
+                for a_idx in range(num_actions):
+                    value += strategy[h_idx][a_idx] * action_values[a_idx][h_idx]
+                node_values[h_idx] = value
 
-        return node_values
+            deltas = []
+            # Regret deltas are computed per hand/action for the updating player.
+            for h_idx in range(num_hands):
+                row = []
+                for a_idx in range(num_actions):
+                    row.append((action_values[a_idx][h_idx] - node_values[h_idx]) * regret_weight)
+                deltas.append(row)
+            self._accumulate_regret(update_player, node, infoset, deltas)
+            self._accumulate_strategy(infoset, strategy, reach_p[node], active_p[node], weight_scale)
+            values[node] = node_values
+            if profiler is not None:
+                profiler.update(node, num_hands * num_actions, perf_counter() - tick)
+        if profiler is not None:
+            profiler.end_pass("backward", perf_counter() - pass_start)
+        return zeros if values[root] is None else values[root]
 
     def run(self, iterations: int) -> None:
         for _ in range(iterations):
             self.iteration += 1
-            root = self.game.initial_state()
+            if self.profiler is not None:
+                self.profiler.begin_iteration(self.iteration)
+            self._advance_discount()
             if self.config.alternating:
                 for player in (0, 1):
                     self._pending_regret[player].clear()
                     reach_p = list(self.hand_weights[player])
                     reach_opp = list(self.hand_weights[1 - player])
-                    self._traverse(root, player, reach_p, reach_opp)
+                    self._traverse(player, reach_p, reach_opp)
                     self._apply_regret_updates(player)
             else:
                 for player in (0, 1):
@@ -285,14 +492,79 @@ class VectorCFRTrainer:
                 for player in (0, 1):
                     reach_p = list(self.hand_weights[player])
                     reach_opp = list(self.hand_weights[1 - player])
-                    self._traverse(root, player, reach_p, reach_opp)
+                    self._traverse(player, reach_p, reach_opp)
                 for player in (0, 1):
                     self._apply_regret_updates(player)
+            if self.profiler is not None:
+                self.profiler.end_iteration()
+
+    def snapshot_state(self) -> Tuple[dict, List[Tuple[str, array]]]:
+        # Tables are laid out in decision-node order; the compiled tree fixes every shape.
+        # Pending CFR+ regrets are always empty between iterations, so they are not saved.
+        # Tables are saved in stored units together with the discount factors.
+        regrets = array("d")
+        strategy = array("d")
+        prediction = array("d")
+        for node in self.tree.decision_nodes:
+            infoset = self.node_infosets[node]
+            regrets.extend(flatten_rows(infoset.regret_sum))
+            strategy.extend(flatten_rows(infoset.strategy_sum))
+            if infoset.prediction is not None:
+                prediction.extend(flatten_rows(infoset.prediction))
+        meta = {
+            "trainer": "vector_cfr",
+            "config": asdict(self.config),
+            "iteration": self.iteration,
+            "discount": self.discount.to_json() if self.discount is not None else None,
+        }
+        tables = [("regret_sum", regrets), ("strategy_sum", strategy)]
+        if self.config.use_predictive:
+            tables.append(("prediction", prediction))
+        return meta, tables
+
+    def restore_state(self, meta: dict, tables: Dict[str, Sequence[float]]) -> None:
+        check_trainer_meta(meta, "vector_cfr", self.config)
+        regrets = tables["regret_sum"]
+        strategy = tables["strategy_sum"]
+        offset = 0
+        for node in self.tree.decision_nodes:
+            infoset = self.node_infosets[node]
+            rows = self.num_hands[self.tree.player[node]]
+            cols = len(infoset.actions)
+            size = rows * cols
+            infoset.regret_sum = rows_from_flat(self.config.storage, regrets[offset : offset + size], rows, cols)
+            infoset.strategy_sum = rows_from_flat(self.config.storage, strategy[offset : offset + size], rows, cols)
+            if self.config.use_predictive:
+                infoset.prediction = unflatten_rows(tables["prediction"][offset : offset + size], rows, cols)
+            infoset.mark_dirty()
+            offset += size
+        self.iteration = meta["iteration"]
+        if meta["discount"] is not None:
+            self.discount = LazyDiscount.from_json(meta["discount"])
 
     def average_strategy_profile(self) -> Dict[int, Dict[str, Tuple[List[str], List[List[float]]]]]:
         profile: Dict[int, Dict[str, Tuple[List[str], List[List[float]]]]] = {0: {}, 1: {}}
         for player in (0, 1):
             for key, infoset in self.infosets[player].items():
                 avg = infoset.average_strategy()
+                if self.iso is not None:
+                    avg = self.iso.expand_rows(player, avg)
                 profile[player][key] = (infoset.action_tokens, avg)
         return profile
+
+
+def make_vector_cfr_trainer(game: RiverHoldemGame, config: VectorCFRConfig | None = None):
+    config = config or VectorCFRConfig()
+    if config.engine == "list":
+        if config.workers > 1:
+            # Imported here: algorithms.parallel_cfr builds on this module.
+            from algorithms.parallel_cfr import ParallelVectorCFRTrainer
+
+            return ParallelVectorCFRTrainer(game, config)
+        return VectorCFRTrainer(game, config)
+    if config.engine == "array":
+        # NumPy is optional; only the array engine needs it.
+        from algorithms.array_cfr import ArrayVectorCFRTrainer
+
+        return ArrayVectorCFRTrainer(game, config)
+    raise ValueError(f"Unknown vector CFR engine: {config.engine}")
@@ -1,17 +1,23 @@
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
-from typing import Dict, List, Sequence, Tuple
+from itertools import accumulate
+from typing import Callable, Dict, List, Sequence, Tuple
 
 from games.river_holdem import Action, Hand, RiverHoldemGame, RiverState
+from games.river_tree import TERMINAL_FOLD, TERMINAL_NONE, FlatRiverTree
+
+# Relative gap below which two best-response action values count as tied (rounding noise).
+BR_TIE_TOLERANCE = 1e-9
 
 
 @dataclass
 class StrengthSummary:
     hands: List[Hand]
     sorted_indices: List[int]
-    strengths_sorted: List[Tuple[int, ...]]
-    strength_ranges: Dict[Tuple[int, ...], Tuple[int, int]]
+    strengths_sorted: List[int]
+    strength_ranges: Dict[int, Tuple[int, int]]
     card_to_indices: Dict[int, List[int]]
 
 
@@ -19,7 +25,7 @@ def build_strength_summary(hands: List[Hand]) -> StrengthSummary:
     # Precompute ordering and index ranges by hand strength for vector-form eval.
     sorted_indices = sorted(range(len(hands)), key=lambda i: hands[i].strength)
     strengths_sorted = [hands[i].strength for i in sorted_indices]
-    strength_ranges: Dict[Tuple[int, ...], Tuple[int, int]] = {}
+    strength_ranges: Dict[int, Tuple[int, int]] = {}
     start = 0
     while start < len(strengths_sorted):
         strength = strengths_sorted[start]
@@ -64,6 +70,157 @@ def build_blocked_indices(
     return blocked_indices
 
 
+@dataclass
+class CardRemovalIndex:
+    # Static positions for O(N) card removal: opponent hands are laid out once in
+    # strength order and once grouped by card (strength order within each card), so
+    # blocked mass below/within/above a strength bucket is a difference of prefix sums.
+    sorted_indices: List[int]
+    card_order: List[int]
+    starts: List[int]
+    ends: List[int]
+    first_base: List[int]
+    first_start: List[int]
+    first_end: List[int]
+    first_top: List[int]
+    second_base: List[int]
+    second_start: List[int]
+    second_end: List[int]
+    second_top: List[int]
+    same_index: List[int]
+
+
+def build_card_removal_index(
+    player_hands: Sequence[Hand],
+    opp_summary: StrengthSummary,
+) -> CardRemovalIndex:
+    opp_hands = opp_summary.hands
+    position = [0 for _ in opp_hands]
+    for pos, idx in enumerate(opp_summary.sorted_indices):
+        position[idx] = pos
+
+    # Card-major layout; each card's slice is strength-sorted so bucket bounds bisect into it.
+    card_order: List[int] = []
+    card_offsets = [0 for _ in range(53)]
+    card_positions: List[List[int]] = []
+    for card in range(52):
+        card_offsets[card] = len(card_order)
+        members = sorted(opp_summary.card_to_indices.get(card, []), key=lambda i: position[i])
+        card_order.extend(members)
+        card_positions.append([position[i] for i in members])
+    card_offsets[52] = len(card_order)
+
+    opp_lookup = {hand.cards: idx for idx, hand in enumerate(opp_hands)}
+    strengths = opp_summary.strengths_sorted
+    index = CardRemovalIndex(
+        sorted_indices=list(opp_summary.sorted_indices),
+        card_order=card_order,
+        starts=[],
+        ends=[],
+        first_base=[],
+        first_start=[],
+        first_end=[],
+        first_top=[],
+        second_base=[],
+        second_start=[],
+        second_end=[],
+        second_top=[],
+        same_index=[],
+    )
+    for hand in player_hands:
+        # Bisect (not strength_ranges) so hands absent from the opponent range still resolve.
+        start = bisect_left(strengths, hand.strength)
+        end = bisect_right(strengths, hand.strength)
+        index.starts.append(start)
+        index.ends.append(end)
+        first, second = hand.cards
+        for card, base, lo, hi, top in (
+            (first, index.first_base, index.first_start, index.first_end, index.first_top),
+            (second, index.second_base, index.second_start, index.second_end, index.second_top),
+        ):
+            offset = card_offsets[card]
+            base.append(offset)
+            lo.append(offset + bisect_left(card_positions[card], start))
+            hi.append(offset + bisect_left(card_positions[card], end))
+            top.append(card_offsets[card + 1])
+        index.same_index.append(opp_lookup.get(hand.cards, -1))
+    return index
+
+
+def removal_prefix_sums(index: CardRemovalIndex, opp_weights: Sequence[float]) -> Tuple[List[float], List[float]]:
+    prefix = list(accumulate((opp_weights[i] for i in index.sorted_indices), initial=0.0))
+    card_prefix = list(accumulate((opp_weights[i] for i in index.card_order), initial=0.0))
+    return prefix, card_prefix
+
+
+def valid_weights_card_removal(index: CardRemovalIndex, opp_weights: Sequence[float]) -> List[float]:
+    prefix, card_prefix = removal_prefix_sums(index, opp_weights)
+    total = prefix[-1]
+    if total <= 0.0:
+        return [0.0 for _ in index.starts]
+    values = []
+    for h_idx, same in enumerate(index.same_index):
+        blocked = (
+            card_prefix[index.first_top[h_idx]]
+            - card_prefix[index.first_base[h_idx]]
+            + card_prefix[index.second_top[h_idx]]
+            - card_prefix[index.second_base[h_idx]]
+        )
+        # The identical combo holds both cards and was removed twice.
+        if same >= 0:
+            blocked -= opp_weights[same]
+        values.append(total - blocked)
+    return values
+
+
+def fold_values_card_removal(
+    index: CardRemovalIndex,
+    value: float,
+    opp_weights: Sequence[float],
+) -> List[float]:
+    return [value * weight for weight in valid_weights_card_removal(index, opp_weights)]
+
+
+def showdown_values_card_removal(
+    index: CardRemovalIndex,
+    opp_weights: Sequence[float],
+    pot_total: float,
+    contrib_player: float,
+) -> List[float]:
+    # Inclusion-exclusion over the two hole cards: a few prefix-sum passes per terminal.
+    prefix, card_prefix = removal_prefix_sums(index, opp_weights)
+    total = prefix[-1]
+    if total <= 0.0:
+        return [0.0 for _ in index.starts]
+    half_pot = pot_total / 2.0
+    values = []
+    for h_idx, same in enumerate(index.same_index):
+        start = index.starts[h_idx]
+        end = index.ends[h_idx]
+        first_base = card_prefix[index.first_base[h_idx]]
+        second_base = card_prefix[index.second_base[h_idx]]
+        first_start = card_prefix[index.first_start[h_idx]]
+        second_start = card_prefix[index.second_start[h_idx]]
+        same_weight = opp_weights[same] if same >= 0 else 0.0
+
+        win_weight = prefix[start] - (first_start - first_base) - (second_start - second_base)
+        tie_weight = (
+            prefix[end]
+            - prefix[start]
+            - (card_prefix[index.first_end[h_idx]] - first_start)
+            - (card_prefix[index.second_end[h_idx]] - second_start)
+            + same_weight
+        )
+        valid_weight = (
+            total
+            - (card_prefix[index.first_top[h_idx]] - first_base)
+            - (card_prefix[index.second_top[h_idx]] - second_base)
+            + same_weight
+        )
+        values.append(win_weight * pot_total + tie_weight * half_pot - contrib_player * valid_weight)
+    return values
+
+
 def valid_opp_weights(
     blocked_indices: Sequence[Sequence[int]],
     opp_weights: Sequence[float],
@@ -158,6 +315,14 @@ def action_tokens(actions: Sequence[Action]) -> List[str]:
     return tokens
 
 
+def _aligned_rows(stored_tokens: List[str], matrix: List[List[float]], tokens: List[str]) -> List[List[float]]:
+    # Action sets can differ by betting options; remap to the requested ordering.
+    if stored_tokens == tokens:
+        return matrix
+    index_map = {token: idx for idx, token in enumerate(stored_tokens)}
+    return [[row[index_map[token]] for token in tokens] for row in matrix]
+
+
 def profile_strategy(
     game: RiverHoldemGame,
     profile: Dict[str, Tuple[List[str], List[List[float]]]],
@@ -172,65 +337,172 @@ def profile_strategy(
     if entry is None:
         return uniform_strategy(num_hands, len(actions))
     stored_tokens, matrix = entry
-    if stored_tokens == tokens:
-        return matrix
-    # Action sets can differ by betting options; remap to current ordering.
-    index_map = {token: idx for idx, token in enumerate(stored_tokens)}
-    reordered = []
-    for row in matrix:
-        reordered.append([row[index_map[token]] for token in tokens])
-    return reordered
+    return _aligned_rows(stored_tokens, matrix, tokens)
 
 
-def best_response(
-    game: RiverHoldemGame,
-    target_player: int,
-    opponent_profile: Dict[str, Tuple[List[str], List[List[float]]]],
-    opp_summary: StrengthSummary,
-    blocked_indices: Sequence[Sequence[int]] | None = None,
-) -> Tuple[List[float], Dict[str, Tuple[List[str], List[List[float]]]]]:
-    num_target = len(game.hands[target_player])
-    num_opp = len(game.hands[1 - target_player])
-    if blocked_indices is None:
-        blocked_indices = build_blocked_indices(game.hands[target_player], opp_summary)
+def profile_strategy_at(
+    tree: FlatRiverTree,
+    profile: Dict[str, Tuple[List[str], List[List[float]]]],
+    node: int,
+    num_hands: int,
+) -> List[List[float]]:
+    # Node-id variant of profile_strategy: key and action tokens come from the compiled tree.
+    tokens = tree.child_tokens(node)
+    entry = profile.get(tree.keys[node])
+    if entry is None:
+        return uniform_strategy(num_hands, len(tokens))
+    stored_tokens, matrix = entry
+    return _aligned_rows(stored_tokens, matrix, tokens)
 
-    valid_weights = valid_opp_weights(blocked_indices, game.hand_weights[1 - target_player])
 
-    br_policy: Dict[str, Tuple[List[str], List[List[float]]]] = {}
+@dataclass
+class ResolvedProfile:
+    # One player's profile bound to a compiled tree: rows[node] is the (hands x actions) matrix at
+    # each of the player's decision nodes in tree.child_tokens(node) order, None elsewhere.
+    # Matrices are shared with the source profile when no reordering is needed and uniform rows
+    # are shared per action count, so treat them as read-only.
+    tree: FlatRiverTree
+    player: int
+    rows: List[List[List[float]] | None]
 
-    def traverse(state: RiverState, reach_opp: List[float]) -> List[float]:
-        if game.is_terminal(state):
-            pot_total = game.pot_total(state)
-            contrib = state.contrib[target_player]
-            if state.terminal_winner is not None:
-                if state.terminal_winner == target_player:
-                    return fold_values(pot_total - contrib, blocked_indices, reach_opp)
-                return fold_values(-contrib, blocked_indices, reach_opp)
-            return showdown_values(
-                game.hands[target_player],
-                opp_summary,
-                blocked_indices,
-                reach_opp,
-                pot_total,
-                contrib,
-            )
-
-        player = game.current_player(state)
-        if player != target_player:
-            strategy = profile_strategy(game, opponent_profile, state, player, num_opp)
-            actions = game.legal_actions(state)
-            values = [0.0 for _ in range(num_target)]
-            for a_idx, action in enumerate(actions):
-                next_reach_opp = [reach_opp[h] * strategy[h][a_idx] for h in range(num_opp)]
-                child_values = traverse(game.next_state(state, action), next_reach_opp)
-                for h_idx, value in enumerate(child_values):
-                    values[h_idx] += value
-            return values
+    def strategy_at(self, node: int) -> List[List[float]]:
+        return self.rows[node]
+
+
+def resolve_profile(
+    tree: FlatRiverTree,
+    profile: Dict[str, Tuple[List[str], List[List[float]]]],
+    player: int,
+    num_hands: int,
+) -> ResolvedProfile:
+    # Binds a key-indexed profile to node ids once, so repeated best responses and viewers read
+    # each node's matrix by index instead of rebuilding tokens and keys per call.
+    uniform: Dict[int, List[List[float]]] = {}
+    rows: List[List[List[float]] | None] = [None for _ in range(tree.num_nodes)]
+    for node in tree.decision_nodes:
+        if tree.player[node] != player:
+            continue
+        tokens = tree.child_tokens(node)
+        entry = profile.get(tree.keys[node])
+        if entry is not None:
+            rows[node] = _aligned_rows(entry[0], entry[1], tokens)
+            continue
+        matrix = uniform.get(len(tokens))
+        if matrix is None:
+            matrix = uniform[len(tokens)] = uniform_strategy(num_hands, len(tokens))
+        rows[node] = matrix
+    return ResolvedProfile(tree=tree, player=player, rows=rows)
+
+
+def slice_card_removal_index(index: CardRemovalIndex, lo: int, hi: int) -> CardRemovalIndex:
+    # Rows [lo, hi) of the player-hand dimension; opponent layouts are shared unchanged.
+    return CardRemovalIndex(
+        sorted_indices=index.sorted_indices,
+        card_order=index.card_order,
+        starts=index.starts[lo:hi],
+        ends=index.ends[lo:hi],
+        first_base=index.first_base[lo:hi],
+        first_start=index.first_start[lo:hi],
+        first_end=index.first_end[lo:hi],
+        first_top=index.first_top[lo:hi],
+        second_base=index.second_base[lo:hi],
+        second_start=index.second_start[lo:hi],
+        second_end=index.second_end[lo:hi],
+        second_top=index.second_top[lo:hi],
+        same_index=index.same_index[lo:hi],
+    )
+
+
+def best_response_reach(
+    tree: FlatRiverTree,
+    target_player: int,
+    opponent_profile: Dict[str, Tuple[List[str], List[List[float]]]] | ResolvedProfile,
+    opp_weights: Sequence[float],
+) -> List[List[float] | None]:
+    strategy_at = _strategy_source(tree, target_player, opponent_profile, len(opp_weights))
+    return best_response_reach_at(tree, target_player, strategy_at, opp_weights)
 
-        actions = game.legal_actions(state)
-        action_vals = []
-        for action in actions:
-            action_vals.append(traverse(game.next_state(state, action), reach_opp))
+
+def _strategy_source(
+    tree: FlatRiverTree,
+    target_player: int,
+    opponent_profile: Dict[str, Tuple[List[str], List[List[float]]]] | ResolvedProfile,
+    num_opp: int,
+) -> Callable[[int], List[List[float]]]:
+    if isinstance(opponent_profile, ResolvedProfile):
+        if opponent_profile.tree is not tree or opponent_profile.player != 1 - target_player:
+            raise ValueError("Resolved profile belongs to a different tree or player")
+        return opponent_profile.strategy_at
+    return lambda node: profile_strategy_at(tree, opponent_profile, node, num_opp)
+
+
+def best_response_reach_at(
+    tree: FlatRiverTree,
+    target_player: int,
+    strategy_at: Callable[[int], Sequence[Sequence[float]]],
+    opp_weights: Sequence[float],
+) -> List[List[float] | None]:
+    # Forward pass in level order: opponent reach per node. strategy_at(node) returns the
+    # opponent's (hands x actions) rows at one of its nodes; it is only called where the
+    # opponent's reach is non-zero.
+    num_opp = len(opp_weights)
+    reach: List[List[float] | None] = [None for _ in range(tree.num_nodes)]
+    reach[0] = list(opp_weights)
+    for node in tree.decision_nodes:
+        parent_reach = reach[node]
+        if tree.player[node] == target_player:
+            for child in tree.children(node):
+                reach[child] = parent_reach
+            continue
+        if not any(parent_reach):
+            # Zero reach stays zero; share the vector instead of multiplying it out.
+            for child in tree.children(node):
+                reach[child] = parent_reach
+            continue
+        strategy = strategy_at(node)
+        for a_idx, child in enumerate(tree.children(node)):
+            reach[child] = [parent_reach[h] * strategy[h][a_idx] for h in range(num_opp)]
+    return reach
+
+
+def best_response_backward(
+    tree: FlatRiverTree,
+    target_player: int,
+    removal: CardRemovalIndex,
+    reach: Sequence[Sequence[float] | None],
+) -> Tuple[List[float], Dict[int, List[List[float]]]]:
+    # Backward pass in reverse level order. Every target hand is independent given the
+    # opponent reach, so this also runs unchanged on a row slice of the removal index.
+    num_target = len(removal.starts)
+    values: List[List[float] | None] = [None for _ in range(tree.num_nodes)]
+    br_matrices: Dict[int, List[List[float]]] = {}
+    for node in range(tree.num_nodes - 1, -1, -1):
+        kind = tree.terminal[node]
+        if kind != TERMINAL_NONE:
+            if not any(reach[node]):
+                # The opponent never gets here: every target hand's value is exactly zero.
+                values[node] = [0.0 for _ in range(num_target)]
+                continue
+            pot_total = tree.pot[node]
+            contrib = tree.contrib(node, target_player)
+            if kind == TERMINAL_FOLD:
+                payoff = pot_total - contrib if tree.fold_winner[node] == target_player else -contrib
+                values[node] = fold_values_card_removal(removal, payoff, reach[node])
+            else:
+                values[node] = showdown_values_card_removal(removal, reach[node], pot_total, contrib)
+            continue
+
+        children = tree.children(node)
+        action_vals = [values[child] for child in children]
+        for child in children:
+            values[child] = None
+        if tree.player[node] != target_player:
+            node_values = [0.0 for _ in range(num_target)]
+            for child_values in action_vals:
+                for h_idx, value in enumerate(child_values):
+                    node_values[h_idx] += value
+            values[node] = node_values
+            continue
 
         best_values = [0.0 for _ in range(num_target)]
         br_matrix = []
@@ -238,20 +510,32 @@ def best_response(
             # Pure best-response per hand.
             best_idx = 0
             best_val = action_vals[0][h_idx]
-            for a_idx in range(1, len(actions)):
+            for a_idx in range(1, len(action_vals)):
                 value = action_vals[a_idx][h_idx]
-                if value > best_val:
+                # Values within rounding of the best are ties and keep the earlier action, so the
+                # choice does not depend on how the evaluator happened to round.
+                if value - best_val > BR_TIE_TOLERANCE * max(1.0, abs(best_val)):
                     best_val = value
                     best_idx = a_idx
-            row = [0.0 for _ in range(len(actions))]
+            row = [0.0 for _ in range(len(action_vals))]
             row[best_idx] = 1.0
             br_matrix.append(row)
             best_values[h_idx] = best_val
-        br_policy[game.infoset_key(state, target_player)] = (action_tokens(actions), br_matrix)
-        return best_values
+        br_matrices[node] = br_matrix
+        values[node] = best_values
+    return values[0], br_matrices
+
 
-    root = game.initial_state()
-    values = traverse(root, list(game.hand_weights[1 - target_player]))
+def finish_best_response(
+    tree: FlatRiverTree,
+    values: List[float],
+    br_matrices: Dict[int, List[List[float]]],
+    valid_weights: Sequence[float],
+) -> Tuple[List[float], Dict[str, Tuple[List[str], List[List[float]]]]]:
+    br_policy: Dict[str, Tuple[List[str], List[List[float]]]] = {}
+    for node in tree.decision_nodes:
+        if node in br_matrices:
+            br_policy[tree.keys[node]] = (tree.child_tokens(node), br_matrices[node])
     for h_idx, denom in enumerate(valid_weights):
         if denom > 0.0:
             values[h_idx] /= denom
@@ -260,18 +544,31 @@ def best_response(
     return values, br_policy
 
 
-def best_response_value(
+def best_response(
     game: RiverHoldemGame,
     target_player: int,
-    opponent_profile: Dict[str, Tuple[List[str], List[List[float]]]],
+    opponent_profile: Dict[str, Tuple[List[str], List[List[float]]]] | ResolvedProfile,
     opp_summary: StrengthSummary,
-    blocked_indices: Sequence[Sequence[int]] | None = None,
+    removal: CardRemovalIndex | None = None,
+) -> Tuple[List[float], Dict[str, Tuple[List[str], List[List[float]]]]]:
+    if removal is None:
+        removal = build_card_removal_index(game.hands[target_player], opp_summary)
+    opp_weights = game.hand_weights[1 - target_player]
+    valid_weights = valid_weights_card_removal(removal, opp_weights)
+    tree = game.flat_tree()
+    reach = best_response_reach(tree, target_player, opponent_profile, opp_weights)
+    values, br_matrices = best_response_backward(tree, target_player, removal, reach)
+    return finish_best_response(tree, values, br_matrices, valid_weights)
+
+
+def weighted_br_value(
+    game: RiverHoldemGame,
+    target_player: int,
+    removal: CardRemovalIndex,
+    values: Sequence[float],
 ) -> float:
-    values, _ = best_response(game, target_player, opponent_profile, opp_summary, blocked_indices)
     weights = game.hand_weights[target_player]
-    if blocked_indices is None:
-        blocked_indices = build_blocked_indices(game.hands[target_player], opp_summary)
-    valid_weights = valid_opp_weights(blocked_indices, game.hand_weights[1 - target_player])
+    valid_weights = valid_weights_card_removal(removal, game.hand_weights[1 - target_player])
     total = 0.0
     total_weight = 0.0
     for weight, valid_weight, value in zip(weights, valid_weights, values):
@@ -283,17 +580,85 @@ def best_response_value(
     return total / total_weight
 
 
+def best_response_value(
+    game: RiverHoldemGame,
+    target_player: int,
+    opponent_profile: Dict[str, Tuple[List[str], List[List[float]]]] | ResolvedProfile,
+    opp_summary: StrengthSummary,
+    removal: CardRemovalIndex | None = None,
+) -> float:
+    if removal is None:
+        removal = build_card_removal_index(game.hands[target_player], opp_summary)
+    values, _ = best_response(game, target_player, opponent_profile, opp_summary, removal)
+    return weighted_br_value(game, target_player, removal, values)
+
+
 def exploitability(
     game: RiverHoldemGame,
-    profile: Dict[int, Dict[str, Tuple[List[str], List[List[float]]]]],
+    profile: Dict[int, Dict[str, Tuple[List[str], List[List[float]]]] | ResolvedProfile],
     summaries: Dict[int, StrengthSummary],
-    blocked_indices: Dict[int, List[List[int]]] | None = None,
+    removal: Dict[int, CardRemovalIndex] | None = None,
 ) -> float:
-    if blocked_indices is None:
-        blocked_indices = {
-            0: build_blocked_indices(game.hands[0], summaries[0]),
-            1: build_blocked_indices(game.hands[1], summaries[1]),
+    if removal is None:
+        removal = {
+            0: build_card_removal_index(game.hands[0], summaries[0]),
+            1: build_card_removal_index(game.hands[1], summaries[1]),
         }
-    br0 = best_response_value(game, 0, profile[1], summaries[0], blocked_indices[0])
-    br1 = best_response_value(game, 1, profile[0], summaries[1], blocked_indices[1])
+    br0 = best_response_value(game, 0, profile[1], summaries[0], removal[0])
+    br1 = best_response_value(game, 1, profile[0], summaries[1], removal[1])
     return (br0 + br1 - float(game.base_pot)) / 2.0
+
+
+def best_response_batch(
+    game: RiverHoldemGame,
+    target_player: int,
+    opponent_profiles: Sequence[Dict[str, Tuple[List[str], List[List[float]]]] | ResolvedProfile],
+    opp_summary: StrengthSummary,
+    removal: CardRemovalIndex | None = None,
+    engine: str = "array",
+) -> List[Tuple[List[float], Dict[str, Tuple[List[str], List[List[float]]]]]]:
+    # best_response against each of K opponent profiles; entry k equals
+    # best_response(game, target_player, opponent_profiles[k], ...). The "array" engine (NumPy)
+    # walks the tree once with (K x hands) reach and value arrays, so every terminal evaluates
+    # all K profiles in a few array operations. "list" needs no NumPy and runs K traversals;
+    # batching list rows gives no speedup in pure Python.
+    if engine not in ("list", "array"):
+        raise ValueError(f"Unknown best response engine: {engine}")
+    if removal is None:
+        removal = build_card_removal_index(game.hands[target_player], opp_summary)
+    if engine == "list" or not opponent_profiles:
+        return [best_response(game, target_player, profile, opp_summary, removal) for profile in opponent_profiles]
+    # NumPy is optional; only the array engine needs it.
+    from algorithms.array_eval import array_best_response_batch
+
+    opp_weights = game.hand_weights[1 - target_player]
+    valid_weights = valid_weights_card_removal(removal, opp_weights)
+    tree = game.flat_tree()
+    sources = [_strategy_source(tree, target_player, profile, len(opp_weights)) for profile in opponent_profiles]
+    values, br_matrices = array_best_response_batch(tree, target_player, sources, opp_weights, removal)
+    return [
+        finish_best_response(tree, k_values, k_matrices, valid_weights)
+        for k_values, k_matrices in zip(values, br_matrices)
+    ]
+
+
+def exploitability_batch(
+    game: RiverHoldemGame,
+    profiles: Sequence[Dict[int, Dict[str, Tuple[List[str], List[List[float]]]] | ResolvedProfile]],
+    summaries: Dict[int, StrengthSummary],
+    removal: Dict[int, CardRemovalIndex] | None = None,
+    engine: str = "array",
+) -> List[float]:
+    # exploitability of K full profiles with one batched best response per player.
+    if removal is None:
+        removal = {
+            0: build_card_removal_index(game.hands[0], summaries[0]),
+            1: build_card_removal_index(game.hands[1], summaries[1]),
+        }
+    br_values = {}
+    for player in (0, 1):
+        responses = best_response_batch(
+            game, player, [profile[1 - player] for profile in profiles], summaries[player], removal[player], engine
+        )
+        br_values[player] = [weighted_br_value(game, player, removal[player], values) for values, _ in responses]
+    return [(br0 + br1 - float(game.base_pot)) / 2.0 for br0, br1 in zip(br_values[0], br_values[1])]
@@ -1,9 +1,23 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from array import array
+from dataclasses import asdict, dataclass
+from time import perf_counter
+from typing import Dict, List, Sequence, Tuple
 
-from algorithms.vector_eval import action_tokens, best_response, build_blocked_indices
+from algorithms.profiler import SolverProfiler
+from algorithms.snapshot import check_trainer_meta, flatten_rows
+from algorithms.storage import check_storage, make_rows, rows_from_flat
+from algorithms.vector_eval import (
+    ResolvedProfile,
+    action_tokens,
+    best_response,
+    best_response_backward,
+    best_response_reach_at,
+    build_card_removal_index,
+    build_strength_summary,
+    resolve_profile,
+)
 from games.river_holdem import Action, RiverHoldemGame, RiverState
 
 
@@ -12,48 +26,55 @@ class VectorFPConfig:
     optimistic: bool = False
     linear_weighting: bool = False
     alternating: bool = True
+    # Table layout (algorithms.storage): "list", "float64" or "float32".
+    storage: str = "list"
+    # "profile" rebuilds the opponent's average profile dict every iteration (reference);
+    # "node" keeps node-indexed average tables updated in place (NodeVectorFPTrainer).
+    engine: str = "profile"
 
 
 class VectorFPInfoSet:
-    def __init__(self, num_hands: int, actions: List[Action]) -> None:
+    def __init__(self, num_hands: int, actions: List[Action], storage: str = "list") -> None:
         self.actions = actions
         self.action_tokens = action_tokens(actions)
-        self.strategy_sum = [[0.0 for _ in actions] for _ in range(num_hands)]
-        self.last_strategy = [[1.0 / len(actions) for _ in actions] for _ in range(num_hands)]
+        self.strategy_sum = make_rows(storage, num_hands, len(actions))
+        self.last_strategy = make_rows(storage, num_hands, len(actions), 1.0 / len(actions))
 
     def add_strategy(self, matrix: List[List[float]], weight: float) -> None:
         for h_idx, row in enumerate(matrix):
             sum_row = self.strategy_sum[h_idx]
+            last_row = self.last_strategy[h_idx]
             for a_idx, prob in enumerate(row):
                 sum_row[a_idx] += weight * prob
-            self.last_strategy[h_idx] = list(row)
+                last_row[a_idx] = prob
 
 
 class VectorFictitiousPlayTrainer:
     def __init__(self, game: RiverHoldemGame, config: VectorFPConfig | None = None) -> None:
         self.game = game
         self.config = config or VectorFPConfig()
+        check_storage(self.config.storage)
         self.iteration = 0
         self.num_hands = [len(game.hands[0]), len(game.hands[1])]
         self.infosets: Dict[int, Dict[str, VectorFPInfoSet]] = {0: {}, 1: {}}
+        # Profiler phases: best responses are timed as backward passes, average-strategy writes as updates.
+        self.profiler: SolverProfiler | None = None
         self.total_weight = {0: 0.0, 1: 0.0}
         self.last_weight = {0: 0.0, 1: 0.0}
-        from algorithms.vector_eval import build_strength_summary
-
         self.summary = {
             0: build_strength_summary(self.game.hands[1]),
             1: build_strength_summary(self.game.hands[0]),
         }
-        self.blocked_indices = {
-            0: build_blocked_indices(self.game.hands[0], self.summary[0]),
-            1: build_blocked_indices(self.game.hands[1], self.summary[1]),
+        self.removal = {
+            0: build_card_removal_index(self.game.hands[0], self.summary[0]),
+            1: build_card_removal_index(self.game.hands[1], self.summary[1]),
         }
 
     def _get_infoset(self, player: int, state: RiverState) -> VectorFPInfoSet:
         key = self.game.infoset_key(state, player)
         infoset = self.infosets[player].get(key)
         if infoset is None:
-            infoset = VectorFPInfoSet(self.num_hands[player], self.game.legal_actions(state))
+            infoset = VectorFPInfoSet(self.num_hands[player], self.game.legal_actions(state), self.config.storage)
             self.infosets[player][key] = infoset
         return infoset
 
@@ -77,7 +98,24 @@ class VectorFictitiousPlayTrainer:
             profile[key] = (infoset.action_tokens, matrix)
         return profile
 
+    def _best_response(
+        self, player: int, opponent_profile: ResolvedProfile
+    ) -> Dict[str, Tuple[List[str], List[List[float]]]]:
+        tick = perf_counter() if self.profiler is not None else 0.0
+        _, br_policy = best_response(
+            self.game,
+            player,
+            opponent_profile,
+            opp_summary=self.summary[player],
+            removal=self.removal[player],
+        )
+        if self.profiler is not None:
+            self.profiler.visit(self.game.flat_tree().num_nodes)
+            self.profiler.add("backward", perf_counter() - tick)
+        return br_policy
+
     def _update_player(self, player: int, br_policy: Dict[str, Tuple[List[str], List[List[float]]]]) -> None:
+        tick = perf_counter() if self.profiler is not None else 0.0
         weight = float(self.iteration) if self.config.linear_weighting else 1.0
         self.last_weight[player] = weight
         self.total_weight[player] += weight
@@ -86,9 +124,11 @@ class VectorFictitiousPlayTrainer:
             infoset = self.infosets[player].get(key)
             if infoset is None:
                 actions = self.game.legal_actions(self._state_from_key(key))
-                infoset = VectorFPInfoSet(self.num_hands[player], actions)
+                infoset = VectorFPInfoSet(self.num_hands[player], actions, self.config.storage)
                 self.infosets[player][key] = infoset
             infoset.add_strategy(matrix, weight)
+        if self.profiler is not None:
+            self.profiler.add("update", perf_counter() - tick)
 
     def _state_from_key(self, key: str) -> RiverState:
         if key == "root":
@@ -110,37 +150,68 @@ class VectorFictitiousPlayTrainer:
             state = self.game.next_state(state, selected)
         return state
 
+    def _resolved_profile(self, player: int) -> ResolvedProfile:
+        # The average profile bound to node ids, so the best response reads rows by index.
+        profile = self._player_profile(player, optimistic=self.config.optimistic)
+        return resolve_profile(self.game.flat_tree(), profile, player, self.num_hands[player])
+
     def run(self, iterations: int) -> None:
         for _ in range(iterations):
             self.iteration += 1
+            if self.profiler is not None:
+                self.profiler.begin_iteration(self.iteration)
             if self.config.alternating:
                 for player in (0, 1):
-                    opponent_profile = self._player_profile(1 - player, optimistic=self.config.optimistic)
-                    values, br_policy = best_response(
-                        self.game,
-                        player,
-                        opponent_profile,
-                        opp_summary=self.summary[player],
-                        blocked_indices=self.blocked_indices[player],
-                    )
-                    del values
-                    self._update_player(player, br_policy)
+                    self._update_player(player, self._best_response(player, self._resolved_profile(1 - player)))
             else:
-                profiles = {
-                    0: self._player_profile(0, optimistic=self.config.optimistic),
-                    1: self._player_profile(1, optimistic=self.config.optimistic),
-                }
+                profiles = {0: self._resolved_profile(0), 1: self._resolved_profile(1)}
                 for player in (0, 1):
-                    opponent_profile = profiles[1 - player]
-                    values, br_policy = best_response(
-                        self.game,
-                        player,
-                        opponent_profile,
-                        opp_summary=self.summary[player],
-                        blocked_indices=self.blocked_indices[player],
-                    )
-                    del values
-                    self._update_player(player, br_policy)
+                    self._update_player(player, self._best_response(player, profiles[1 - player]))
+            if self.profiler is not None:
+                self.profiler.end_iteration()
+
+    def snapshot_state(self) -> Tuple[dict, List[Tuple[str, array]]]:
+        # Infosets are created lazily from best-response policies, so their keys (in creation
+        # order) are saved alongside the tables.
+        strategy = array("d")
+        last = array("d")
+        keys: Dict[str, List[str]] = {}
+        for player in (0, 1):
+            keys[str(player)] = list(self.infosets[player])
+            for infoset in self.infosets[player].values():
+                strategy.extend(flatten_rows(infoset.strategy_sum))
+                last.extend(flatten_rows(infoset.last_strategy))
+        meta = {
+            "trainer": "vector_fp",
+            "config": asdict(self.config),
+            "iteration": self.iteration,
+            "total_weight": [self.total_weight[0], self.total_weight[1]],
+            "last_weight": [self.last_weight[0], self.last_weight[1]],
+            "keys": keys,
+        }
+        return meta, [("strategy_sum", strategy), ("last_strategy", last)]
+
+    def restore_state(self, meta: dict, tables: Dict[str, Sequence[float]]) -> None:
+        check_trainer_meta(meta, "vector_fp", self.config)
+        strategy = tables["strategy_sum"]
+        last = tables["last_strategy"]
+        offset = 0
+        for player in (0, 1):
+            self.infosets[player] = {}
+            rows = self.num_hands[player]
+            for key in meta["keys"][str(player)]:
+                actions = self.game.legal_actions(self._state_from_key(key))
+                infoset = VectorFPInfoSet(rows, actions, self.config.storage)
+                cols = len(infoset.actions)
+                size = rows * cols
+                storage = self.config.storage
+                infoset.strategy_sum = rows_from_flat(storage, strategy[offset : offset + size], rows, cols)
+                infoset.last_strategy = rows_from_flat(storage, last[offset : offset + size], rows, cols)
+                self.infosets[player][key] = infoset
+                offset += size
+            self.total_weight[player] = meta["total_weight"][player]
+            self.last_weight[player] = meta["last_weight"][player]
+        self.iteration = meta["iteration"]
 
     def average_strategy_profile(self) -> Dict[int, Dict[str, Tuple[List[str], List[List[float]]]]]:
         profile: Dict[int, Dict[str, Tuple[List[str], List[List[float]]]]] = {0: {}, 1: {}}
@@ -156,3 +227,174 @@ class VectorFictitiousPlayTrainer:
                         matrix.append(row)
                 profile[player][key] = (infoset.action_tokens, matrix)
         return profile
+
+
+class NodeVectorFPTrainer:
+    # Vector FP with tables bound to compiled node ids. Next to the strategy sums, every
+    # decision node keeps the opponent-facing average (sum / total weight; for optimistic FP
+    # (sum + w * last) / (total + w)) as a table that is rewritten in place in the same pass
+    # that adds a best response. best_response reads the rows straight from that table, so an
+    # iteration is one best-response traversal plus one pass over the updated player's entries:
+    # no profile dicts, copies or key lookups. The arithmetic is the reference trainer's, so
+    # results match VectorFictitiousPlayTrainer exactly (float32 views round once more).
+    def __init__(self, game: RiverHoldemGame, config: VectorFPConfig | None = None) -> None:
+        self.game = game
+        self.config = config or VectorFPConfig(engine="node")
+        check_storage(self.config.storage)
+        self.iteration = 0
+        self.num_hands = [len(game.hands[0]), len(game.hands[1])]
+        self.total_weight = {0: 0.0, 1: 0.0}
+        self.last_weight = {0: 0.0, 1: 0.0}
+        self.summary = {
+            0: build_strength_summary(self.game.hands[1]),
+            1: build_strength_summary(self.game.hands[0]),
+        }
+        self.removal = {
+            0: build_card_removal_index(self.game.hands[0], self.summary[0]),
+            1: build_card_removal_index(self.game.hands[1], self.summary[1]),
+        }
+        self.tree = game.flat_tree()
+        # Profiler phases as in VectorFictitiousPlayTrainer, with the reach pass timed as forward.
+        self.profiler: SolverProfiler | None = None
+        # Rows per node id (None off decision nodes). Views start uniform, which is what the
+        # reference trainer plays before a player's first update. The last iterate is only
+        # needed to rebuild optimistic views on restore.
+        self.strategy_sum: List[object] = [None for _ in range(self.tree.num_nodes)]
+        self.view: List[object] = [None for _ in range(self.tree.num_nodes)]
+        self.last: List[object] = [None for _ in range(self.tree.num_nodes)]
+        for node in self.tree.decision_nodes:
+            self._allocate(node)
+
+    def _allocate(self, node: int) -> None:
+        storage = self.config.storage
+        rows = self.num_hands[self.tree.player[node]]
+        cols = self.tree.child_count[node]
+        self.strategy_sum[node] = make_rows(storage, rows, cols)
+        self.view[node] = make_rows(storage, rows, cols, 1.0 / cols)
+        if self.config.optimistic:
+            self.last[node] = make_rows(storage, rows, cols, 1.0 / cols)
+
+    def _best_response(self, player: int) -> Dict[int, List[List[float]]]:
+        profiler = self.profiler
+        tick = perf_counter() if profiler is not None else 0.0
+        reach = best_response_reach_at(self.tree, player, self.view.__getitem__, self.game.hand_weights[1 - player])
+        if profiler is not None:
+            now = perf_counter()
+            profiler.add("forward", now - tick)
+            tick = now
+        _, br_matrices = best_response_backward(self.tree, player, self.removal[player], reach)
+        if profiler is not None:
+            profiler.visit(self.tree.num_nodes)
+            profiler.add("backward", perf_counter() - tick)
+        return br_matrices
+
+    def _update_player(self, player: int, br_matrices: Dict[int, List[List[float]]]) -> None:
+        tick = perf_counter() if self.profiler is not None else 0.0
+        weight = float(self.iteration) if self.config.linear_weighting else 1.0
+        self.last_weight[player] = weight
+        self.total_weight[player] += weight
+        optimistic = self.config.optimistic
+        # Optimistic FP counts the last iterate twice.
+        denom = self.total_weight[player] + (weight if optimistic else 0.0)
+        for node, matrix in br_matrices.items():
+            sums = self.strategy_sum[node]
+            view = self.view[node]
+            last = self.last[node]
+            for h_idx, br_row in enumerate(matrix):
+                sum_row = sums[h_idx]
+                view_row = view[h_idx]
+                for a_idx, prob in enumerate(br_row):
+                    sum_row[a_idx] += weight * prob
+                    value = sum_row[a_idx]
+                    if optimistic:
+                        value += weight * prob
+                        last[h_idx][a_idx] = prob
+                    view_row[a_idx] = value / denom
+        if self.profiler is not None:
+            self.profiler.add("update", perf_counter() - tick)
+
+    def run(self, iterations: int) -> None:
+        for _ in range(iterations):
+            self.iteration += 1
+            if self.profiler is not None:
+                self.profiler.begin_iteration(self.iteration)
+            if self.config.alternating:
+                for player in (0, 1):
+                    self._update_player(player, self._best_response(player))
+            else:
+                # Both responses read the views before either player's update.
+                responses = [self._best_response(player) for player in (0, 1)]
+                for player in (0, 1):
+                    self._update_player(player, responses[player])
+            if self.profiler is not None:
+                self.profiler.end_iteration()
+
+    def snapshot_state(self) -> Tuple[dict, List[Tuple[str, array]]]:
+        strategy = array("d")
+        last = array("d")
+        for node in self.tree.decision_nodes:
+            strategy.extend(flatten_rows(self.strategy_sum[node]))
+            if self.config.optimistic:
+                last.extend(flatten_rows(self.last[node]))
+        meta = {
+            "trainer": "vector_fp_node",
+            "config": asdict(self.config),
+            "iteration": self.iteration,
+            "total_weight": [self.total_weight[0], self.total_weight[1]],
+            "last_weight": [self.last_weight[0], self.last_weight[1]],
+        }
+        return meta, [("strategy_sum", strategy), ("last_strategy", last)]
+
+    def restore_state(self, meta: dict, tables: Dict[str, Sequence[float]]) -> None:
+        check_trainer_meta(meta, "vector_fp_node", self.config)
+        storage = self.config.storage
+        optimistic = self.config.optimistic
+        for player in (0, 1):
+            self.total_weight[player] = meta["total_weight"][player]
+            self.last_weight[player] = meta["last_weight"][player]
+        offset = 0
+        for node in self.tree.decision_nodes:
+            player = self.tree.player[node]
+            rows = self.num_hands[player]
+            cols = self.tree.child_count[node]
+            size = rows * cols
+            self._allocate(node)
+            window = slice(offset, offset + size)
+            self.strategy_sum[node] = rows_from_flat(storage, tables["strategy_sum"][window], rows, cols)
+            if optimistic:
+                self.last[node] = rows_from_flat(storage, tables["last_strategy"][window], rows, cols)
+            offset += size
+            last_weight = self.last_weight[player] if optimistic else 0.0
+            denom = self.total_weight[player] + last_weight
+            if denom <= 0.0:
+                continue
+            for h_idx, view_row in enumerate(self.view[node]):
+                sum_row = self.strategy_sum[node][h_idx]
+                for a_idx in range(cols):
+                    value = sum_row[a_idx]
+                    if optimistic:
+                        value += last_weight * self.last[node][h_idx][a_idx]
+                    view_row[a_idx] = value / denom
+        self.iteration = meta["iteration"]
+
+    def average_strategy_profile(self) -> Dict[int, Dict[str, Tuple[List[str], List[List[float]]]]]:
+        profile: Dict[int, Dict[str, Tuple[List[str], List[List[float]]]]] = {0: {}, 1: {}}
+        tree = self.tree
+        for node in tree.decision_nodes:
+            player = tree.player[node]
+            denom = self.total_weight[player]
+            if denom <= 0.0:
+                matrix = [[1.0 / tree.child_count[node] for _ in row] for row in self.strategy_sum[node]]
+            else:
+                matrix = [[value / denom for value in row] for row in self.strategy_sum[node]]
+            profile[player][tree.keys[node]] = (tree.child_tokens(node), matrix)
+        return profile
+
+
+def make_vector_fp_trainer(game: RiverHoldemGame, config: VectorFPConfig | None = None):
+    config = config or VectorFPConfig()
+    if config.engine == "profile":
+        return VectorFictitiousPlayTrainer(game, config)
+    if config.engine == "node":
+        return NodeVectorFPTrainer(game, config)
+    raise ValueError(f"Unknown vector FP engine: {config.engine}")
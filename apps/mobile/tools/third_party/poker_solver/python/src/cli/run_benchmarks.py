@@ -0,0 +1,386 @@
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from algorithms.budget import SolveBudget, run_with_budget
+
+BENCH_VERSION = 2
+BENCH_CHECKPOINTS = [10, 25, 50, 100, 200, 400, 800, 1600]
+
+# Fixed river matrix. Boards cover the texture classes the solver has to handle; ranges are the
+# same for both players and only use ranks at or above the cutoff, so their size is stable.
+BOARDS: Dict[str, Tuple[str, ...]] = {
+    "dry": ("Ks", "7d", "2c", "9h", "4s"),
+    "wet": ("Jh", "Th", "9h", "8c", "2d"),
+    "paired": ("Qs", "Qd", "7c", "4h", "2s"),
+    "monotone": ("As", "Js", "8s", "5s", "2s"),
+    "four_flush": ("Ks", "9s", "6s", "3s", "Td"),
+}
+RANGES: Dict[str, str | None] = {"narrow": "JQKA", "medium": "89TJQKA", "full": None}
+BET_SIZES: Dict[str, Tuple[float, ...]] = {"1size": (0.75,), "3size": (0.33, 0.75, 1.5)}
+RIVER_POT = 1000
+RIVER_STACK = 9500
+RIVER_MAX_RAISES = 3
+TOY_GAMES = ("kuhn", "leduc")
+
+# compare: a case regresses when a metric moves past the tolerance in the bad direction.
+# (name, True if higher is better)
+COMPARED_METRICS = (
+    ("iters_per_second", True),
+    ("time_to_target", False),
+    ("peak_rss_kib", False),
+    ("final_exploitability", False),
+)
+
+
+@dataclass
+class BenchSettings:
+    max_iters: int = 200
+    # Per-case wall-clock cap for the solve loop (None: max_iters only, fully reproducible).
+    time_limit: float | None = None
+    # River target as a fraction of the starting pot; toy games use absolute targets.
+    river_target: float = 0.005
+    kuhn_target: float = 1e-3
+    leduc_target: float = 0.05
+
+
+@dataclass
+class BenchCase:
+    case_id: str
+    game: str
+    algo: str
+    board: str | None = None
+    range_name: str | None = None
+    sizes: str | None = None
+
+
+def range_hands(board: Sequence[str], ranks: str | None) -> List[str] | None:
+    if ranks is None:
+        return None
+    from games.river_holdem import all_hole_cards, card_str, parse_cards
+
+    return [
+        card_str(first) + card_str(second)
+        for first, second in all_hole_cards(parse_cards(board))
+        if card_str(first)[0] in ranks and card_str(second)[0] in ranks
+    ]
+
+
+def river_config(case: BenchCase):
+    from games.river_holdem import RiverHoldemConfig
+
+    board = BOARDS[case.board]
+    hands = range_hands(board, RANGES[case.range_name])
+    weights = None if hands is None else [1.0 for _ in hands]
+    return RiverHoldemConfig(
+        board=board,
+        pot=RIVER_POT,
+        stacks=(RIVER_STACK, RIVER_STACK),
+        bet_sizes=BET_SIZES[case.sizes],
+        include_all_in=True,
+        max_raises=RIVER_MAX_RAISES,
+        ranges=(hands, hands),
+        range_weights=(weights, weights),
+    )
+
+
+def build_cases(games: Sequence[str], algos: Sequence[str] | None, boards, ranges, sizes) -> List[BenchCase]:
+    from cli.run_exploitability import make_algorithms, make_alt_algorithms
+    from cli.run_river_exploitability import ALGORITHMS
+
+    cases = []
+    for game in games:
+        if game == "river":
+            for board in boards:
+                for range_name in ranges:
+                    for size in sizes:
+                        for algo in ALGORITHMS:
+                            if algos is None or algo in algos:
+                                case_id = f"river/{board}/{range_name}/{size}/{algo}"
+                                cases.append(BenchCase(case_id, "river", algo, board, range_name, size))
+            continue
+        names = list(make_algorithms(True, toy_fp_config())) + [
+            f"alt-{name}" for name in make_alt_algorithms(True)
+        ]
+        for algo in names:
+            if algos is None or algo in algos:
+                cases.append(BenchCase(f"{game}/{algo}", game, algo))
+    return cases
+
+
+def toy_fp_config():
+    # run_exploitability.py defaults: linear weighting and alternating updates on.
+    from algorithms.fictitious_play import FPConfig
+
+    return FPConfig(linear_weighting=True, alternating=True)
+
+
+def _make_toy(case: BenchCase):
+    from algorithms.evaluation import exploitability
+    from cli.run_exploitability import make_algorithms, make_alt_algorithms
+    from games.kuhn import KuhnPoker
+    from games.leduc import LeducPoker
+
+    game = KuhnPoker() if case.game == "kuhn" else LeducPoker()
+    if case.algo.startswith("alt-"):
+        factory = make_alt_algorithms(True)[case.algo[len("alt-") :]]
+    else:
+        factory = make_algorithms(True, toy_fp_config())[case.algo]
+    return factory(game), lambda profile: exploitability(game, profile)
+
+
+def _make_river(case: BenchCase):
+    from algorithms.vector_eval import build_card_removal_index, build_strength_summary, exploitability
+    from cli.run_river_exploitability import make_trainer
+    from games.river_holdem import RiverHoldemGame
+
+    game = RiverHoldemGame(river_config(case))
+    summaries = {0: build_strength_summary(game.hands[1]), 1: build_strength_summary(game.hands[0])}
+    removal = {p: build_card_removal_index(game.hands[p], summaries[p]) for p in (0, 1)}
+    return make_trainer(case.algo, game), lambda profile: exploitability(game, profile, summaries, removal)
+
+
+def run_case(case: BenchCase, settings: BenchSettings) -> dict:
+    # Runs in a fresh process, so ru_maxrss is this case's own peak.
+    record = asdict(case)
+    start_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    setup_start = time.perf_counter()
+    try:
+        trainer, evaluate = _make_river(case) if case.game == "river" else _make_toy(case)
+    except ImportError as exc:
+        # The NumPy engines are optional.
+        record.update({"status": "skipped", "error": f"{type(exc).__name__}: {exc}"})
+        return record
+    setup_seconds = time.perf_counter() - setup_start
+    if case.game == "river":
+        target = settings.river_target * RIVER_POT
+    else:
+        target = settings.kuhn_target if case.game == "kuhn" else settings.leduc_target
+    # The target only marks time-to-target; every case runs to max_iters so rates compare.
+    solved = run_with_budget(
+        trainer,
+        evaluate,
+        SolveBudget(time_limit=settings.time_limit, max_iters=settings.max_iters),
+        BENCH_CHECKPOINTS,
+        label=case.case_id,
+    )
+    checkpoints = [
+        {"iteration": r["iteration"], "exploitability": r["exploitability"], "solve_seconds": r["solve_seconds"]}
+        for r in solved.checkpoints
+    ]
+    reached = next((c for c in checkpoints if c["exploitability"] <= target), None)
+    first, last = checkpoints[0], checkpoints[-1]
+    spent = last["solve_seconds"] - first["solve_seconds"]
+    record.update(
+        {
+            "status": solved.status,
+            "iterations": solved.iterations,
+            "setup_seconds": setup_seconds,
+            "solve_seconds": solved.solve_seconds,
+            "eval_seconds": solved.eval_seconds,
+            "iters_per_second": solved.iterations / solved.solve_seconds if solved.solve_seconds > 0.0 else None,
+            "target_exploitability": target,
+            # Solve seconds (evaluation excluded) until the first checkpoint at or below target.
+            "time_to_target": reached["solve_seconds"] if reached is not None else None,
+            "iterations_to_target": reached["iteration"] if reached is not None else None,
+            "final_exploitability": last["exploitability"],
+            # Exploitability removed per solve second between the first and last checkpoints.
+            "exploitability_per_second": (
+                (first["exploitability"] - last["exploitability"]) / spent if spent > 0.0 else None
+            ),
+            "start_rss_kib": start_rss,
+            "peak_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            "checkpoints": checkpoints,
+        }
+    )
+    return record
+
+
+def _case_worker(conn, case: BenchCase, settings: BenchSettings) -> None:
+    try:
+        conn.send(run_case(case, settings))
+    except Exception as exc:
+        conn.send({**asdict(case), "status": "error", "error": f"{type(exc).__name__}: {exc}"})
+    conn.close()
+
+
+def run_isolated(case: BenchCase, settings: BenchSettings) -> dict:
+    # "spawn" gives every case a clean interpreter: no memory inherited from the parent or
+    # from earlier cases, and no warm evaluator caches beyond the on-disk hand tables.
+    context = multiprocessing.get_context("spawn")
+    parent, child = context.Pipe(duplex=False)
+    process = context.Process(target=_case_worker, args=(child, case, settings))
+    process.start()
+    child.close()
+    try:
+        record = parent.recv()
+    except EOFError:
+        record = {**asdict(case), "status": "error", "error": f"worker exited with code {process.exitcode}"}
+    process.join()
+    return record
+
+
+def _git_revision() -> str | None:
+    head = Path(__file__).resolve()
+    for parent in head.parents:
+        git_dir = parent / ".git"
+        if git_dir.is_dir():
+            ref = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+            if ref.startswith("ref: "):
+                ref_path = git_dir / ref[len("ref: ") :]
+                return ref_path.read_text(encoding="utf-8").strip() if ref_path.exists() else None
+            return ref
+    return None
+
+
+def run_suite(cases: Sequence[BenchCase], settings: BenchSettings, out: Path) -> dict:
+    report = {
+        "version": BENCH_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "settings": asdict(settings),
+        "matrix": {
+            "boards": {name: list(board) for name, board in BOARDS.items()},
+            "ranges": RANGES,
+            "bet_sizes": {name: list(sizes) for name, sizes in BET_SIZES.items()},
+            "pot": RIVER_POT,
+            "stack": RIVER_STACK,
+            "max_raises": RIVER_MAX_RAISES,
+        },
+        "cases": [],
+    }
+    out.parent.mkdir(parents=True, exist_ok=True)
+    for idx, case in enumerate(cases, 1):
+        record = run_isolated(case, settings)
+        report["cases"].append(record)
+        # Rewritten after every case so an interrupted run keeps what it measured.
+        with out.open("w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        if record["status"] in ("error", "skipped"):
+            print(f"[{idx}/{len(cases)}] {case.case_id}: {record['status']} ({record.get('error')})")
+            continue
+        ttt = record["time_to_target"]
+        print(
+            f"[{idx}/{len(cases)}] {case.case_id}: {record['iters_per_second']:.2f} it/s, "
+            f"exp {record['final_exploitability']:.6g}, "
+            f"target {'-' if ttt is None else f'{ttt:.2f}s'}, peak {record['peak_rss_kib'] / 1024:.0f} MiB"
+        )
+    return report
+
+
+def compare_reports(current: dict, baseline: dict, tolerance: float) -> Tuple[List[str], List[str]]:
+    # Returns (regressions, notes). Only cases present and finished in both reports are compared.
+    if current.get("version") != baseline.get("version"):
+        raise SystemExit(f"Benchmark versions differ: {current.get('version')} vs {baseline.get('version')}")
+    regressions: List[str] = []
+    notes: List[str] = []
+    if current.get("settings") != baseline.get("settings"):
+        notes.append("settings differ from the baseline; rates and targets may not be comparable")
+    base_cases = {case["case_id"]: case for case in baseline["cases"]}
+    seen = set()
+    for case in current["cases"]:
+        case_id = case["case_id"]
+        seen.add(case_id)
+        base = base_cases.get(case_id)
+        if base is None:
+            notes.append(f"{case_id}: new case")
+            continue
+        if base.get("status") in ("error", "skipped"):
+            continue
+        if case.get("status") in ("error", "skipped"):
+            regressions.append(f"{case_id}: {case['status']} ({case.get('error')})")
+            continue
+        for metric, higher_is_better in COMPARED_METRICS:
+            old = base.get(metric)
+            new = case.get(metric)
+            if old is None:
+                continue
+            if new is None:
+                regressions.append(f"{case_id}: {metric} missing (baseline {old:.6g})")
+                continue
+            if higher_is_better:
+                worse = new < old * (1.0 - tolerance)
+            else:
+                # Absolute slack keeps exploitability near zero from flagging rounding noise.
+                worse = new > old * (1.0 + tolerance) + 1e-9
+            if worse:
+                change = (new - old) / old if old else float("inf")
+                regressions.append(f"{case_id}: {metric} {old:.6g} -> {new:.6g} ({change:+.1%})")
+    for case_id in base_cases:
+        if case_id not in seen:
+            notes.append(f"{case_id}: not in current run")
+    return regressions, notes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Solver benchmark suite and regression check.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the benchmark matrix and write a JSON report.")
+    run.add_argument("--out", type=Path, required=True, help="Report path (JSON).")
+    run.add_argument(
+        "--games", nargs="+", default=["river", *TOY_GAMES], choices=("river", *TOY_GAMES), help="Games to run."
+    )
+    run.add_argument("--algos", nargs="+", default=None, help="Only these algorithm labels (default: all).")
+    run.add_argument("--boards", nargs="+", default=list(BOARDS), choices=tuple(BOARDS))
+    run.add_argument("--ranges", nargs="+", default=list(RANGES), choices=tuple(RANGES))
+    run.add_argument("--sizes", nargs="+", default=list(BET_SIZES), choices=tuple(BET_SIZES))
+    run.add_argument("--max-iters", type=int, default=BenchSettings.max_iters, help="Iterations per case.")
+    run.add_argument("--time-limit", type=float, default=None, help="Optional solve-loop cap per case (seconds).")
+    run.add_argument(
+        "--river-target",
+        type=float,
+        default=BenchSettings.river_target,
+        help="River time-to-target threshold as a fraction of the pot (default: 0.005).",
+    )
+    run.add_argument("--list", action="store_true", help="Print the selected case ids and exit.")
+
+    compare = commands.add_parser("compare", help="Flag regressions of a report against a baseline.")
+    compare.add_argument("current", type=Path)
+    compare.add_argument("baseline", type=Path)
+    compare.add_argument(
+        "--tolerance", type=float, default=0.15, help="Relative change tolerated before flagging (default: 0.15)."
+    )
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        with args.current.open("r", encoding="utf-8") as f:
+            current = json.load(f)
+        with args.baseline.open("r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions, notes = compare_reports(current, baseline, args.tolerance)
+        for note in notes:
+            print(f"note: {note}")
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        compared = len({c["case_id"] for c in current["cases"]} & {c["case_id"] for c in baseline["cases"]})
+        print(f"{len(regressions)} regressions over {compared} shared cases (tolerance {args.tolerance:.0%})")
+        raise SystemExit(1 if regressions else 0)
+
+    cases = build_cases(args.games, args.algos, args.boards, args.ranges, args.sizes)
+    if args.list:
+        for case in cases:
+            print(case.case_id)
+        return
+    settings = BenchSettings(max_iters=args.max_iters, time_limit=args.time_limit, river_target=args.river_target)
+    print(f"Benchmark: {len(cases)} cases, {settings.max_iters} iterations each -> {args.out}")
+    run_suite(cases, settings, args.out)
+
+
+if __name__ == "__main__":
+    main()
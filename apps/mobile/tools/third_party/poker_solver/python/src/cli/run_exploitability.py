@@ -3,15 +3,21 @@ from __future__ import annotations
 import argparse
 import json
 import os
+import re
 import sys
 from pathlib import Path
+from typing import Callable, Dict
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+from algorithms.budget import BudgetResult, SolveBudget, describe_result, run_with_budget
 from algorithms.cfr import CFRConfig, CFRTrainer
 from algorithms.evaluation import exploitability
 from algorithms.fictitious_play import FPConfig, FictitiousPlayTrainer
+from algorithms.leduc_vector import LeducVectorCFRTrainer, leduc_vector_config, leduc_vector_exploitability
 from algorithms.mccfr import ExternalSamplingMCCFRTrainer, MCCFRConfig
+from algorithms.profiler import SolverProfiler
+from algorithms.tabular_cfr import TabularCFRTrainer, tabular_exploitability
 from games.kuhn import KuhnPoker
 from games.leduc import LeducPoker
 
@@ -19,28 +25,56 @@ from games.leduc import LeducPoker
 CHECKPOINTS = [25, 50, 100, 200, 400, 800, 1600]
 
 
-def run_trainer(trainer, game, target_exp: float | None):
-    results = {}
-    completed = 0
-    checkpoints = list(CHECKPOINTS)
-    idx = 0
-    last_profile = None
-    while True:
-        if idx < len(checkpoints):
-            target = checkpoints[idx]
-        else:
-            if target_exp is None:
-                break
-            target = max(1, completed * 2)
-        trainer.run(target - completed)
-        completed = target
-        profile = trainer.average_strategy_profile()
-        last_profile = profile
-        results[target] = exploitability(game, profile)
-        if target_exp is not None and results[target] <= target_exp:
-            break
-        idx += 1
-    return results, last_profile
+ENGINES = ("tree", "tabular", "public")
+EVALUATORS = {"tree": exploitability, "tabular": tabular_exploitability, "public": leduc_vector_exploitability}
+
+
+def public_cfr_trainer(game, config: CFRConfig) -> LeducVectorCFRTrainer:
+    return LeducVectorCFRTrainer(game, leduc_vector_config(config))
+
+
+CFR_TRAINERS = {"tree": CFRTrainer, "tabular": TabularCFRTrainer, "public": public_cfr_trainer}
+
+
+def run_trainer(
+    trainer,
+    game,
+    budget: SolveBudget,
+    label: str = "",
+    engine: str = "tree",
+    profiler: SolverProfiler | None = None,
+) -> BudgetResult:
+    # Every engine computes the same exploitability; "tabular" sweeps the compiled tree and
+    # "public" (Leduc only) runs one vector pass per player on the public tree.
+    evaluate = EVALUATORS[engine]
+    return run_with_budget(
+        trainer, lambda profile: evaluate(game, profile), budget, CHECKPOINTS, label=label, profiler=profiler
+    )
+
+
+def profile_path(base: Path, label: str, single: bool) -> Path:
+    # One report per run; unless a single game and algorithm are selected, the label keeps them apart.
+    if single:
+        return base
+    suffix = re.sub(r"[^\w.-]+", "-", label.replace("+", "plus")).strip("-")
+    return base.with_name(f"{base.stem}-{suffix}{base.suffix}")
+
+
+def report_profile(profiler: SolverProfiler | None, base: Path | None, label: str, single: bool, indent: str) -> None:
+    if profiler is None or base is None:
+        return
+    path = profile_path(base, label, single)
+    profiler.write(path)
+    print(indent + profiler.format_summary().replace("\n", "\n" + indent))
+    print(f"{indent}profile report written to {path}")
+
+
+def make_profiler(trainer, enabled: bool) -> SolverProfiler | None:
+    if not enabled:
+        return None
+    profiler = SolverProfiler()
+    profiler.attach(trainer)
+    return profiler
 
 
 def _label_fp(config: FPConfig) -> str:
@@ -56,6 +90,54 @@ def _label_fp(config: FPConfig) -> str:
     return "fp(" + ",".join(parts[1:]) + ")"
 
 
+def make_algorithms(linear: bool, fp_config: FPConfig, engine: str = "tree") -> Dict[str, Callable]:
+    # Simultaneous-update variants (plus MCCFR and FP), keyed by the label printed per game.
+    # engine="tabular" runs the CFR family on the compiled tree (identical results, faster);
+    # engine="public" runs it as Leduc vector CFR (see algorithms.leduc_vector.leduc_vector_config).
+    cfr_trainer = CFR_TRAINERS[engine]
+    return {
+        "cfr": lambda g: cfr_trainer(g, CFRConfig(use_plus=False, linear_weighting=False, alternating=False)),
+        "cfr+": lambda g: cfr_trainer(g, CFRConfig(use_plus=True, linear_weighting=linear, alternating=False)),
+        "dcfr": lambda g: cfr_trainer(
+            g,
+            CFRConfig(
+                use_plus=False,
+                linear_weighting=False,
+                alternating=False,
+                use_dcfr=True,
+                dcfr_alpha=1.5,
+                dcfr_beta=0.0,
+                dcfr_gamma=2.0,
+            ),
+        ),
+        "dcfr+": lambda g: cfr_trainer(
+            g,
+            CFRConfig(
+                use_plus=True,
+                linear_weighting=False,
+                alternating=False,
+                use_dcfr=True,
+                dcfr_alpha=1.5,
+                dcfr_beta=0.0,
+                dcfr_gamma=4.0,
+            ),
+        ),
+        "pcfr+": lambda g: cfr_trainer(
+            g, CFRConfig(use_plus=True, linear_weighting=linear, alternating=False, use_predictive=True)
+        ),
+        "mccfr": lambda g: ExternalSamplingMCCFRTrainer(g, MCCFRConfig(seed=7)),
+        _label_fp(fp_config): lambda g: FictitiousPlayTrainer(g, fp_config),
+    }
+
+
+def make_alt_algorithms(linear: bool, engine: str = "tree") -> Dict[str, Callable]:
+    cfr_trainer = CFR_TRAINERS[engine]
+    return {
+        "cfr": lambda g: cfr_trainer(g, CFRConfig(use_plus=False, linear_weighting=False, alternating=True)),
+        "cfr+": lambda g: cfr_trainer(g, CFRConfig(use_plus=True, linear_weighting=linear, alternating=True)),
+    }
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Run exploitability checkpoints.")
     parser.add_argument("--optimistic", action="store_true", help="Optimistic FP (double-weight last iterate).")
@@ -72,17 +154,59 @@ def main() -> None:
     parser.add_argument(
         "--algo",
         default="all",
-        choices=("all", "cfr", "cfr+", "dcfr", "mccfr", "fp"),
+        choices=("all", "cfr", "cfr+", "dcfr", "dcfr+", "pcfr+", "mccfr", "fp"),
         help="Algorithm to run.",
     )
+    parser.add_argument(
+        "--engine",
+        default="tree",
+        choices=ENGINES,
+        help=(
+            "tree walks game states; tabular runs CFR and best response on the compiled game tree (same results); "
+            "public (Leduc only) runs vector CFR and best response on the public tree."
+        ),
+    )
     parser.add_argument(
         "--game",
         default="all",
         choices=("all", "kuhn", "leduc"),
         help="Game to run.",
     )
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        default=None,
+        help="Wall-clock budget per algorithm in seconds; evaluations are then scheduled adaptively.",
+    )
+    parser.add_argument("--max-iters", type=int, default=None, help="Stop after this many iterations.")
+    parser.add_argument(
+        "--eval-share",
+        type=float,
+        default=0.1,
+        help="Max share of wall time spent evaluating exploitability in --time-limit mode (default: 0.1).",
+    )
+    parser.add_argument("--log", type=Path, default=None, help="Append one JSON line per evaluation to this file.")
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        nargs="?",
+        const=Path("profile.json"),
+        default=None,
+        help="Time iterations and evaluation phases; writes a JSON report per run (default: profile.json, "
+        "suffixed with game and algorithm unless both are selected) and prints a summary.",
+    )
     parser.set_defaults(alternating=True)
     args = parser.parse_args()
+    budget = SolveBudget(
+        time_limit=args.time_limit,
+        target_exp=args.target_exp,
+        max_iters=args.max_iters,
+        eval_share=args.eval_share,
+        log_path=args.log,
+    )
+    show_status = args.time_limit is not None or args.max_iters is not None or args.target_exp is not None
+    if args.engine == "public" and args.game != "leduc":
+        raise SystemExit("--engine public requires --game leduc.")
     if args.dump_strategy and args.algo == "all":
         raise SystemExit("--dump-strategy requires --algo (not 'all').")
     if args.dump_strategy and args.game == "all":
@@ -98,29 +222,13 @@ def main() -> None:
         alternating=args.alternating,
     )
 
-    algorithms = {
-        "cfr": lambda g: CFRTrainer(g, CFRConfig(use_plus=False, linear_weighting=False, alternating=False)),
-        "cfr+": lambda g: CFRTrainer(g, CFRConfig(use_plus=True, linear_weighting=args.linear, alternating=False)),
-        "dcfr": lambda g: CFRTrainer(
-            g,
-            CFRConfig(
-                use_plus=False,
-                linear_weighting=False,
-                alternating=False,
-                use_dcfr=True,
-                dcfr_alpha=1.5,
-                dcfr_beta=0.0,
-                dcfr_gamma=2.0,
-            ),
-        ),
-        "mccfr": lambda g: ExternalSamplingMCCFRTrainer(g, MCCFRConfig(seed=7)),
-        _label_fp(fp_config): lambda g: FictitiousPlayTrainer(g, fp_config),
-    }
-
-    alt_algorithms = {
-        "cfr": lambda g: CFRTrainer(g, CFRConfig(use_plus=False, linear_weighting=False, alternating=True)),
-        "cfr+": lambda g: CFRTrainer(g, CFRConfig(use_plus=True, linear_weighting=args.linear, alternating=True)),
-    }
+    # Alternating CFR/CFR+ runs share the game's --algo filter, so a single report needs one
+    # game, one algorithm, and no second alternating run of it.
+    single_run = (
+        args.game != "all" and args.algo != "all" and not (args.alternating and args.algo in ("cfr", "cfr+"))
+    )
+    algorithms = make_algorithms(args.linear, fp_config, args.engine)
+    alt_algorithms = make_alt_algorithms(args.linear, args.engine)
 
     for game_name, game in games.items():
         if args.game != "all" and game_name != args.game:
@@ -133,9 +241,15 @@ def main() -> None:
             if args.algo != "all" and normalized_name != args.algo:
                 continue
             trainer = trainer_factory(game)
-            results, profile = run_trainer(trainer, game, args.target_exp)
+            label = f"{game_name}/{algo_name}"
+            profiler = make_profiler(trainer, args.profile is not None)
+            result = run_trainer(trainer, game, budget, label=label, engine=args.engine, profiler=profiler)
+            results, profile = result.results, result.last_profile
             values = " ".join(f"{results[it]:.6f}" for it in results)
             print(f"  {algo_name}: {values}")
+            if show_status:
+                print(f"    {describe_result(result)}")
+            report_profile(profiler, args.profile, label, single_run, "    ")
             if args.dump_strategy and profile is not None:
                 with args.dump_strategy.open("w", encoding="utf-8") as out:
                     json.dump(profile, out, indent=2)
@@ -146,9 +260,14 @@ def main() -> None:
                 if args.algo != "all" and algo_name != args.algo:
                     continue
                 trainer = trainer_factory(game)
-                results, _ = run_trainer(trainer, game, args.target_exp)
-                values = " ".join(f"{results[it]:.6f}" for it in results)
+                label = f"{game_name}/alt-{algo_name}"
+                profiler = make_profiler(trainer, args.profile is not None)
+                result = run_trainer(trainer, game, budget, label=label, engine=args.engine, profiler=profiler)
+                values = " ".join(f"{result.results[it]:.6f}" for it in result.results)
                 print(f"    {algo_name}: {values}")
+                if show_status:
+                    print(f"      {describe_result(result)}")
+                report_profile(profiler, args.profile, label, single_run, "      ")
         print()
 
 
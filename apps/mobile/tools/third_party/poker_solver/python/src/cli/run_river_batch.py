@@ -0,0 +1,376 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from algorithms.budget import SolveBudget, run_with_budget
+from algorithms.lbr import LBRConfig, LBRMetric
+from algorithms.profiler import SolverProfiler
+from algorithms.vector_eval import build_card_removal_index, build_strength_summary, exploitability
+from cli.run_river_exploitability import ALGORITHMS, CHECKPOINTS, config_from_dict, make_trainer, write_strategy_json
+from games.river_holdem import RiverHoldemConfig, RiverHoldemGame, board_strengths
+
+MANIFEST_VERSION = 1
+
+
+@dataclass
+class BatchJob:
+    job_id: str
+    config: dict
+
+
+@dataclass
+class JobBudget:
+    algo: str = "dcfr"
+    max_iters: int = 1600
+    target_exp: float | None = None
+    time_limit: float | None = None
+    dump_strategy: bool = False
+    suit_isomorphism: bool = False
+    profile: bool = False
+    # "exact" exploitability or "lbr", the sampled local-best-response lower bound (algorithms.lbr),
+    # with lbr_time seconds and at most lbr_samples hands per player per checkpoint, sampled with lbr_seed.
+    metric: str = "exact"
+    lbr_time: float = 5.0
+    lbr_samples: int = 1000
+    lbr_seed: int = 0
+
+
+def load_jobs(source: Path) -> List[BatchJob]:
+    # A directory of subgame JSON files (job id = file stem) or a JSONL file with one
+    # config per line (job id = the line's "id" field, else its line number).
+    jobs: List[BatchJob] = []
+    if source.is_dir():
+        for path in sorted(source.glob("*.json")):
+            with path.open("r", encoding="utf-8") as f:
+                jobs.append(BatchJob(job_id=path.stem, config=json.load(f)))
+    else:
+        with source.open("r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                data = json.loads(line)
+                jobs.append(BatchJob(job_id=str(data.get("id") or f"line-{line_no:05d}"), config=data))
+    seen = set()
+    for job in jobs:
+        if job.job_id in seen:
+            raise ValueError(f"Duplicate job id: {job.job_id}")
+        seen.add(job.job_id)
+    return jobs
+
+
+def write_json_atomic(path: Path, data) -> None:
+    # Temp file + rename: a crash never leaves a truncated result that resume would trust.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as out:
+            json.dump(data, out, indent=2)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+def result_path(out_dir: Path, job_id: str) -> Path:
+    return out_dir / "jobs" / f"{job_id}.json"
+
+
+def load_finished(out_dir: Path, job_id: str, budget: JobBudget) -> dict | None:
+    path = result_path(out_dir, job_id)
+    if not path.exists():
+        return None
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            result = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # Failed jobs are retried on resume, and so are jobs solved under a different budget.
+    if result.get("status") == "error" or result.get("budget") != budget.__dict__:
+        return None
+    return result
+
+
+class BoardCache:
+    # Per-worker precompute shared by jobs on the same board: hole-card strengths per
+    # board, and strength summaries / card-removal indices per (board, ranges). Small LRU
+    # bounds keep long-running workers from growing without limit.
+    def __init__(self, max_boards: int = 8, max_ranges: int = 16) -> None:
+        self.max_boards = max_boards
+        self.max_ranges = max_ranges
+        self.strengths: OrderedDict = OrderedDict()
+        self.removal: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _touch(cache: OrderedDict, key, limit: int, build):
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key], True
+        value = build()
+        cache[key] = value
+        if len(cache) > limit:
+            cache.popitem(last=False)
+        return value, False
+
+    def game(self, config: RiverHoldemConfig) -> RiverHoldemGame:
+        board_key = (tuple(config.board), config.evaluator)
+        strengths, hit = self._touch(
+            self.strengths, board_key, self.max_boards, lambda: board_strengths(config.board, config.evaluator)
+        )
+        self.hits += int(hit)
+        self.misses += int(not hit)
+        return RiverHoldemGame(config, strengths=strengths)
+
+    def evaluation_tables(self, game: RiverHoldemGame) -> Tuple[Dict, Dict]:
+        key = (
+            tuple(game.board),
+            tuple(tuple(hand.cards for hand in game.hands[player]) for player in (0, 1)),
+            tuple(tuple(hand.strength for hand in game.hands[player]) for player in (0, 1)),
+        )
+
+        def build():
+            summaries = {0: build_strength_summary(game.hands[1]), 1: build_strength_summary(game.hands[0])}
+            removal = {player: build_card_removal_index(game.hands[player], summaries[player]) for player in (0, 1)}
+            return summaries, removal
+
+        # Only cards and strengths feed these tables; hand weights are always read from the game.
+        tables, hit = self._touch(self.removal, key, self.max_ranges, build)
+        self.hits += int(hit)
+        self.misses += int(not hit)
+        return tables
+
+
+_board_cache: BoardCache | None = None
+
+
+def _worker_cache() -> BoardCache:
+    global _board_cache
+    if _board_cache is None:
+        _board_cache = BoardCache()
+    return _board_cache
+
+
+def solve_job(job: BatchJob, budget: JobBudget, out_dir: Path) -> dict:
+    start = time.perf_counter()
+    result = {
+        "id": job.job_id,
+        "algo": budget.algo,
+        "board": list(job.config.get("board") or []),
+        "budget": dict(budget.__dict__),
+    }
+    try:
+        cache = _worker_cache()
+        hits_before = cache.hits
+        config = config_from_dict(job.config)
+        game = cache.game(config)
+        summaries, removal = cache.evaluation_tables(game)
+        trainer = make_trainer(budget.algo, game, suit_isomorphism=budget.suit_isomorphism)
+        profiler = None
+        if budget.profile:
+            profiler = SolverProfiler()
+            profiler.attach(trainer)
+        setup_seconds = time.perf_counter() - start
+
+        # The job's time limit covers setup too, so only the remainder goes to the solve loop.
+        time_limit = None if budget.time_limit is None else max(budget.time_limit - setup_seconds, 0.0)
+
+        eval_details = None
+        if budget.metric == "lbr":
+            lbr = LBRConfig(time_budget=budget.lbr_time, max_samples=budget.lbr_samples, seed=budget.lbr_seed)
+            evaluate = LBRMetric(game, lbr, removal)
+            eval_details = evaluate.details
+        else:
+            evaluate = partial(exploitability, game, summaries=summaries, removal=removal)
+        solved = run_with_budget(
+            trainer,
+            evaluate,
+            SolveBudget(time_limit=time_limit, target_exp=budget.target_exp, max_iters=budget.max_iters),
+            CHECKPOINTS,
+            label=job.job_id,
+            profiler=profiler,
+            eval_details=eval_details,
+        )
+        profile = solved.last_profile
+        checkpoints = []
+        for record in solved.checkpoints:
+            checkpoint = {
+                "iteration": record["iteration"],
+                "exploitability": record["exploitability"],
+                "elapsed": setup_seconds + record["elapsed"],
+            }
+            if "ci_half_width" in record:
+                checkpoint["ci_half_width"] = record["ci_half_width"]
+            checkpoints.append(checkpoint)
+
+        if budget.dump_strategy and profile is not None:
+            strategy_path = out_dir / "jobs" / f"{job.job_id}.strategy.json"
+            write_strategy_json(strategy_path, game, profile)
+            result["strategy"] = str(strategy_path.relative_to(out_dir))
+        if profiler is not None:
+            profile_path = out_dir / "jobs" / f"{job.job_id}.profile.json"
+            profiler.write(profile_path)
+            result["profile"] = str(profile_path.relative_to(out_dir))
+        result.update(
+            {
+                "status": solved.status,
+                "metric": budget.metric,
+                "iterations": solved.iterations,
+                "exploitability": checkpoints[-1]["exploitability"] if checkpoints else None,
+                "checkpoints": checkpoints,
+                "board_cache_hit": cache.hits > hits_before,
+                "timings": {
+                    "setup": setup_seconds,
+                    "solve": solved.solve_seconds,
+                    "eval": solved.eval_seconds,
+                    "total": time.perf_counter() - start,
+                },
+            }
+        )
+    except Exception as exc:
+        result.update(
+            {
+                "status": "error",
+                "error": f"{type(exc).__name__}: {exc}",
+                "timings": {"total": time.perf_counter() - start},
+            }
+        )
+    write_json_atomic(result_path(out_dir, job.job_id), result)
+    return result
+
+
+def _manifest_entry(result: dict, out_dir: Path, resumed: bool) -> dict:
+    return {
+        "id": result["id"],
+        "status": result.get("status"),
+        "iterations": result.get("iterations"),
+        "exploitability": result.get("exploitability"),
+        "seconds": result.get("timings", {}).get("total"),
+        "result": str(result_path(out_dir, result["id"]).relative_to(out_dir)),
+        "resumed": resumed,
+    }
+
+
+def write_manifest(out_dir: Path, source: Path, budget: JobBudget, entries: Dict[str, dict], order, wall: float):
+    jobs = [entries[job_id] for job_id in order if job_id in entries]
+    counts: Dict[str, int] = {}
+    for entry in jobs:
+        counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "source": str(source),
+        "budget": budget.__dict__,
+        "total_jobs": len(order),
+        "finished_jobs": len(jobs),
+        "status_counts": counts,
+        "wall_seconds": wall,
+        "solve_seconds": sum(entry["seconds"] or 0.0 for entry in jobs if not entry["resumed"]),
+        "jobs": jobs,
+    }
+    write_json_atomic(out_dir / "manifest.json", manifest)
+
+
+def run_batch(source: Path, out_dir: Path, budget: JobBudget, workers: int, resume: bool = True) -> dict:
+    start = time.perf_counter()
+    jobs = load_jobs(source)
+    order = [job.job_id for job in jobs]
+    entries: Dict[str, dict] = {}
+    pending: List[BatchJob] = []
+    for job in jobs:
+        finished = load_finished(out_dir, job.job_id, budget) if resume else None
+        if finished is not None:
+            entries[job.job_id] = _manifest_entry(finished, out_dir, resumed=True)
+        else:
+            pending.append(job)
+    print(f"Batch: {len(jobs)} jobs, {len(jobs) - len(pending)} already finished, {len(pending)} to run")
+
+    # Same-board jobs are queued back to back so each worker tends to reuse its board cache.
+    pending.sort(key=lambda job: (tuple(job.config.get("board") or []), job.job_id))
+    with ProcessPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(solve_job, job, budget, out_dir): job for job in pending}
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = futures.pop(future)
+                result = future.result()
+                entries[job.job_id] = _manifest_entry(result, out_dir, resumed=False)
+                exp = result.get("exploitability")
+                exp_text = f"{exp:.6f}" if exp is not None else "-"
+                print(f"  {job.job_id}: {result['status']} iters={result.get('iterations', 0)} exp={exp_text}")
+            # Rewritten after every completion so a crash still leaves an up-to-date summary.
+            write_manifest(out_dir, source, budget, entries, order, time.perf_counter() - start)
+    write_manifest(out_dir, source, budget, entries, order, time.perf_counter() - start)
+    with (out_dir / "manifest.json").open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Solve a batch of river subgames on a process pool.")
+    parser.add_argument("source", type=Path, help="Directory of subgame JSON files or a JSONL file of configs.")
+    parser.add_argument("--out", type=Path, required=True, help="Output directory for results and manifest.json.")
+    parser.add_argument(
+        "--algo", default="dcfr", choices=tuple(name for name in ALGORITHMS), help="Algorithm for every job."
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes.")
+    parser.add_argument("--max-iters", type=int, default=1600, help="Per-job iteration cap.")
+    parser.add_argument("--target-exp", type=float, default=None, help="Per-job exploitability target.")
+    parser.add_argument("--time-limit", type=float, default=None, help="Per-job wall-clock budget in seconds.")
+    parser.add_argument("--dump-strategy", action="store_true", help="Also write each job's average strategy.")
+    parser.add_argument("--suit-iso", action="store_true", help="Solve on suit-isomorphism hand classes.")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Write a phase timing / hot-spot report per job (jobs/<id>.profile.json).",
+    )
+    parser.add_argument(
+        "--metric",
+        default="exact",
+        choices=("exact", "lbr"),
+        help="Checkpoint metric: exact exploitability or the sampled LBR lower bound (see run_river_exploitability).",
+    )
+    parser.add_argument("--lbr-time", type=float, default=5.0, help="Seconds of LBR sampling per checkpoint.")
+    parser.add_argument("--lbr-samples", type=int, default=1000, help="Max sampled hands per player per checkpoint.")
+    parser.add_argument("--lbr-seed", type=int, default=0, help="Seed for LBR hand sampling.")
+    parser.add_argument("--no-resume", action="store_true", help="Re-solve jobs that already have results.")
+    args = parser.parse_args()
+    if args.metric == "lbr" and args.target_exp is not None:
+        raise SystemExit("--target-exp requires --metric exact; the LBR lower bound cannot certify a target.")
+
+    budget = JobBudget(
+        algo=args.algo,
+        max_iters=args.max_iters,
+        target_exp=args.target_exp,
+        time_limit=args.time_limit,
+        dump_strategy=args.dump_strategy,
+        suit_isomorphism=args.suit_iso,
+        profile=args.profile,
+        metric=args.metric,
+        lbr_time=args.lbr_time,
+        lbr_samples=args.lbr_samples,
+        lbr_seed=args.lbr_seed,
+    )
+    manifest = run_batch(args.source, args.out, budget, args.workers, resume=not args.no_resume)
+    counts = ", ".join(f"{status}={count}" for status, count in sorted(manifest["status_counts"].items()))
+    print(
+        f"Finished {manifest['finished_jobs']}/{manifest['total_jobs']} jobs ({counts}) "
+        f"in {manifest['wall_seconds']:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,42 +4,281 @@ import argparse
 import json
 import os
 import sys
+import time
+from dataclasses import replace
+from functools import partial
 from pathlib import Path
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+from algorithms.budget import BudgetResult, SolveBudget, describe_result, run_with_budget
+from algorithms.lbr import LBRConfig, LBRMetric
+from algorithms.parallel_br import ParallelBestResponse
+from algorithms.parallel_cfr import ParallelVectorCFRTrainer
+from algorithms.profiler import SolverProfiler
 from algorithms.river_mccfr import ExternalSamplingMCCFRTrainer, RiverMCCFRConfig
-from algorithms.vector_cfr import VectorCFRConfig, VectorCFRTrainer
-from algorithms.vector_eval import build_blocked_indices, build_strength_summary, exploitability
-from algorithms.vector_fp import VectorFPConfig, VectorFictitiousPlayTrainer
+from algorithms.snapshot import load_trainer, save_trainer
+from algorithms.storage import STORAGE_MODES, traversal_bytes, tree_table_bytes
+from algorithms.table_mccfr import TableMCCFRConfig, TableMCCFRTrainer
+from algorithms.vector_cfr import VectorCFRConfig, VectorCFRTrainer, format_skip_stats, make_vector_cfr_trainer
+from algorithms.vector_eval import build_card_removal_index, build_strength_summary, exploitability
+from algorithms.vector_fp import VectorFPConfig, VectorFictitiousPlayTrainer, make_vector_fp_trainer
+from cli.strategy_dump import is_binary_path, write_strategy_binary
 from games.river_holdem import RiverHoldemConfig, RiverHoldemGame, card_str
+from games.suit_iso import HandIsomorphism
 
 
 CHECKPOINTS = [25, 50, 100, 200, 400, 800, 1600]
 
 
-def run_trainer(trainer, game, summaries, blocked_indices, target_exp: float | None):
-    results = {}
-    completed = 0
-    checkpoints = list(CHECKPOINTS)
-    idx = 0
-    last_profile = None
-    while True:
-        if idx < len(checkpoints):
-            target = checkpoints[idx]
-        else:
-            if target_exp is None:
-                break
-            target = max(1, completed * 2)
-        trainer.run(target - completed)
-        completed = target
-        profile = trainer.average_strategy_profile()
-        last_profile = profile
-        results[target] = exploitability(game, profile, summaries, blocked_indices)
-        if target_exp is not None and results[target] <= target_exp:
-            break
-        idx += 1
-    return results, last_profile
+class SnapshotSchedule:
+    # Saves the trainer to `path` whenever `interval` seconds have passed since the last save.
+    def __init__(self, path: Path, algo: str, interval: float) -> None:
+        self.path = path
+        self.algo = algo
+        self.interval = interval
+        self.last_save = time.monotonic()
+
+    def maybe_save(self, trainer, force: bool = False) -> None:
+        now = time.monotonic()
+        if force or now - self.last_save >= self.interval:
+            save_trainer(self.path, trainer, self.algo)
+            self.last_save = time.monotonic()
+
+
+def advance(trainer, iterations: int, snapshots: SnapshotSchedule | None) -> None:
+    if snapshots is None:
+        trainer.run(iterations)
+        return
+    # One iteration at a time so snapshots land on iteration boundaries at the requested cadence.
+    for _ in range(iterations):
+        trainer.run(1)
+        snapshots.maybe_save(trainer)
+
+
+def run_trainer(
+    trainer,
+    game,
+    summaries,
+    removal,
+    budget: SolveBudget,
+    parallel_br=None,
+    snapshots: SnapshotSchedule | None = None,
+    label: str = "",
+    profiler: SolverProfiler | None = None,
+    lbr: LBRConfig | None = None,
+) -> BudgetResult:
+    # With an LBR config, checkpoints report the sampled local-best-response lower bound
+    # (algorithms.lbr) instead of exact exploitability, with its interval in the log records.
+    eval_details = None
+    if lbr is not None:
+        evaluate = LBRMetric(game, lbr, removal)
+        eval_details = evaluate.details
+    elif parallel_br is not None:
+        evaluate = parallel_br.exploitability
+    else:
+        evaluate = partial(exploitability, game, summaries=summaries, removal=removal)
+
+    # A resumed trainer continues from its saved iteration on the same checkpoint schedule.
+    result = run_with_budget(
+        trainer,
+        evaluate,
+        budget,
+        CHECKPOINTS,
+        advance=lambda t, n: advance(t, n, snapshots),
+        label=label,
+        profiler=profiler,
+        eval_details=eval_details,
+    )
+    if snapshots is not None:
+        snapshots.maybe_save(trainer, force=True)
+    return result
+
+
+def config_from_dict(data: dict) -> RiverHoldemConfig:
+    # Subgame JSON as exported by the GUI; see README for the format.
+    board = tuple(data.get("board") or ["Ks", "Th", "7s", "4d", "2s"])
+    pot = int(data.get("pot", 1000))
+    stack = int(data.get("stack", 9500))
+    bet_sizes = tuple(data.get("bet_sizes") or [0.5, 1.0])
+    include_all_in = bool(data.get("include_all_in", True))
+    max_raises = int(data.get("max_raises", 1000))
+    oop_first_bets = data.get("oop_first_bets") or None
+    ip_first_bets = data.get("ip_first_bets") or None
+    oop_first_raises = data.get("oop_first_raises") or None
+    ip_first_raises = data.get("ip_first_raises") or None
+    oop_next_raises = data.get("oop_next_raises") or None
+    ip_next_raises = data.get("ip_next_raises") or None
+    ranges = [None, None]
+    weights = [None, None]
+    players = data.get("players")
+    if isinstance(players, list) and len(players) == 2:
+        for idx, entry in enumerate(players):
+            if not isinstance(entry, dict):
+                continue
+            hands = entry.get("hands")
+            hand_weights = entry.get("weights")
+            if isinstance(hands, list) and isinstance(hand_weights, list) and len(hands) == len(hand_weights):
+                ranges[idx] = hands
+                weights[idx] = hand_weights
+    return RiverHoldemConfig(
+        board=board,
+        pot=pot,
+        stacks=(stack, stack),
+        bet_sizes=bet_sizes,
+        oop_first_bets=oop_first_bets,
+        ip_first_bets=ip_first_bets,
+        oop_first_raises=oop_first_raises,
+        ip_first_raises=ip_first_raises,
+        oop_next_raises=oop_next_raises,
+        ip_next_raises=ip_next_raises,
+        include_all_in=include_all_in,
+        max_raises=max_raises,
+        ranges=(ranges[0], ranges[1]),
+        range_weights=(weights[0], weights[1]),
+        evaluator=str(data.get("evaluator", "table")),
+    )
+
+
+def default_config() -> RiverHoldemConfig:
+    return RiverHoldemConfig(
+        board=("Ks", "Th", "7s", "4d", "2s"),
+        pot=1000,
+        stacks=(9500, 9500),
+        bet_sizes=(0.5, 1.0),
+        include_all_in=True,
+        max_raises=1000,
+    )
+
+
+ALGORITHMS = {
+    "cfr": lambda g: VectorCFRTrainer(g, VectorCFRConfig(use_plus=False, linear_weighting=False, alternating=True)),
+    "cfr+": lambda g: VectorCFRTrainer(g, VectorCFRConfig(use_plus=True, linear_weighting=True, alternating=True)),
+    "dcfr": lambda g: VectorCFRTrainer(
+        g,
+        VectorCFRConfig(
+            use_plus=False,
+            linear_weighting=False,
+            alternating=True,
+            use_dcfr=True,
+            dcfr_alpha=1.5,
+            dcfr_beta=0.0,
+            dcfr_gamma=2.0,
+        ),
+    ),
+    # DCFR+: discounted CFR+ regrets (floored at zero) with gamma=4 averaging.
+    "dcfr+": lambda g: VectorCFRTrainer(
+        g,
+        VectorCFRConfig(
+            use_plus=True,
+            linear_weighting=False,
+            alternating=True,
+            use_dcfr=True,
+            dcfr_alpha=1.5,
+            dcfr_beta=0.0,
+            dcfr_gamma=4.0,
+        ),
+    ),
+    "pcfr+": lambda g: VectorCFRTrainer(
+        g, VectorCFRConfig(use_plus=True, linear_weighting=True, alternating=True, use_predictive=True)
+    ),
+    "fp": lambda g: VectorFictitiousPlayTrainer(
+        g, VectorFPConfig(optimistic=False, linear_weighting=False, alternating=True)
+    ),
+    # Same FP with node-indexed tables and in-place average views (identical results).
+    "fp-node": lambda g: make_vector_fp_trainer(
+        g, VectorFPConfig(optimistic=False, linear_weighting=False, alternating=True, engine="node")
+    ),
+    "mccfr": lambda g: ExternalSamplingMCCFRTrainer(g, RiverMCCFRConfig(seed=7)),
+    # Table-based MCCFR: 16 sampled deals per iteration, external or outcome sampling.
+    "mccfr-table": lambda g: TableMCCFRTrainer(g, TableMCCFRConfig(seed=7, sampling="external", batch_size=16)),
+    "mccfr-outcome": lambda g: TableMCCFRTrainer(g, TableMCCFRConfig(seed=7, sampling="outcome", batch_size=16)),
+    "cfr-array": lambda g: make_vector_cfr_trainer(
+        g, VectorCFRConfig(use_plus=False, linear_weighting=False, alternating=True, engine="array")
+    ),
+    "cfr+-array": lambda g: make_vector_cfr_trainer(
+        g, VectorCFRConfig(use_plus=True, linear_weighting=True, alternating=True, engine="array")
+    ),
+    "dcfr-array": lambda g: make_vector_cfr_trainer(
+        g,
+        VectorCFRConfig(
+            use_plus=False,
+            linear_weighting=False,
+            alternating=True,
+            use_dcfr=True,
+            dcfr_alpha=1.5,
+            dcfr_beta=0.0,
+            dcfr_gamma=2.0,
+            engine="array",
+        ),
+    ),
+    "dcfr+-array": lambda g: make_vector_cfr_trainer(
+        g,
+        VectorCFRConfig(
+            use_plus=True,
+            linear_weighting=False,
+            alternating=True,
+            use_dcfr=True,
+            dcfr_alpha=1.5,
+            dcfr_beta=0.0,
+            dcfr_gamma=4.0,
+            engine="array",
+        ),
+    ),
+    "pcfr+-array": lambda g: make_vector_cfr_trainer(
+        g, VectorCFRConfig(use_plus=True, linear_weighting=True, alternating=True, use_predictive=True, engine="array")
+    ),
+}
+
+
+def make_trainer(
+    name: str,
+    game: RiverHoldemGame,
+    suit_isomorphism: bool = False,
+    storage: str = "list",
+    cfr_workers: int = 1,
+):
+    trainer = ALGORITHMS[name](game)
+    config = getattr(trainer, "config", None)
+    # Hand classes, table layout and worker processes are fixed at construction, so the trainer is rebuilt.
+    parallel = cfr_workers > 1 and isinstance(config, VectorCFRConfig) and config.engine == "list"
+    if isinstance(config, VectorCFRConfig) and (suit_isomorphism or storage != "list" or parallel):
+        config = replace(config, suit_isomorphism=suit_isomorphism or config.suit_isomorphism, storage=storage)
+        if parallel:
+            # Parallel traversals need simultaneous updates (algorithms.parallel_cfr).
+            config = replace(config, alternating=False, workers=cfr_workers)
+        trainer = make_vector_cfr_trainer(game, config)
+    elif isinstance(config, VectorFPConfig) and storage != "list":
+        trainer = make_vector_fp_trainer(game, replace(config, storage=storage))
+    return trainer
+
+
+def format_bytes(size: int) -> str:
+    return f"{size / 2**20:.1f} MiB" if size >= 2**20 else f"{size / 2**10:.1f} KiB"
+
+
+def print_estimate(game: RiverHoldemGame, suit_isomorphism: bool) -> None:
+    # Sizes the solver tables from the compiled betting tree without allocating or solving.
+    tree = game.flat_tree()
+    if suit_isomorphism:
+        iso = HandIsomorphism(game)
+        num_hands = [iso.num_classes(0), iso.num_classes(1)]
+        print(f"  suit isomorphism: {iso.describe()}")
+    else:
+        num_hands = [len(game.hands[0]), len(game.hands[1])]
+    decision = [sum(1 for node in tree.decision_nodes if tree.player[node] == p) for p in (0, 1)]
+    rows = sum(num_hands[tree.player[node]] for node in tree.decision_nodes)
+    entries = sum(num_hands[tree.player[node]] * tree.child_count[node] for node in tree.decision_nodes)
+    print(f"  nodes: {tree.num_nodes} ({len(tree.decision_nodes)} decision: {decision[0]} OOP / {decision[1]} IP)")
+    print(f"  hands: {len(game.hands[0])} / {len(game.hands[1])}, table rows: {num_hands[0]} / {num_hands[1]}")
+    print(f"  infosets: {len(tree.decision_nodes)} vector, {rows} per hand; {entries} entries per table")
+    print(f"  traversal working set: ~{format_bytes(traversal_bytes(tree, num_hands))} (any storage)")
+    # CFR keeps regret sums, strategy sums and the current-strategy cache; FP keeps strategy
+    # sums and the last iterate. Predictive variants add one list table for the prediction.
+    for storage in STORAGE_MODES:
+        cfr = tree_table_bytes(tree, num_hands, storage, 3)
+        fp = tree_table_bytes(tree, num_hands, storage, 2)
+        print(f"  --storage {storage}: CFR {format_bytes(cfr)}, FP {format_bytes(fp)}")
 
 
 def write_strategy_json(path: Path, game: RiverHoldemGame, profile) -> None:
@@ -55,116 +294,232 @@ def write_strategy_json(path: Path, game: RiverHoldemGame, profile) -> None:
         json.dump({"players": players}, out, indent=2)
 
 
+def write_strategy(path: Path, game: RiverHoldemGame, profile) -> None:
+    # `.bin` selects the mmap-friendly binary container (cli.strategy_dump); anything else is JSON.
+    if is_binary_path(path):
+        hands = [
+            [card_str(hand.cards[0]) + card_str(hand.cards[1]) for hand in game.hands[player]] for player in (0, 1)
+        ]
+        write_strategy_binary(path, hands, game.hand_weights, profile)
+    else:
+        write_strategy_json(path, game, profile)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Run river exploitability checkpoints.")
     parser.add_argument("--config", type=Path, default=None, help="Load a subgame config JSON.")
     parser.add_argument("--target-exp", type=float, default=None, help="Stop when exploitability <= target.")
-    parser.add_argument("--dump-strategy", type=Path, default=None, help="Write the final average strategy to JSON.")
+    parser.add_argument(
+        "--dump-strategy",
+        type=Path,
+        default=None,
+        help="Write the final average strategy (binary container for *.bin, JSON otherwise).",
+    )
     parser.add_argument(
         "--algo",
         default="all",
-        choices=("all", "cfr", "cfr+", "dcfr", "fp", "mccfr"),
-        help="Algorithm to run.",
+        choices=("all", *ALGORITHMS),
+        help="Algorithm to run ('-array' variants use the NumPy engine and are skipped by 'all').",
+    )
+    parser.add_argument(
+        "--evaluator",
+        default=None,
+        choices=("table", "tuple", "verify"),
+        help="Hand evaluator used to rank hands (default: table, or the config's 'evaluator').",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes for exploitability checkpoints (>1 shards best response by hand; results are identical).",
+    )
+    parser.add_argument(
+        "--cfr-workers",
+        type=int,
+        default=1,
+        help="Processes for the list-engine vector CFR variants. Any value >1 also switches them from alternating to "
+        "simultaneous updates, a different algorithm whose runs are labelled '<algo>-simultaneous'; among values >1 "
+        "results do not depend on the count.",
+    )
+    parser.add_argument("--snapshot", type=Path, default=None, help="Periodically save trainer state to this file.")
+    parser.add_argument(
+        "--snapshot-interval", type=float, default=300.0, help="Seconds between snapshots (default: 300)."
+    )
+    parser.add_argument(
+        "--resume", type=Path, default=None, help="Continue from a snapshot (keeps snapshotting to it)."
+    )
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        default=None,
+        help="Wall-clock budget per algorithm in seconds; evaluations are then scheduled adaptively.",
+    )
+    parser.add_argument("--max-iters", type=int, default=None, help="Stop after this many iterations.")
+    parser.add_argument(
+        "--eval-share",
+        type=float,
+        default=0.1,
+        help="Max share of wall time spent evaluating exploitability in --time-limit mode (default: 0.1).",
+    )
+    parser.add_argument("--log", type=Path, default=None, help="Append one JSON line per evaluation to this file.")
+    parser.add_argument(
+        "--skip-stats",
+        action="store_true",
+        help="Print the share of node visits and terminal evaluations that vector CFR skipped as zero-reach.",
+    )
+    parser.add_argument(
+        "--suit-iso",
+        action="store_true",
+        help="Solve vector CFR variants on suit-isomorphism hand classes; strategies are expanded to every combo.",
+    )
+    parser.add_argument(
+        "--storage",
+        default="list",
+        choices=STORAGE_MODES,
+        help="Table layout for vector CFR/FP: Python lists, or contiguous float64/float32 arrays (default: list).",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        nargs="?",
+        const=Path("profile.json"),
+        default=None,
+        help="Time solver phases and count node work; writes a JSON report (default: profile.json, "
+        "suffixed with the algorithm under --algo all) and prints a hot-spot summary.",
+    )
+    parser.add_argument(
+        "--metric",
+        default="exact",
+        choices=("exact", "lbr"),
+        help="Checkpoint metric: exact exploitability, or a sampled local-best-response lower bound with a "
+        "confidence interval for trees where exact best response is too slow. A lower bound cannot certify a "
+        "target, so --target-exp requires the exact metric.",
+    )
+    parser.add_argument(
+        "--lbr-time", type=float, default=5.0, help="Seconds of LBR sampling per checkpoint (default: 5)."
+    )
+    parser.add_argument(
+        "--lbr-samples", type=int, default=1000, help="Max sampled hands per player per LBR checkpoint (default: 1000)."
+    )
+    parser.add_argument("--lbr-seed", type=int, default=0, help="Seed for LBR hand sampling (default: 0).")
+    parser.add_argument(
+        "--estimate",
+        action="store_true",
+        help="Print tree size, infoset counts and expected table memory per storage mode, then exit.",
     )
     args = parser.parse_args()
 
     if args.dump_strategy and args.algo == "all":
         raise SystemExit("--dump-strategy requires --algo (not 'all').")
+    if (args.snapshot or args.resume) and args.algo == "all":
+        raise SystemExit("--snapshot/--resume require --algo (not 'all').")
+    if args.cfr_workers > 1 and args.storage == "float32":
+        raise SystemExit("--cfr-workers does not combine with --storage float32.")
+    if args.metric == "lbr" and args.target_exp is not None:
+        raise SystemExit("--target-exp requires --metric exact; the LBR lower bound cannot certify a target.")
+    snapshot_path = args.snapshot or args.resume
 
     if args.config:
         with args.config.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-        board = tuple(data.get("board") or ["Ks", "Th", "7s", "4d", "2s"])
-        pot = int(data.get("pot", 1000))
-        stack = int(data.get("stack", 9500))
-        bet_sizes = tuple(data.get("bet_sizes") or [0.5, 1.0])
-        include_all_in = bool(data.get("include_all_in", True))
-        max_raises = int(data.get("max_raises", 1000))
-        oop_first_bets = data.get("oop_first_bets") or None
-        ip_first_bets = data.get("ip_first_bets") or None
-        oop_first_raises = data.get("oop_first_raises") or None
-        ip_first_raises = data.get("ip_first_raises") or None
-        oop_next_raises = data.get("oop_next_raises") or None
-        ip_next_raises = data.get("ip_next_raises") or None
-        ranges = [None, None]
-        weights = [None, None]
-        players = data.get("players")
-        if isinstance(players, list) and len(players) == 2:
-            for idx, entry in enumerate(players):
-                if not isinstance(entry, dict):
-                    continue
-                hands = entry.get("hands")
-                hand_weights = entry.get("weights")
-                if isinstance(hands, list) and isinstance(hand_weights, list) and len(hands) == len(hand_weights):
-                    ranges[idx] = hands
-                    weights[idx] = hand_weights
-        config = RiverHoldemConfig(
-            board=board,
-            pot=pot,
-            stacks=(stack, stack),
-            bet_sizes=bet_sizes,
-            oop_first_bets=oop_first_bets,
-            ip_first_bets=ip_first_bets,
-            oop_first_raises=oop_first_raises,
-            ip_first_raises=ip_first_raises,
-            oop_next_raises=oop_next_raises,
-            ip_next_raises=ip_next_raises,
-            include_all_in=include_all_in,
-            max_raises=max_raises,
-            ranges=(ranges[0], ranges[1]),
-            range_weights=(weights[0], weights[1]),
-        )
+            config = config_from_dict(json.load(f))
     else:
-        config = RiverHoldemConfig(
-            board=("Ks", "Th", "7s", "4d", "2s"),
-            pot=1000,
-            stacks=(9500, 9500),
-            bet_sizes=(0.5, 1.0),
-            include_all_in=True,
-            max_raises=1000,
-        )
+        config = default_config()
+    if args.evaluator:
+        config.evaluator = args.evaluator
     game = RiverHoldemGame(config)
+    if args.estimate:
+        print("Estimate: river_nlth")
+        print_estimate(game, args.suit_iso)
+        return
     summaries = {
         0: build_strength_summary(game.hands[1]),
         1: build_strength_summary(game.hands[0]),
     }
-    blocked_indices = {
-        0: build_blocked_indices(game.hands[0], summaries[0]),
-        1: build_blocked_indices(game.hands[1], summaries[1]),
-    }
-
-    algorithms = {
-        "cfr": lambda g: VectorCFRTrainer(g, VectorCFRConfig(use_plus=False, linear_weighting=False, alternating=True)),
-        "cfr+": lambda g: VectorCFRTrainer(g, VectorCFRConfig(use_plus=True, linear_weighting=True, alternating=True)),
-        "dcfr": lambda g: VectorCFRTrainer(
-            g,
-            VectorCFRConfig(
-                use_plus=False,
-                linear_weighting=False,
-                alternating=True,
-                use_dcfr=True,
-                dcfr_alpha=1.5,
-                dcfr_beta=0.0,
-                dcfr_gamma=2.0,
-            ),
-        ),
-        "fp": lambda g: VectorFictitiousPlayTrainer(
-            g, VectorFPConfig(optimistic=False, linear_weighting=False, alternating=True)
-        ),
-        "mccfr": lambda g: ExternalSamplingMCCFRTrainer(g, RiverMCCFRConfig(seed=7)),
+    removal = {
+        0: build_card_removal_index(game.hands[0], summaries[0]),
+        1: build_card_removal_index(game.hands[1], summaries[1]),
     }
 
     print("Game: river_nlth")
-    for name, trainer_factory in algorithms.items():
-        if args.algo != "all" and name != args.algo:
-            continue
-        trainer = trainer_factory(game)
-        results, profile = run_trainer(trainer, game, summaries, blocked_indices, args.target_exp)
-        values = " ".join(f"{results[it]:.6f}" for it in results)
-        print(f"  {name}: {values}")
-        if args.dump_strategy and profile is not None:
-            write_strategy_json(args.dump_strategy, game, profile)
-            print(f"  dumped strategy to {args.dump_strategy}")
+    # Compile the betting tree once up front so its size is known before any solve starts.
+    print(f"  tree: {game.flat_tree().describe()}")
+    if args.suit_iso:
+        print(f"  suit isomorphism: {HandIsomorphism(game).describe()}")
+    lbr = None
+    if args.metric == "lbr":
+        lbr = LBRConfig(time_budget=args.lbr_time, max_samples=args.lbr_samples, seed=args.lbr_seed)
+    use_parallel_br = args.workers > 1 and lbr is None
+    parallel_br = ParallelBestResponse(game, summaries, removal, args.workers) if use_parallel_br else None
+    trainer = None
+    try:
+        for name in ALGORITHMS:
+            if args.algo == "all" and name.endswith("-array"):
+                continue
+            if args.algo != "all" and name != args.algo:
+                continue
+            trainer = make_trainer(
+                name, game, args.suit_iso, args.storage, args.cfr_workers
+            )
+            if args.resume is not None:
+                load_trainer(args.resume, trainer, name)
+                print(f"  resumed {name} at iteration {trainer.iteration} from {args.resume}")
+            label = name
+            if isinstance(trainer, ParallelVectorCFRTrainer):
+                # Simultaneous updates are a different algorithm from the alternating default.
+                label = f"{name}-simultaneous"
+                print(f"  {label}: {name} with simultaneous updates over {trainer.workers} worker processes")
+            snapshots = SnapshotSchedule(snapshot_path, name, args.snapshot_interval) if snapshot_path else None
+            budget = SolveBudget(
+                time_limit=args.time_limit,
+                target_exp=args.target_exp,
+                max_iters=args.max_iters,
+                eval_share=args.eval_share,
+                log_path=args.log,
+            )
+            profiler = None
+            if args.profile is not None:
+                profiler = SolverProfiler()
+                profiler.attach(trainer)
+            result = run_trainer(
+                trainer,
+                game,
+                summaries,
+                removal,
+                budget,
+                parallel_br,
+                snapshots,
+                label=label,
+                profiler=profiler,
+                lbr=lbr,
+            )
+            results, profile = result.results, result.last_profile
+            if lbr is not None:
+                values = " ".join(f"{r['exploitability']:.6f}+/-{r['ci_half_width']:.6f}" for r in result.checkpoints)
+                print(f"  {label} (lbr): {values}")
+            else:
+                values = " ".join(f"{results[it]:.6f}" for it in results)
+                print(f"  {label}: {values}")
+            if args.time_limit is not None or args.max_iters is not None or args.target_exp is not None:
+                print(f"    {describe_result(result)}")
+            if args.skip_stats and hasattr(trainer, "skip_stats"):
+                print(f"    {format_skip_stats(trainer.skip_stats)}")
+            if profiler is not None:
+                path = args.profile
+                if args.algo == "all":
+                    path = path.with_name(f"{path.stem}-{name}{path.suffix}")
+                profiler.write(path)
+                print("    " + profiler.format_summary().replace("\n", "\n    "))
+                print(f"    profile report written to {path}")
+            if args.dump_strategy and profile is not None:
+                write_strategy(args.dump_strategy, game, profile)
+                print(f"  dumped strategy to {args.dump_strategy}")
+            if isinstance(trainer, ParallelVectorCFRTrainer):
+                trainer.close()
+    finally:
+        if isinstance(trainer, ParallelVectorCFRTrainer):
+            trainer.close()
+        if parallel_br is not None:
+            parallel_br.close()
 
 
 if __name__ == "__main__":
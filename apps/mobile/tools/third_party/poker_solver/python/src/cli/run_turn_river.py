@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from algorithms.budget import SolveBudget, describe_result, run_with_budget
+from algorithms.profiler import SolverProfiler
+from algorithms.storage import STORAGE_MODES
+from algorithms.turn_river_cfr import (
+    RunoutCache,
+    TurnRiverCFRConfig,
+    TurnRiverCFRTrainer,
+    turn_removal_index,
+    turn_river_exploitability,
+)
+from games.river_holdem import card_str
+from games.turn_river import TurnRiverConfig, TurnRiverGame
+
+
+CHECKPOINTS = [5, 10, 20, 40, 80]
+
+ALGORITHMS = {
+    "cfr": TurnRiverCFRConfig(use_plus=False, linear_weighting=False),
+    "cfr+": TurnRiverCFRConfig(use_plus=True, linear_weighting=True),
+}
+
+
+def config_from_dict(data: dict) -> TurnRiverConfig:
+    # Same layout as the river subgame JSON with a four-card board; per-street sizes fall back
+    # to "bet_sizes".
+    board = tuple(data.get("board") or ["Ks", "Th", "7s", "4d"])
+    stack = int(data.get("stack", 9500))
+    bet_sizes = tuple(data.get("bet_sizes") or [1.0])
+    ranges = [None, None]
+    weights = [None, None]
+    players = data.get("players")
+    if isinstance(players, list) and len(players) == 2:
+        for idx, entry in enumerate(players):
+            if not isinstance(entry, dict):
+                continue
+            hands = entry.get("hands")
+            hand_weights = entry.get("weights")
+            if isinstance(hands, list) and isinstance(hand_weights, list) and len(hands) == len(hand_weights):
+                ranges[idx] = hands
+                weights[idx] = hand_weights
+    return TurnRiverConfig(
+        board=board,
+        pot=int(data.get("pot", 1000)),
+        stacks=(stack, stack),
+        turn_bet_sizes=tuple(data.get("turn_bet_sizes") or bet_sizes),
+        river_bet_sizes=tuple(data.get("river_bet_sizes") or bet_sizes),
+        include_all_in=bool(data.get("include_all_in", True)),
+        max_raises=int(data.get("max_raises", 1)),
+        ranges=(ranges[0], ranges[1]),
+        range_weights=(weights[0], weights[1]),
+        evaluator=str(data.get("evaluator", "table")),
+    )
+
+
+def write_strategy_json(path: Path, game: TurnRiverGame, profile) -> None:
+    players = []
+    for player in (0, 1):
+        hands = [card_str(hand.cards[0]) + card_str(hand.cards[1]) for hand in game.hands[player]]
+        player_profile = {
+            key: {"actions": actions, "strategy": matrix} for key, (actions, matrix) in profile[player].items()
+        }
+        players.append({"hands": hands, "weights": list(game.hand_weights[player]), "profile": player_profile})
+    with path.open("w", encoding="utf-8") as out:
+        json.dump({"players": players}, out, indent=2)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Solve a turn + river spot with vector-form CFR.")
+    parser.add_argument("--config", type=Path, default=None, help="Load a turn subgame config JSON.")
+    parser.add_argument("--algo", default="cfr+", choices=tuple(ALGORITHMS))
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes that solve river subtrees; runouts are split round-robin between them.",
+    )
+    parser.add_argument(
+        "--runout-cache",
+        type=int,
+        default=48,
+        help="Runout evaluators kept per process (LRU; default 48 keeps every runout).",
+    )
+    parser.add_argument(
+        "--storage",
+        default="list",
+        choices=STORAGE_MODES,
+        help="Regret/strategy table layout: Python lists, or contiguous float64/float32 arrays (default: list).",
+    )
+    parser.add_argument("--target-exp", type=float, default=None, help="Stop when exploitability <= target.")
+    parser.add_argument("--time-limit", type=float, default=None, help="Wall-clock budget in seconds.")
+    parser.add_argument("--max-iters", type=int, default=None, help="Stop after this many iterations.")
+    parser.add_argument(
+        "--eval-share",
+        type=float,
+        default=0.1,
+        help="Max share of wall time spent evaluating exploitability in --time-limit mode (default: 0.1).",
+    )
+    parser.add_argument("--log", type=Path, default=None, help="Append one JSON line per evaluation to this file.")
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        nargs="?",
+        const=Path("profile.json"),
+        default=None,
+        help="Time turn forward/backward passes and river solves; writes a JSON report (default: profile.json) "
+        "and prints a summary.",
+    )
+    parser.add_argument("--dump-strategy", type=Path, default=None, help="Write the final average strategy as JSON.")
+    args = parser.parse_args()
+
+    if args.config:
+        with args.config.open("r", encoding="utf-8") as f:
+            config = config_from_dict(json.load(f))
+    else:
+        config = config_from_dict({})
+    game = TurnRiverGame(config)
+    print("Game: turn_river_nlth")
+    print(f"  {game.describe()}")
+
+    trainer_config = replace(
+        ALGORITHMS[args.algo], workers=args.workers, runout_cache_size=args.runout_cache, storage=args.storage
+    )
+    # Exploitability keeps its own evaluators for every runout; it walks them all each time.
+    eval_cache = RunoutCache(game, len(game.runouts))
+    turn_removal = turn_removal_index(game)
+    budget = SolveBudget(
+        time_limit=args.time_limit,
+        target_exp=args.target_exp,
+        max_iters=args.max_iters,
+        eval_share=args.eval_share,
+        log_path=args.log,
+    )
+    with TurnRiverCFRTrainer(game, trainer_config) as trainer:
+        profiler = None
+        if args.profile is not None:
+            profiler = SolverProfiler()
+            profiler.attach(trainer)
+        result = run_with_budget(
+            trainer,
+            lambda profile: turn_river_exploitability(game, profile, eval_cache, turn_removal),
+            budget,
+            CHECKPOINTS,
+            label=args.algo,
+            profiler=profiler,
+        )
+        hits, misses = trainer.cache_stats()
+    values = " ".join(f"{result.results[it]:.6f}" for it in result.results)
+    print(f"  {args.algo}: {values}")
+    if args.time_limit is not None or args.max_iters is not None or args.target_exp is not None:
+        print(f"    {describe_result(result)}")
+    print(f"    runout cache: {hits} hits, {misses} misses (capacity {args.runout_cache} per worker)")
+    if profiler is not None:
+        profiler.write(args.profile)
+        print("    " + profiler.format_summary().replace("\n", "\n    "))
+        print(f"    profile report written to {args.profile}")
+    if args.dump_strategy and result.last_profile is not None:
+        write_strategy_json(args.dump_strategy, game, result.last_profile)
+        print(f"  dumped strategy to {args.dump_strategy}")
+
+
+if __name__ == "__main__":
+    main()
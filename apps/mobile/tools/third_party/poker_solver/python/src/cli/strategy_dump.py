@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import mmap
+import struct
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping, Sequence, Tuple
+
+# Binary strategy container (little-endian), written by both the Python CLI and the C++ solver
+# for `--dump-strategy *.bin`:
+#
+#   header   64 bytes   magic, version, dtype, hand counts, node count, section offsets
+#   hands    4 ASCII bytes per hand ("AsKd"), player 0 then player 1
+#   weights  float64 per hand, player 0 then player 1
+#   index    32 bytes per node: player, num_actions, key/tokens spans in the string blob, data offset
+#   strings  UTF-8 infoset keys and comma-joined action tokens
+#   data     per node a contiguous hands x actions matrix (float32, or uint16 scaled by 1/65535)
+#
+# Readers mmap the file, parse only the header and index, and decode a node's matrix on first use.
+MAGIC = b"PSSTRAT\x00"
+VERSION = 1
+DTYPE_FLOAT32 = 0
+DTYPE_UINT16 = 1
+HEADER = struct.Struct("<8sIIIIIIQQQQ")
+RECORD = struct.Struct("<IIIIIIQ")
+_QUANT_SCALE = 65535.0
+
+Profile = Dict[str, Tuple[List[str], List[List[float]]]]
+
+
+def is_binary_path(path: Path) -> bool:
+    return path.suffix.lower() == ".bin"
+
+
+def _align(offset: int, size: int = 8) -> int:
+    return (offset + size - 1) // size * size
+
+
+def write_strategy_binary(
+    path: Path,
+    hands: Sequence[Sequence[str]],
+    weights: Sequence[Sequence[float]],
+    profiles: Sequence[Profile],
+    quantize: bool = False,
+) -> None:
+    dtype = DTYPE_UINT16 if quantize else DTYPE_FLOAT32
+    item_size = 2 if quantize else 4
+    strings = bytearray()
+    records = []
+    for player in (0, 1):
+        for key in sorted(profiles[player]):
+            tokens, matrix = profiles[player][key]
+            key_bytes = key.encode("utf-8")
+            token_bytes = ",".join(tokens).encode("utf-8")
+            key_offset = len(strings)
+            strings += key_bytes
+            token_offset = len(strings)
+            strings += token_bytes
+            records.append((player, key_offset, len(key_bytes), token_offset, len(token_bytes), tokens, matrix))
+
+    hands_offset = HEADER.size
+    hands_blob = b"".join(hand.encode("ascii") for player in (0, 1) for hand in hands[player])
+    weights_offset = _align(hands_offset + len(hands_blob))
+    weights_blob = array("d", [w for player in (0, 1) for w in weights[player]]).tobytes()
+    index_offset = _align(weights_offset + len(weights_blob))
+    strings_offset = index_offset + RECORD.size * len(records)
+    data_offset = _align(strings_offset + len(strings))
+
+    index = bytearray()
+    chunks = []
+    cursor = data_offset
+    for player, key_offset, key_len, token_offset, token_len, tokens, matrix in records:
+        if len(matrix) != len(hands[player]):
+            raise ValueError(f"Strategy rows ({len(matrix)}) do not match player {player} hands")
+        index += RECORD.pack(player, len(tokens), key_offset, key_len, token_offset, token_len, cursor)
+        flat = [value for row in matrix for value in row]
+        if quantize:
+            chunk = array("H", [int(round(min(max(value, 0.0), 1.0) * _QUANT_SCALE)) for value in flat]).tobytes()
+        else:
+            chunk = array("f", flat).tobytes()
+        chunks.append(chunk)
+        cursor += len(chunk)
+        # Keep every matrix aligned for its item type.
+        pad = _align(cursor, item_size) - cursor
+        if pad:
+            chunks.append(b"\x00" * pad)
+            cursor += pad
+
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        dtype,
+        len(hands[0]),
+        len(hands[1]),
+        len(records),
+        0,
+        hands_offset,
+        weights_offset,
+        index_offset,
+        strings_offset,
+    )
+    with path.open("wb") as out:
+        out.write(header)
+        out.write(hands_blob)
+        out.write(b"\x00" * (weights_offset - hands_offset - len(hands_blob)))
+        out.write(weights_blob)
+        out.write(b"\x00" * (index_offset - weights_offset - len(weights_blob)))
+        out.write(index)
+        out.write(strings)
+        out.write(b"\x00" * (data_offset - strings_offset - len(strings)))
+        for chunk in chunks:
+            out.write(chunk)
+
+
+class LazyProfile(Mapping):
+    # Read-only infoset -> (tokens, matrix) mapping over a dump; matrices are decoded on first
+    # access and cached, so profile_strategy()/profile_strategy_at() work unchanged.
+    def __init__(self, dump: "StrategyDump", player: int) -> None:
+        self._dump = dump
+        self._player = player
+        self._entries = dump._index[player]
+        self._cache: Dict[str, Tuple[List[str], List[List[float]]]] = {}
+
+    def __getitem__(self, key: str) -> Tuple[List[str], List[List[float]]]:
+        cached = self._cache.get(key)
+        if cached is None:
+            tokens, num_actions, data_offset = self._entries[key]
+            cached = (tokens, self._dump.read_matrix(self._player, num_actions, data_offset))
+            self._cache[key] = cached
+        return cached
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class StrategyDump:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._file = path.open("rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            self._file.close()
+            raise
+        (
+            magic,
+            version,
+            self.dtype,
+            num_hands0,
+            num_hands1,
+            num_nodes,
+            _,
+            hands_offset,
+            weights_offset,
+            index_offset,
+            strings_offset,
+        ) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a strategy dump")
+        if version != VERSION or self.dtype not in (DTYPE_FLOAT32, DTYPE_UINT16):
+            self.close()
+            raise ValueError(f"Unsupported strategy dump version {version} / dtype {self.dtype}")
+        self.num_hands = [num_hands0, num_hands1]
+        raw_hands = self._map[hands_offset : hands_offset + 4 * (num_hands0 + num_hands1)].decode("ascii")
+        all_hands = [raw_hands[i : i + 4] for i in range(0, len(raw_hands), 4)]
+        self.hands = [all_hands[:num_hands0], all_hands[num_hands0:]]
+        all_weights = memoryview(self._map)[weights_offset : weights_offset + 8 * (num_hands0 + num_hands1)]
+        weights = all_weights.cast("d").tolist()
+        all_weights.release()
+        self.weights = [weights[:num_hands0], weights[num_hands0:]]
+        self._index: List[Dict[str, Tuple[List[str], int, int]]] = [{}, {}]
+        for node in range(num_nodes):
+            player, num_actions, key_offset, key_len, token_offset, token_len, data_offset = RECORD.unpack_from(
+                self._map, index_offset + node * RECORD.size
+            )
+            key = self._map[strings_offset + key_offset : strings_offset + key_offset + key_len].decode("utf-8")
+            token_text = self._map[strings_offset + token_offset : strings_offset + token_offset + token_len]
+            tokens = token_text.decode("utf-8").split(",") if token_len else []
+            self._index[player][key] = (tokens, num_actions, data_offset)
+        self.profiles = [LazyProfile(self, 0), LazyProfile(self, 1)]
+
+    def keys(self, player: int) -> List[str]:
+        return list(self._index[player])
+
+    def read_matrix(self, player: int, num_actions: int, data_offset: int) -> List[List[float]]:
+        count = self.num_hands[player] * num_actions
+        if self.dtype == DTYPE_FLOAT32:
+            view = memoryview(self._map)[data_offset : data_offset + 4 * count]
+            flat = view.cast("f").tolist()
+        else:
+            view = memoryview(self._map)[data_offset : data_offset + 2 * count]
+            flat = [value / _QUANT_SCALE for value in view.cast("H").tolist()]
+        view.release()
+        return [flat[h * num_actions : (h + 1) * num_actions] for h in range(self.num_hands[player])]
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "StrategyDump":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def load_strategy_dump(path: Path) -> StrategyDump:
+    return StrategyDump(path)
@@ -16,7 +16,8 @@ from tkinter import filedialog, font as tkfont, messagebox, ttk
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from algorithms.vector_eval import profile_strategy
+from algorithms.vector_eval import ResolvedProfile, resolve_profile
+from cli.strategy_dump import MAGIC, load_strategy_dump
 from games.river_holdem import RiverHoldemConfig, RiverHoldemGame
 
 RANKS = "23456789TJQKA"
@@ -335,6 +336,9 @@ class SubgameGUI:
         self.drag_motion_bind_id: str | None = None
         self.drag_release_bind_id: str | None = None
         self.solution_profiles: List[Dict[str, Tuple[List[str], List[List[float]]]]] = [{}, {}]
+        # Profiles bound to the solution tree's node ids once per solve; see vector_eval.resolve_profile.
+        self.solution_resolved: List[ResolvedProfile] = []
+        self.solution_node_ids: Dict[str, int] = {}
         self.solution_hands: List[List[str]] = [[], []]
         self.solution_weights: List[List[float]] = [[], []]
         self.solution_game: RiverHoldemGame | None = None
@@ -1523,8 +1527,9 @@ class SubgameGUI:
             with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as temp:
                 temp_path = Path(temp.name)
                 json.dump(payload, temp, indent=2)
-            with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as temp_json:
-                strategy_path = Path(temp_json.name)
+            # The solver picks the binary container from the .bin suffix.
+            with tempfile.NamedTemporaryFile(mode="wb", suffix=".bin", delete=False) as temp_bin:
+                strategy_path = Path(temp_bin.name)
 
             try:
                 checkpoints = self._build_checkpoints()
@@ -1573,9 +1578,7 @@ class SubgameGUI:
                 self._log(stdout.strip())
             if strategy_path is not None and strategy_path.exists():
                 try:
-                    with open(strategy_path, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                    bundle = self._prepare_solution_bundle(data, config)
+                    bundle = self._load_solution_bundle(strategy_path, config)
                     if bundle is not None:
                         self.root.after(0, lambda b=bundle: self._apply_solution_bundle(b))
                 except Exception as exc:
@@ -1735,33 +1738,32 @@ class SubgameGUI:
         return tokens
 
     def _compute_solution_reach(
-        self, game: RiverHoldemGame, profiles: List[Dict[str, Tuple[List[str], List[List[float]]]]]
+        self, game: RiverHoldemGame, profiles: List[ResolvedProfile]
     ) -> Dict[int, Dict[str, List[float]]]:
-        num0 = len(game.hands[0])
-        num1 = len(game.hands[1])
-        reach_by_key: Dict[int, Dict[str, List[float]]] = {0: {}, 1: {}}
+        num_hands = (len(game.hands[0]), len(game.hands[1]))
+        tree = game.flat_tree()
+        reach0: List[List[float] | None] = [None for _ in range(tree.num_nodes)]
+        reach1: List[List[float] | None] = [None for _ in range(tree.num_nodes)]
+        reach0[0] = list(game.hand_weights[0])
+        reach1[0] = list(game.hand_weights[1])
+        # Level order guarantees a node's reach is set before its children are expanded.
+        for node in tree.decision_nodes:
+            player = tree.player[node]
+            strategy = profiles[player].strategy_at(node)
+            for a_idx, child in enumerate(tree.children(node)):
+                if player == 0:
+                    reach0[child] = [reach0[node][h] * strategy[h][a_idx] for h in range(num_hands[0])]
+                    reach1[child] = reach1[node]
+                else:
+                    reach0[child] = reach0[node]
+                    reach1[child] = [reach1[node][h] * strategy[h][a_idx] for h in range(num_hands[1])]
 
-        def traverse(state: RiverState, reach0: List[float], reach1: List[float]) -> None:
-            key = game.infoset_key(state, 0)
+        reach_by_key: Dict[int, Dict[str, List[float]]] = {0: {}, 1: {}}
+        for node in range(tree.num_nodes):
+            key = tree.keys[node]
             if key not in reach_by_key[0]:
-                reach_by_key[0][key] = reach0
-                reach_by_key[1][key] = reach1
-            if game.is_terminal(state):
-                return
-            player = game.current_player(state)
-            actions = game.legal_actions(state)
-            if player == 0:
-                strat0 = profile_strategy(game, profiles[0], state, 0, num0)
-                for a_idx, action in enumerate(actions):
-                    next_reach0 = [reach0[h] * strat0[h][a_idx] for h in range(num0)]
-                    traverse(game.next_state(state, action), next_reach0, reach1)
-                return
-            strat1 = profile_strategy(game, profiles[1], state, 1, num1)
-            for a_idx, action in enumerate(actions):
-                next_reach1 = [reach1[h] * strat1[h][a_idx] for h in range(num1)]
-                traverse(game.next_state(state, action), reach0, next_reach1)
-
-        traverse(game.initial_state(), list(game.hand_weights[0]), list(game.hand_weights[1]))
+                reach_by_key[0][key] = reach0[node]
+                reach_by_key[1][key] = reach1[node]
         return reach_by_key
 
     def _build_solution_nodes(self, game: RiverHoldemGame) -> Tuple[Dict[str, RiverState], List[str]]:
@@ -1793,6 +1795,21 @@ class SubgameGUI:
             class_map.setdefault(label, []).append(idx)
         return class_map
 
+    def _load_solution_bundle(self, path: Path, config: SubgameConfig) -> dict | None:
+        if path.stat().st_size == 0:
+            self._log("Solver wrote no strategy.")
+            return None
+        with path.open("rb") as f:
+            binary = f.read(len(MAGIC)) == MAGIC
+        if not binary:
+            with path.open("r", encoding="utf-8") as f:
+                return self._prepare_solution_bundle(json.load(f), config)
+        with load_strategy_dump(path) as dump:
+            hands = [[canonical_hand(hand) for hand in dump.hands[p_idx]] for p_idx in (0, 1)]
+            # Reach needs every node anyway, so decode all matrices now; the temp file can then go.
+            profiles = [dict(dump.profiles[p_idx]) for p_idx in (0, 1)]
+            return self._build_solution_bundle(profiles, hands, dump.weights, config)
+
     def _prepare_solution_bundle(self, data: dict, config: SubgameConfig) -> dict | None:
         players = data.get("players")
         if not isinstance(players, list) or len(players) < 2:
@@ -1822,7 +1839,15 @@ class SubgameGUI:
             profiles.append(profile_map)
             hands.append(hand_list)
             weights.append(weight_list)
+        return self._build_solution_bundle(profiles, hands, weights, config)
 
+    def _build_solution_bundle(
+        self,
+        profiles: List[Dict[str, Tuple[List[str], List[List[float]]]]],
+        hands: List[List[str]],
+        weights: List[List[float]],
+        config: SubgameConfig,
+    ) -> dict:
         game_config = RiverHoldemConfig(
             board=config.board,
             pot=config.pot,
@@ -1841,11 +1866,16 @@ class SubgameGUI:
         )
         game = RiverHoldemGame(game_config)
         states, nodes = self._build_solution_nodes(game)
-        reach = self._compute_solution_reach(game, profiles)
+        tree = game.flat_tree()
+        resolved = [resolve_profile(tree, profiles[player], player, len(game.hands[player])) for player in (0, 1)]
+        node_ids = {tree.keys[node]: node for node in tree.decision_nodes}
+        reach = self._compute_solution_reach(game, resolved)
         class_map = {0: self._build_solution_class_map(hands[0]), 1: self._build_solution_class_map(hands[1])}
         bundle = {
             "game": game,
             "profiles": profiles,
+            "resolved": resolved,
+            "node_ids": node_ids,
             "hands": hands,
             "weights": weights,
             "states": states,
@@ -1858,6 +1888,8 @@ class SubgameGUI:
     def _apply_solution_bundle(self, bundle: dict) -> None:
         self.solution_game = bundle["game"]
         self.solution_profiles = bundle["profiles"]
+        self.solution_resolved = bundle["resolved"]
+        self.solution_node_ids = bundle["node_ids"]
         self.solution_hands = bundle["hands"]
         self.solution_weights = bundle["weights"]
         self.solution_states = bundle["states"]
@@ -1938,13 +1970,17 @@ class SubgameGUI:
         if state.player is None:
             self._set_solution_detail("Selected node is terminal.")
             return
+        node = self.solution_node_ids.get(key)
+        if node is None:
+            self._set_solution_detail("Unknown node.")
+            return
         player = state.player
         self.solution_current_player = player
         if self.solution_player_label is not None:
             self.solution_player_label.configure(text=f"Player to act: P{player}")
         actions = game.legal_actions(state)
         num_hands = len(game.hands[player])
-        matrix = profile_strategy(game, self.solution_profiles[player], state, player, num_hands)
+        matrix = self.solution_resolved[player].strategy_at(node)
         reach_vec = self.solution_reach[player].get(key, [0.0 for _ in range(num_hands)])
         base_weights = self.solution_base_weights.get(player, [0.0 for _ in range(num_hands)])
         self.solution_current_actions = actions
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+
+# Node kinds in FlatGameTree.player besides the acting player (0 or 1); chance matches the
+# game API's current_player() == -1.
+NODE_CHANCE = -1
+NODE_TERMINAL = -2
+
+
+@dataclass
+class FlatGameTree:
+    # Level-order node arrays for a small full-information-tree game (Kuhn, Leduc): every deal
+    # is expanded, so each node is one concrete state. Children of a node occupy
+    # [child_start, child_start + child_count) in the order the game lists its chance outcomes
+    # and legal actions, and nodes of depth d occupy [level_start[d], level_start[d + 1]).
+    player: array
+    infoset: array
+    chance_prob: array
+    utility: array
+    child_start: array
+    child_count: array
+    level_start: array
+    infoset_keys: List[str]
+    infoset_actions: List[List[str]]
+    infoset_player: array
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.player)
+
+    @property
+    def num_infosets(self) -> int:
+        return len(self.infoset_keys)
+
+    def children(self, node: int) -> range:
+        start = self.child_start[node]
+        return range(start, start + self.child_count[node])
+
+    def describe(self) -> str:
+        terminals = sum(1 for kind in self.player if kind == NODE_TERMINAL)
+        return f"{self.num_nodes} nodes ({terminals} terminal), {self.num_infosets} infosets"
+
+
+def compile_game_tree(game) -> FlatGameTree:
+    # Enumerates the game once. Utilities are stored for player 0; the games are zero-sum, so
+    # player 1's utility is the negation. Every infoset must sit at a single depth (true for
+    # Kuhn and Leduc, where an infoset is a private card plus the public history), which lets
+    # best response resolve infosets one level at a time.
+    tree = FlatGameTree(
+        player=array("b"),
+        infoset=array("i"),
+        chance_prob=array("d"),
+        utility=array("d"),
+        child_start=array("i"),
+        child_count=array("i"),
+        level_start=array("i"),
+        infoset_keys=[],
+        infoset_actions=[],
+        infoset_player=array("b"),
+    )
+    index: Dict[str, int] = {}
+    depth_of: List[int] = []
+
+    def append(state, prob: float) -> None:
+        tree.chance_prob.append(prob)
+        tree.child_start.append(0)
+        tree.child_count.append(0)
+        if game.is_terminal(state):
+            utility = game.terminal_utility(state, 0)
+            if abs(utility + game.terminal_utility(state, 1)) > 1e-9:
+                raise ValueError("compile_game_tree requires a zero-sum game")
+            tree.player.append(NODE_TERMINAL)
+            tree.infoset.append(-1)
+            tree.utility.append(utility)
+            return
+        player = game.current_player(state)
+        tree.player.append(player)
+        tree.utility.append(0.0)
+        if player == NODE_CHANCE:
+            tree.infoset.append(-1)
+            return
+        key = game.infoset_key(state, player)
+        infoset = index.get(key)
+        if infoset is None:
+            infoset = len(tree.infoset_keys)
+            index[key] = infoset
+            tree.infoset_keys.append(key)
+            tree.infoset_actions.append(list(game.legal_actions(state)))
+            tree.infoset_player.append(player)
+            depth_of.append(depth)
+        elif depth_of[infoset] != depth:
+            raise ValueError(f"Infoset {key!r} spans several tree depths")
+        tree.infoset.append(infoset)
+
+    depth = 0
+    root = game.initial_state()
+    append(root, 1.0)
+    queue = deque([(0, 0, root)])
+    tree.level_start.append(0)
+    while queue:
+        node, node_depth, state = queue.popleft()
+        if tree.player[node] == NODE_TERMINAL:
+            continue
+        depth = node_depth + 1
+        if len(tree.level_start) <= depth:
+            # Breadth-first order: the first child at a new depth starts that level.
+            tree.level_start.append(len(tree.player))
+        if tree.player[node] == NODE_CHANCE:
+            moves = game.chance_outcomes(state)
+        else:
+            moves = [(action, 1.0) for action in game.legal_actions(state)]
+        tree.child_start[node] = len(tree.player)
+        tree.child_count[node] = len(moves)
+        for move, prob in moves:
+            child_state = game.next_state(state, move)
+            queue.append((len(tree.player), depth, child_state))
+            append(child_state, prob)
+    tree.level_start.append(len(tree.player))
+    return tree
+
+
+_TREES: Dict[tuple, tuple] = {}
+
+
+def cached_tree(game, compile_tree: Callable):
+    # Compiled trees are immutable, so trainers and evaluators of one game object share one.
+    key = (id(game), compile_tree)
+    cached = _TREES.get(key)
+    if cached is None or cached[0] is not game:
+        cached = (game, compile_tree(game))
+        _TREES[key] = cached
+    return cached[1]
+
+
+def game_tree(game) -> FlatGameTree:
+    return cached_tree(game, compile_game_tree)
@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+from array import array
+from dataclasses import dataclass
+from itertools import combinations, combinations_with_replacement
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+# Bump when the table layout or class ordering changes; old cache files are then ignored.
+TABLE_VERSION = 1
+CACHE_ENV = "POKER_SOLVER_CACHE"
+
+
+def evaluate_5(cards: Sequence[int]) -> Tuple[int, ...]:
+    ranks = [card % 13 + 2 for card in cards]
+    suits = [card // 13 for card in cards]
+    ranks_sorted = sorted(ranks, reverse=True)
+    counts: Dict[int, int] = {}
+    for rank in ranks:
+        counts[rank] = counts.get(rank, 0) + 1
+    count_items = sorted(counts.items(), key=lambda item: (item[1], item[0]), reverse=True)
+    counts_sorted = [count for _, count in count_items]
+    ranks_by_count = [rank for rank, _ in count_items]
+
+    is_flush = len(set(suits)) == 1
+    unique_ranks = sorted(set(ranks), reverse=True)
+    is_straight = False
+    straight_high = 0
+    if len(unique_ranks) == 5 and unique_ranks[0] - unique_ranks[-1] == 4:
+        is_straight = True
+        straight_high = unique_ranks[0]
+    elif unique_ranks == [14, 5, 4, 3, 2]:
+        is_straight = True
+        straight_high = 5
+
+    if is_straight and is_flush:
+        return (8, straight_high)
+    if counts_sorted == [4, 1]:
+        quad = ranks_by_count[0]
+        kicker = ranks_by_count[1]
+        return (7, quad, kicker)
+    if counts_sorted == [3, 2]:
+        trip = ranks_by_count[0]
+        pair = ranks_by_count[1]
+        return (6, trip, pair)
+    if is_flush:
+        return (5, *ranks_sorted)
+    if is_straight:
+        return (4, straight_high)
+    if counts_sorted == [3, 1, 1]:
+        trip = ranks_by_count[0]
+        kickers = sorted(ranks_by_count[1:], reverse=True)
+        return (3, trip, *kickers)
+    if counts_sorted == [2, 2, 1]:
+        high_pair, low_pair = sorted(ranks_by_count[:2], reverse=True)
+        kicker = ranks_by_count[2]
+        return (2, high_pair, low_pair, kicker)
+    if counts_sorted == [2, 1, 1, 1]:
+        pair = ranks_by_count[0]
+        kickers = sorted(ranks_by_count[1:], reverse=True)
+        return (1, pair, *kickers)
+    return (0, *ranks_sorted)
+
+
+def evaluate_7(cards: Sequence[int]) -> Tuple[int, ...]:
+    best: Tuple[int, ...] | None = None
+    for combo in combinations(cards, 5):
+        rank = evaluate_5(combo)
+        if best is None or rank > best:
+            best = rank
+    if best is None:
+        raise ValueError("No cards to evaluate")
+    return best
+
+
+@dataclass
+class HandRankTables:
+    # rank_key (sum of 5**rank per card) -> best non-flush class for that rank multiset.
+    nonflush: Dict[int, int]
+    # 13-bit suit rank mask -> best flush/straight-flush class, 0 when fewer than 5 bits.
+    flush: array
+    num_classes: int
+
+
+_RANK_KEYS = [5**rank for rank in range(13)]
+_tables: HandRankTables | None = None
+_tuple_classes: Dict[Tuple[int, ...], int] | None = None
+
+
+def _five_rank_multisets() -> List[Tuple[int, ...]]:
+    return [ranks for ranks in combinations_with_replacement(range(13), 5) if max(ranks.count(r) for r in ranks) <= 4]
+
+
+def _offsuit_cards(ranks: Sequence[int]) -> List[int]:
+    # Rotate suits so no five cards share one; at most 4 copies of a rank keeps cards distinct.
+    cards = []
+    used: Dict[int, int] = {}
+    for idx, rank in enumerate(ranks):
+        copy = used.get(rank, 0)
+        used[rank] = copy + 1
+        suit = (copy + idx) % 4
+        while suit * 13 + rank in cards:
+            suit = (suit + 1) % 4
+        cards.append(suit * 13 + rank)
+    return cards
+
+
+def _suited_cards(mask: int) -> List[int]:
+    return [rank for rank in range(13) if mask & (1 << rank)]
+
+
+def _class_order() -> Dict[Tuple[int, ...], int]:
+    # All 7462 distinct five-card values, ordered weakest to strongest.
+    values = {evaluate_5(_offsuit_cards(ranks)) for ranks in _five_rank_multisets()}
+    for ranks in combinations(range(13), 5):
+        values.add(evaluate_5(list(ranks)))
+    return {value: idx for idx, value in enumerate(sorted(values))}
+
+
+def tuple_class(strength: Tuple[int, ...]) -> int:
+    # Map an evaluate_5/evaluate_7 tuple onto the integer scale used by the tables.
+    global _tuple_classes
+    if _tuple_classes is None:
+        _tuple_classes = _class_order()
+    return _tuple_classes[strength]
+
+
+def _generate_tables() -> HandRankTables:
+    classes = _class_order()
+    nonflush: Dict[int, int] = {}
+    for ranks in _five_rank_multisets():
+        nonflush[sum(_RANK_KEYS[r] for r in ranks)] = classes[evaluate_5(_offsuit_cards(ranks))]
+    # Six and seven card multisets: best of the multisets with one card removed.
+    for size in (6, 7):
+        for ranks in combinations_with_replacement(range(13), size):
+            if max(ranks.count(r) for r in ranks) > 4:
+                continue
+            key = sum(_RANK_KEYS[r] for r in ranks)
+            nonflush[key] = max(nonflush[key - _RANK_KEYS[r]] for r in set(ranks))
+
+    flush = array("H", [0]) * (1 << 13)
+    for size in (5, 6, 7):
+        for ranks in combinations(range(13), size):
+            mask = 0
+            for rank in ranks:
+                mask |= 1 << rank
+            if size == 5:
+                flush[mask] = classes[evaluate_5(list(ranks))]
+            else:
+                flush[mask] = max(flush[mask & ~(1 << rank)] for rank in ranks)
+    return HandRankTables(nonflush=nonflush, flush=flush, num_classes=len(classes))
+
+
+def cache_path() -> Path:
+    root = os.environ.get(CACHE_ENV)
+    base = Path(root) if root else Path.home() / ".cache" / "poker_solver"
+    return base / f"hand_rank_v{TABLE_VERSION}.bin"
+
+
+def _write_tables(path: Path, tables: HandRankTables) -> None:
+    keys = array("q", sorted(tables.nonflush))
+    values = array("H", (tables.nonflush[key] for key in keys))
+    header = array("q", [TABLE_VERSION, tables.num_classes, len(keys)])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write to a sibling temp file and rename so concurrent readers never see a partial table.
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            header.tofile(out)
+            keys.tofile(out)
+            values.tofile(out)
+            tables.flush.tofile(out)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+def _read_tables(path: Path) -> HandRankTables | None:
+    try:
+        with path.open("rb") as f:
+            header = array("q")
+            header.fromfile(f, 3)
+            version, num_classes, count = header
+            if version != TABLE_VERSION:
+                return None
+            keys = array("q")
+            keys.fromfile(f, count)
+            values = array("H")
+            values.fromfile(f, count)
+            flush = array("H")
+            flush.fromfile(f, 1 << 13)
+    except (OSError, EOFError, ValueError):
+        return None
+    return HandRankTables(nonflush=dict(zip(keys, values)), flush=flush, num_classes=num_classes)
+
+
+def load_tables() -> HandRankTables:
+    global _tables
+    if _tables is not None:
+        return _tables
+    path = cache_path()
+    tables = _read_tables(path)
+    if tables is None:
+        tables = _generate_tables()
+        try:
+            _write_tables(path, tables)
+        except OSError:
+            # A read-only home is fine; tables are just regenerated next process.
+            pass
+    _tables = tables
+    return tables
+
+
+def evaluate_rank(cards: Sequence[int]) -> int:
+    # Integer hand class for 5-7 cards; larger is stronger, equal means a split pot.
+    tables = load_tables()
+    key = 0
+    masks = [0, 0, 0, 0]
+    for card in cards:
+        rank = card % 13
+        key += _RANK_KEYS[rank]
+        masks[card // 13] |= 1 << rank
+    flush = tables.flush
+    return max(tables.nonflush[key], flush[masks[0]], flush[masks[1]], flush[masks[2]], flush[masks[3]])
+
+
+def _flush_hands() -> List[List[int]]:
+    # Every suited rank set of 5-7 cards in one suit, plus off-suit extras up to seven cards.
+    # Extras take any ranks, including the suited ones, so paired boards with a flush are covered.
+    hands = []
+    for suited_size in (5, 6, 7):
+        for ranks in combinations(range(13), suited_size):
+            for extra_size in range(7 - suited_size + 1):
+                for extras in combinations_with_replacement(range(13), extra_size):
+                    # Extra i sits in suit i + 1, so a repeated extra rank stays two distinct cards.
+                    cards = list(ranks) + [(idx + 1) * 13 + rank for idx, rank in enumerate(extras)]
+                    if len(cards) > 5:
+                        hands.append(cards)
+    return hands
+
+
+def verify_exhaustive(progress: bool = False) -> int:
+    # Agreement with the tuple evaluator on every 5-card hand, every 6/7-card rank multiset
+    # (off-suit) and every 6/7-card hand holding a flush. Returns the number of checks.
+    checks = 0
+    for cards in combinations(range(52), 5):
+        if evaluate_rank(cards) != tuple_class(evaluate_5(cards)):
+            raise AssertionError(f"Mismatch on {cards}")
+        checks += 1
+        if progress and checks % 500000 == 0:
+            print(f"  {checks} five-card hands checked", file=sys.stderr)
+    for size in (6, 7):
+        for ranks in combinations_with_replacement(range(13), size):
+            if max(ranks.count(r) for r in ranks) > 4:
+                continue
+            cards = _offsuit_cards(ranks)
+            if evaluate_rank(cards) != tuple_class(evaluate_7(cards)):
+                raise AssertionError(f"Mismatch on {cards}")
+            checks += 1
+    for cards in _flush_hands():
+        if evaluate_rank(cards) != tuple_class(evaluate_7(cards)):
+            raise AssertionError(f"Mismatch on {cards}")
+        checks += 1
+    return checks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build or verify the integer hand-rank tables.")
+    parser.add_argument("--verify", action="store_true", help="Exhaustively compare against the tuple evaluator.")
+    parser.add_argument("--rebuild", action="store_true", help="Regenerate and rewrite the disk cache.")
+    args = parser.parse_args()
+    global _tables
+    if args.rebuild:
+        _tables = _generate_tables()
+        _write_tables(cache_path(), _tables)
+    tables = load_tables()
+    print(f"Hand-rank tables: {tables.num_classes} classes, {len(tables.nonflush)} rank multisets ({cache_path()})")
+    if args.verify:
+        checks = verify_exhaustive(progress=True)
+        print(f"  verified {checks} hands against the tuple evaluator")
+
+
+if __name__ == "__main__":
+    main()
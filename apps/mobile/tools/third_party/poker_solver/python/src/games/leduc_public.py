@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from array import array
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import List
+
+from games.game_tree import NODE_CHANCE, NODE_TERMINAL, cached_tree
+from games.leduc import DECK, RANKS, LeducPoker
+
+NUM_RANKS = len(RANKS)
+# Matrix[r][o]: chance weight or payoff for the player holding rank r against rank o.
+Matrix = List[List[float]]
+
+
+@dataclass
+class LeducPublicTree:
+    # Leduc with the private cards left out: nodes branch on betting actions and on the board
+    # rank only, and every quantity that depends on the private cards is a NUM_RANKS-vector or
+    # a NUM_RANKS x NUM_RANKS matrix. A decision node with a private rank is exactly one
+    # LeducPoker infoset, so keys[node][rank] are the game's own infoset keys.
+    # Level order; children occupy [child_start, child_start + child_count).
+    player: array
+    board: array
+    child_start: array
+    child_count: array
+    actions: List[List[str]]
+    keys: List[List[str] | None]
+    # payoff[p][node] at terminals: chance weight of (r, o, board) times player p's utility, so
+    # p's counterfactual values are payoff[p][node] @ opponent reach.
+    payoff: List[List[Matrix | None]]
+    decision_nodes: List[int]
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.player)
+
+    def children(self, node: int) -> range:
+        start = self.child_start[node]
+        return range(start, start + self.child_count[node])
+
+    def describe(self) -> str:
+        terminals = sum(1 for kind in self.player if kind == NODE_TERMINAL)
+        return f"{self.num_nodes} public nodes ({len(self.decision_nodes)} decision, {terminals} terminal)"
+
+
+def _copies(rank: int) -> int:
+    return sum(1 for card_rank, _ in DECK if card_rank == rank)
+
+
+def deal_weights() -> Matrix:
+    # P(player holds rank r, opponent holds rank o) over ordered private deals.
+    total = len(DECK) * (len(DECK) - 1)
+    return [
+        [_copies(r) * (_copies(o) - (1 if r == o else 0)) / total for o in range(NUM_RANKS)] for r in range(NUM_RANKS)
+    ]
+
+
+def board_weights(board: int) -> Matrix:
+    # P(board rank | ranks r and o are dealt).
+    remaining = len(DECK) - 2
+    return [
+        [max(0, _copies(board) - (r == board) - (o == board)) / remaining for o in range(NUM_RANKS)]
+        for r in range(NUM_RANKS)
+    ]
+
+
+def _card(rank: int):
+    return next(card for card in DECK if card[0] == rank)
+
+
+def compile_leduc_public_tree(game: LeducPoker) -> LeducPublicTree:
+    tree = LeducPublicTree(
+        player=array("b"),
+        board=array("b"),
+        child_start=array("i"),
+        child_count=array("i"),
+        actions=[],
+        keys=[],
+        payoff=[[], []],
+        decision_nodes=[],
+    )
+    deal = deal_weights()
+    # Chance weight of (r, o, board rank) for every board.
+    board_deal = []
+    for board in range(NUM_RANKS):
+        given = board_weights(board)
+        board_deal.append([[deal[r][o] * given[r][o] for o in range(NUM_RANKS)] for r in range(NUM_RANKS)])
+
+    def payoff(state, player: int) -> Matrix:
+        # Utilities come from LeducPoker itself on a state carrying the two ranks.
+        weights = deal if state.board is None else board_deal[state.board[0]]
+        matrix = []
+        for r in range(NUM_RANKS):
+            row = []
+            for o in range(NUM_RANKS):
+                if weights[r][o] == 0.0:
+                    row.append(0.0)
+                    continue
+                cards = (_card(r), _card(o)) if player == 0 else (_card(o), _card(r))
+                row.append(weights[r][o] * game.terminal_utility(replace(state, cards=cards), player))
+            matrix.append(row)
+        return matrix
+
+    def append(state) -> None:
+        tree.board.append(-1 if state.board is None else state.board[0])
+        tree.child_start.append(0)
+        tree.child_count.append(0)
+        if game.is_terminal(state):
+            tree.player.append(NODE_TERMINAL)
+            tree.actions.append([])
+            tree.keys.append(None)
+            for player in (0, 1):
+                tree.payoff[player].append(payoff(state, player))
+            return
+        player = game.current_player(state)
+        tree.player.append(player)
+        tree.payoff[0].append(None)
+        tree.payoff[1].append(None)
+        if player == NODE_CHANCE:
+            tree.actions.append([])
+            tree.keys.append(None)
+            return
+        tree.actions.append(game.legal_actions(state))
+        tree.keys.append([game.infoset_key(replace(state, cards=(_card(r), _card(r))), player) for r in RANKS])
+
+    # The public root follows the private deal; the dealt cards are placeholders that are
+    # replaced wherever a rank matters.
+    root = game.next_state(game.initial_state(), (_card(0), _card(1)))
+    append(root)
+    queue = deque([(0, root)])
+    while queue:
+        node, state = queue.popleft()
+        if tree.player[node] == NODE_TERMINAL:
+            continue
+        if tree.player[node] == NODE_CHANCE:
+            moves = [_card(rank) for rank in RANKS]
+        else:
+            tree.decision_nodes.append(node)
+            moves = tree.actions[node]
+        tree.child_start[node] = len(tree.player)
+        tree.child_count[node] = len(moves)
+        for move in moves:
+            child_state = game.next_state(state, move)
+            queue.append((len(tree.player), child_state))
+            append(child_state)
+    return tree
+
+
+def leduc_public_tree(game: LeducPoker) -> LeducPublicTree:
+    return cached_tree(game, compile_leduc_public_tree)
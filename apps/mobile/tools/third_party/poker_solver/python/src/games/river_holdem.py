@@ -4,6 +4,8 @@ from dataclasses import dataclass
 from itertools import combinations
 from typing import Dict, Iterable, List, Sequence, Tuple
 
+from games.hand_eval import evaluate_7, evaluate_rank, tuple_class
+
 RANKS = "23456789TJQKA"
 SUITS = "cdhs"
 
@@ -40,73 +42,34 @@ def all_hole_cards(exclude: Iterable[int]) -> List[Tuple[int, int]]:
     return [tuple(sorted((a, b))) for a, b in combinations(deck, 2)]
 
 
-def evaluate_5(cards: Sequence[int]) -> Tuple[int, ...]:
-    ranks = [card % 13 + 2 for card in cards]
-    suits = [card // 13 for card in cards]
-    ranks_sorted = sorted(ranks, reverse=True)
-    counts: Dict[int, int] = {}
-    for rank in ranks:
-        counts[rank] = counts.get(rank, 0) + 1
-    count_items = sorted(counts.items(), key=lambda item: (item[1], item[0]), reverse=True)
-    counts_sorted = [count for _, count in count_items]
-    ranks_by_count = [rank for rank, _ in count_items]
-
-    is_flush = len(set(suits)) == 1
-    unique_ranks = sorted(set(ranks), reverse=True)
-    is_straight = False
-    straight_high = 0
-    if len(unique_ranks) == 5 and unique_ranks[0] - unique_ranks[-1] == 4:
-        is_straight = True
-        straight_high = unique_ranks[0]
-    elif unique_ranks == [14, 5, 4, 3, 2]:
-        is_straight = True
-        straight_high = 5
-
-    if is_straight and is_flush:
-        return (8, straight_high)
-    if counts_sorted == [4, 1]:
-        quad = ranks_by_count[0]
-        kicker = ranks_by_count[1]
-        return (7, quad, kicker)
-    if counts_sorted == [3, 2]:
-        trip = ranks_by_count[0]
-        pair = ranks_by_count[1]
-        return (6, trip, pair)
-    if is_flush:
-        return (5, *ranks_sorted)
-    if is_straight:
-        return (4, straight_high)
-    if counts_sorted == [3, 1, 1]:
-        trip = ranks_by_count[0]
-        kickers = sorted(ranks_by_count[1:], reverse=True)
-        return (3, trip, *kickers)
-    if counts_sorted == [2, 2, 1]:
-        high_pair, low_pair = sorted(ranks_by_count[:2], reverse=True)
-        kicker = ranks_by_count[2]
-        return (2, high_pair, low_pair, kicker)
-    if counts_sorted == [2, 1, 1, 1]:
-        pair = ranks_by_count[0]
-        kickers = sorted(ranks_by_count[1:], reverse=True)
-        return (1, pair, *kickers)
-    return (0, *ranks_sorted)
-
-
-def evaluate_7(cards: Sequence[int]) -> Tuple[int, ...]:
-    best: Tuple[int, ...] | None = None
-    for combo in combinations(cards, 5):
-        rank = evaluate_5(combo)
-        if best is None or rank > best:
-            best = rank
-    if best is None:
-        raise ValueError("No cards to evaluate")
-    return best
+def hand_strength(cards: List[int], evaluator: str = "table") -> int:
+    if evaluator == "table":
+        return evaluate_rank(cards)
+    if evaluator == "tuple":
+        return tuple_class(evaluate_7(cards))
+    if evaluator == "verify":
+        strength = evaluate_rank(cards)
+        expected = tuple_class(evaluate_7(cards))
+        if strength != expected:
+            raise ValueError(
+                f"Hand evaluator mismatch on {' '.join(card_str(c) for c in cards)}: {strength} != {expected}"
+            )
+        return strength
+    raise ValueError(f"Unknown evaluator: {evaluator}")
+
+
+def board_strengths(board: Sequence[str], evaluator: str = "table") -> Dict[Tuple[int, int], int]:
+    # Strength of every hole-card combo on a board, keyed like Hand.cards.
+    board_cards = parse_cards(board)
+    return {cards: hand_strength(list(cards) + board_cards, evaluator) for cards in all_hole_cards(board_cards)}
 
 
 @dataclass(frozen=True)
 class Hand:
     cards: Tuple[int, int]
     weight: float
-    strength: Tuple[int, ...]
+    # Integer hand class from games.hand_eval; larger is stronger, equal splits the pot.
+    strength: int
 
 
 @dataclass(frozen=True)
@@ -141,12 +104,16 @@ class RiverHoldemConfig:
     max_raises: int = 1000
     ranges: Tuple[Sequence[str] | None, Sequence[str] | None] = (None, None)
     range_weights: Tuple[Sequence[float] | None, Sequence[float] | None] = (None, None)
+    # "table" (lookup tables), "tuple" (reference evaluator) or "verify" (both, must agree).
+    evaluator: str = "table"
 
 
-class RiverHoldemGame:
+class BettingRound:
+    # One street of no-limit betting on the config's pot, stacks and sizings; the board, ranges
+    # and evaluator fields are not read here. RiverHoldemGame adds the river hands on top, and
+    # multi-street games chain rounds (see games.turn_river).
     def __init__(self, config: RiverHoldemConfig) -> None:
         self.config = config
-        self.board = parse_cards(config.board)
         self.base_pot = int(config.pot)
         self.stacks = (int(config.stacks[0]), int(config.stacks[1]))
         self.bet_sizes = list(config.bet_sizes)
@@ -158,38 +125,17 @@ class RiverHoldemGame:
         self.ip_next_raises = list(config.ip_next_raises) if config.ip_next_raises else self.bet_sizes
         self.include_all_in = config.include_all_in
         self.max_raises = config.max_raises
-
-        self.hands = []
-        self.hand_weights = []
         self._legal_cache: Dict[Tuple[str, ...], List[Action]] = {}
         self._next_cache: Dict[Tuple[Tuple[str, ...], Action], RiverState] = {}
-        for player in (0, 1):
-            hand_list = self._build_hands(config.ranges[player], config.range_weights[player])
-            self.hands.append(hand_list)
-            weights = [hand.weight for hand in hand_list]
-            total = sum(weights)
-            if total <= 0:
-                raise ValueError("Range weights must sum to > 0")
-            self.hand_weights.append([w / total for w in weights])
+        self._flat_tree = None
 
-    def _build_hands(
-        self, hand_strings: Sequence[str] | None, weights: Sequence[float] | None
-    ) -> List[Hand]:
-        if hand_strings is None:
-            hole_cards = all_hole_cards(self.board)
-        else:
-            hole_cards = [parse_hand(hand) for hand in hand_strings]
-        if weights is None:
-            weights = [1.0 for _ in hole_cards]
-        if len(weights) != len(hole_cards):
-            raise ValueError("Weights must match number of hands")
-        hands = []
-        for cards, weight in zip(hole_cards, weights):
-            if any(card in self.board for card in cards):
-                continue
-            strength = evaluate_7(list(cards) + list(self.board))
-            hands.append(Hand(cards=cards, weight=float(weight), strength=strength))
-        return hands
+    def flat_tree(self):
+        # Compiled once per game; see games.river_tree.
+        if self._flat_tree is None:
+            from games.river_tree import compile_river_tree
+
+            self._flat_tree = compile_river_tree(self)
+        return self._flat_tree
 
     def initial_state(self) -> RiverState:
         return RiverState(history=(), contrib=(0, 0), player=0, checks=0, raises=0, terminal_winner=None)
@@ -365,3 +311,42 @@ class RiverHoldemGame:
                 return float(pot_total - state.contrib[player])
             return float(-state.contrib[player])
         return float(pot_total / 2.0 - state.contrib[player])
+
+
+class RiverHoldemGame(BettingRound):
+    def __init__(self, config: RiverHoldemConfig, strengths: Dict[Tuple[int, int], int] | None = None) -> None:
+        # strengths: optional board_strengths() table shared by games on the same board.
+        super().__init__(config)
+        self.board = parse_cards(config.board)
+        self._strengths = strengths
+        self.hands = []
+        self.hand_weights = []
+        for player in (0, 1):
+            hand_list = self._build_hands(config.ranges[player], config.range_weights[player])
+            self.hands.append(hand_list)
+            weights = [hand.weight for hand in hand_list]
+            total = sum(weights)
+            if total <= 0:
+                raise ValueError("Range weights must sum to > 0")
+            self.hand_weights.append([w / total for w in weights])
+
+    def _build_hands(
+        self, hand_strings: Sequence[str] | None, weights: Sequence[float] | None
+    ) -> List[Hand]:
+        if hand_strings is None:
+            hole_cards = all_hole_cards(self.board)
+        else:
+            hole_cards = [parse_hand(hand) for hand in hand_strings]
+        if weights is None:
+            weights = [1.0 for _ in hole_cards]
+        if len(weights) != len(hole_cards):
+            raise ValueError("Weights must match number of hands")
+        hands = []
+        for cards, weight in zip(hole_cards, weights):
+            if any(card in self.board for card in cards):
+                continue
+            strength = self._strengths.get(cards) if self._strengths is not None else None
+            if strength is None:
+                strength = hand_strength(list(cards) + list(self.board), self.config.evaluator)
+            hands.append(Hand(cards=cards, weight=float(weight), strength=strength))
+        return hands
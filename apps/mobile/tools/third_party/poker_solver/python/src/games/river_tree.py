@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from typing import List
+
+from games.river_holdem import Action, RiverHoldemGame
+
+TERMINAL_NONE = 0
+TERMINAL_FOLD = 1
+TERMINAL_SHOWDOWN = 2
+
+
+@dataclass
+class FlatRiverTree:
+    # Level-order node arrays; children of a node occupy [child_start, child_start + child_count).
+    parent: array
+    player: array
+    terminal: array
+    fold_winner: array
+    contrib0: array
+    contrib1: array
+    pot: array
+    child_start: array
+    child_count: array
+    actions: List[Action | None]
+    tokens: List[str]
+    keys: List[str]
+    decision_nodes: List[int]
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.parent)
+
+    def children(self, node: int) -> range:
+        start = self.child_start[node]
+        return range(start, start + self.child_count[node])
+
+    def child_tokens(self, node: int) -> List[str]:
+        return [self.tokens[child] for child in self.children(node)]
+
+    def contrib(self, node: int, player: int) -> int:
+        return self.contrib0[node] if player == 0 else self.contrib1[node]
+
+    def is_terminal(self, node: int) -> bool:
+        return self.terminal[node] != TERMINAL_NONE
+
+    def memory_bytes(self) -> int:
+        total = 0
+        for column in (
+            self.parent,
+            self.player,
+            self.terminal,
+            self.fold_winner,
+            self.contrib0,
+            self.contrib1,
+            self.pot,
+            self.child_start,
+            self.child_count,
+        ):
+            total += column.itemsize * len(column)
+        # String/object columns are only used for export and profile lookup.
+        for column in (self.actions, self.tokens, self.keys, self.decision_nodes):
+            total += sys.getsizeof(column)
+        total += sum(sys.getsizeof(token) for token in self.tokens)
+        total += sum(sys.getsizeof(key) for key in self.keys)
+        return total
+
+    def describe(self) -> str:
+        terminals = sum(1 for kind in self.terminal if kind != TERMINAL_NONE)
+        return (
+            f"{self.num_nodes} nodes ({len(self.decision_nodes)} decision, {terminals} terminal), "
+            f"{self.memory_bytes() / 1024.0:.1f} KiB"
+        )
+
+
+def _action_token(action: Action) -> str:
+    if action.label in ("c", "f"):
+        return action.label
+    return f"{action.label}{action.amount}"
+
+
+def compile_river_tree(game: RiverHoldemGame) -> FlatRiverTree:
+    tree = FlatRiverTree(
+        parent=array("i"),
+        player=array("b"),
+        terminal=array("b"),
+        fold_winner=array("b"),
+        contrib0=array("q"),
+        contrib1=array("q"),
+        pot=array("q"),
+        child_start=array("i"),
+        child_count=array("i"),
+        actions=[],
+        tokens=[],
+        keys=[],
+        decision_nodes=[],
+    )
+
+    def append(state, parent: int, action: Action | None, token: str) -> None:
+        tree.parent.append(parent)
+        tree.contrib0.append(state.contrib[0])
+        tree.contrib1.append(state.contrib[1])
+        tree.pot.append(game.pot_total(state))
+        tree.actions.append(action)
+        tree.tokens.append(token)
+        tree.keys.append(game.infoset_key(state, 0))
+        tree.child_start.append(0)
+        tree.child_count.append(0)
+        if game.is_terminal(state):
+            tree.player.append(-1)
+            if state.terminal_winner is not None:
+                tree.terminal.append(TERMINAL_FOLD)
+                tree.fold_winner.append(state.terminal_winner)
+            else:
+                tree.terminal.append(TERMINAL_SHOWDOWN)
+                tree.fold_winner.append(-1)
+        else:
+            tree.player.append(game.current_player(state))
+            tree.terminal.append(TERMINAL_NONE)
+            tree.fold_winner.append(-1)
+
+    # Breadth-first expansion keeps each node's children contiguous.
+    root = game.initial_state()
+    append(root, -1, None, "")
+    queue = deque([(0, root)])
+    while queue:
+        node, state = queue.popleft()
+        if game.is_terminal(state):
+            continue
+        tree.decision_nodes.append(node)
+        actions = game.legal_actions(state)
+        tree.child_start[node] = len(tree.parent)
+        tree.child_count[node] = len(actions)
+        for action in actions:
+            child_state = game.next_state(state, action)
+            queue.append((len(tree.parent), child_state))
+            append(child_state, node, action, _action_token(action))
+    return tree
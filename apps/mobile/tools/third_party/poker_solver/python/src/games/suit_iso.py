@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from itertools import permutations
+from typing import Dict, List, Sequence, Tuple
+
+from games.river_holdem import Hand, RiverHoldemGame
+
+# Suit permutations act on card ids (suit * 13 + rank) by relabelling the suit only.
+SuitPermutation = Tuple[int, int, int, int]
+
+
+def permute_card(card: int, perm: SuitPermutation) -> int:
+    return perm[card // 13] * 13 + card % 13
+
+
+def permute_hand(cards: Tuple[int, int], perm: SuitPermutation) -> Tuple[int, int]:
+    first = permute_card(cards[0], perm)
+    second = permute_card(cards[1], perm)
+    return (first, second) if first < second else (second, first)
+
+
+def board_suit_symmetries(board: Sequence[int]) -> List[SuitPermutation]:
+    # Every suit relabelling that maps the board onto itself (always includes the identity).
+    # On a river this is mostly permutations of the suits absent from the board, plus swaps of
+    # suits that hold the same ranks (e.g. Ks Kh 7s 7h 2d swaps spades and hearts).
+    board_set = set(board)
+    return [
+        perm for perm in permutations(range(4)) if {permute_card(card, perm) for card in board_set} == board_set
+    ]
+
+
+def range_suit_symmetries(game: RiverHoldemGame) -> List[SuitPermutation]:
+    # Board symmetries that also map both ranges onto themselves with equal weights, so
+    # equivalent hands get identical strategies and values in every equilibrium the solver finds.
+    lookups: List[Dict[Tuple[int, int], float]] = [
+        {hand.cards: hand.weight for hand in game.hands[player]} for player in (0, 1)
+    ]
+    symmetries = []
+    for perm in board_suit_symmetries(game.board):
+        if all(
+            lookup.get(permute_hand(cards, perm)) == weight for lookup in lookups for cards, weight in lookup.items()
+        ):
+            symmetries.append(perm)
+    return symmetries
+
+
+class HandIsomorphism:
+    # Collapses each player's hands into orbits under the range-preserving suit symmetries.
+    # Trainers keep one row per class (its first hand in game order is the representative, with
+    # the class's total weight); opponent reach is expanded back to combos for terminal
+    # evaluation, so card removal stays exact, and strategies are expanded row by row on export.
+    def __init__(self, game: RiverHoldemGame) -> None:
+        self.game = game
+        self.symmetries = range_suit_symmetries(game)
+        self.representatives: List[List[int]] = [[], []]
+        # Per combo: its class index and the size of that class.
+        self.class_of: List[List[int]] = [[], []]
+        self.class_sizes: List[List[int]] = [[], []]
+        self.member_sizes: List[List[int]] = [[], []]
+        self.class_weights: List[List[float]] = [[], []]
+        for player in (0, 1):
+            hands = game.hands[player]
+            index = {hand.cards: idx for idx, hand in enumerate(hands)}
+            class_of = [-1 for _ in hands]
+            for idx, hand in enumerate(hands):
+                if class_of[idx] >= 0:
+                    continue
+                cls = len(self.representatives[player])
+                members = sorted({index[permute_hand(hand.cards, perm)] for perm in self.symmetries})
+                for member in members:
+                    class_of[member] = cls
+                self.representatives[player].append(idx)
+                self.class_sizes[player].append(len(members))
+                self.class_weights[player].append(sum(game.hand_weights[player][member] for member in members))
+            self.class_of[player] = class_of
+            self.member_sizes[player] = [self.class_sizes[player][cls] for cls in class_of]
+
+    def num_classes(self, player: int) -> int:
+        return len(self.representatives[player])
+
+    def representative_hands(self, player: int) -> List[Hand]:
+        hands = self.game.hands[player]
+        return [hands[idx] for idx in self.representatives[player]]
+
+    def expand_reach(self, player: int, reach: Sequence[float]) -> List[float]:
+        # Class reach covers every member with equal weight; each combo gets its share.
+        sizes = self.class_sizes[player]
+        return [reach[cls] / sizes[cls] for cls in self.class_of[player]]
+
+    def expand_rows(self, player: int, rows: Sequence[Sequence[float]]) -> List[List[float]]:
+        return [list(rows[cls]) for cls in self.class_of[player]]
+
+    def describe(self) -> str:
+        sizes = " / ".join(
+            f"{len(self.game.hands[player])} -> {self.num_classes(player)}" for player in (0, 1)
+        )
+        return f"{len(self.symmetries)} suit symmetries, hands {sizes}"
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+from games.river_holdem import (
+    BettingRound,
+    Hand,
+    RiverHoldemConfig,
+    all_hole_cards,
+    board_strengths,
+    card_str,
+    parse_cards,
+    parse_hand,
+)
+from games.river_tree import TERMINAL_SHOWDOWN, FlatRiverTree
+
+
+@dataclass
+class TurnRiverConfig:
+    # Four board cards; the river is dealt by a chance node after the turn betting closes.
+    board: Sequence[str]
+    pot: int = 1000
+    stacks: Tuple[int, int] = (9500, 9500)
+    turn_bet_sizes: Sequence[float] = (1.0,)
+    river_bet_sizes: Sequence[float] = (1.0,)
+    include_all_in: bool = True
+    # Per street.
+    max_raises: int = 1
+    ranges: Tuple[Sequence[str] | None, Sequence[str] | None] = (None, None)
+    range_weights: Tuple[Sequence[float] | None, Sequence[float] | None] = (None, None)
+    evaluator: str = "table"
+
+
+class TurnRiverGame:
+    # Turn betting round whose closed lines (call or check-check) become chance nodes. Every
+    # chance node deals one of the unseen cards and continues with a river betting round on the
+    # pot and stacks left by that line; when a player is all-in the river goes straight to
+    # showdown (no river tree). River trees only depend on pot and stacks, so lines that end
+    # in the same pot share one compiled tree.
+    def __init__(self, config: TurnRiverConfig) -> None:
+        self.config = config
+        self.board = parse_cards(config.board)
+        if len(self.board) != 4 or len(set(self.board)) != 4:
+            raise ValueError("Turn board must have four distinct cards")
+        self.base_pot = int(config.pot)
+        self.stacks = (int(config.stacks[0]), int(config.stacks[1]))
+        self.turn_tree = BettingRound(self._round_config(self.base_pot, self.stacks, config.turn_bet_sizes)).flat_tree()
+        self.runouts = [card for card in range(52) if card not in self.board]
+        # Every compatible hand pair leaves the same number of possible river cards.
+        self.river_deal_count = len(self.runouts) - 4
+
+        self.hands: List[List[Hand]] = []
+        self.hand_weights: List[List[float]] = []
+        for player in (0, 1):
+            hands = self._build_hands(config.ranges[player], config.range_weights[player])
+            total = sum(hand.weight for hand in hands)
+            if total <= 0:
+                raise ValueError("Range weights must sum to > 0")
+            self.hands.append(hands)
+            self.hand_weights.append([hand.weight / total for hand in hands])
+
+        tree = self.turn_tree
+        self.chance_nodes = [node for node in range(tree.num_nodes) if tree.terminal[node] == TERMINAL_SHOWDOWN]
+        self.river_trees: Dict[int, FlatRiverTree | None] = {}
+        shared: Dict[Tuple[int, int, int], FlatRiverTree] = {}
+        for node in self.chance_nodes:
+            stacks = (self.stacks[0] - tree.contrib0[node], self.stacks[1] - tree.contrib1[node])
+            if min(stacks) <= 0:
+                self.river_trees[node] = None
+                continue
+            key = (tree.pot[node], stacks[0], stacks[1])
+            if key not in shared:
+                shared[key] = BettingRound(
+                    self._round_config(tree.pot[node], stacks, config.river_bet_sizes)
+                ).flat_tree()
+            self.river_trees[node] = shared[key]
+
+    def _round_config(self, pot: int, stacks: Tuple[int, int], bet_sizes: Sequence[float]) -> RiverHoldemConfig:
+        return RiverHoldemConfig(
+            board=self.config.board,
+            pot=pot,
+            stacks=stacks,
+            bet_sizes=bet_sizes,
+            include_all_in=self.config.include_all_in,
+            max_raises=self.config.max_raises,
+        )
+
+    def _build_hands(self, hand_strings: Sequence[str] | None, weights: Sequence[float] | None) -> List[Hand]:
+        # Turn hands carry no strength; river strengths are per runout (runout_hands).
+        if hand_strings is None:
+            hole_cards = all_hole_cards(self.board)
+        else:
+            hole_cards = [parse_hand(hand) for hand in hand_strings]
+        if weights is None:
+            weights = [1.0 for _ in hole_cards]
+        if len(weights) != len(hole_cards):
+            raise ValueError("Weights must match number of hands")
+        return [
+            Hand(cards=cards, weight=float(weight), strength=0)
+            for cards, weight in zip(hole_cards, weights)
+            if not any(card in self.board for card in cards)
+        ]
+
+    def runout_hands(self, card: int) -> List[List[Hand]]:
+        # Both players' turn hands ranked on the five-card board with `card` as the river.
+        # Hands holding the river card get strength -1; callers zero their reach and values.
+        strengths = board_strengths([card_str(c) for c in self.board + [card]], self.config.evaluator)
+        return [
+            [
+                Hand(cards=hand.cards, weight=hand.weight, strength=strengths.get(hand.cards, -1))
+                for hand in self.hands[player]
+            ]
+            for player in (0, 1)
+        ]
+
+    def turn_contrib(self, node: int, player: int) -> int:
+        return self.turn_tree.contrib(node, player)
+
+    def river_prefix(self, node: int, card: int) -> str:
+        # Profile keys of river infosets are "<turn line>|<river card>|<river line>".
+        return f"{self.turn_tree.keys[node]}|{card_str(card)}"
+
+    def describe(self) -> str:
+        rivers = {id(tree): tree for tree in self.river_trees.values() if tree is not None}
+        river_nodes = sum(tree.num_nodes for tree in rivers.values())
+        return (
+            f"turn tree {self.turn_tree.num_nodes} nodes, {len(self.chance_nodes)} chance nodes x "
+            f"{len(self.runouts)} runouts, {len(rivers)} distinct river trees ({river_nodes} nodes), "
+            f"hands {len(self.hands[0])} / {len(self.hands[1])}"
+        )
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+
+# The solver modules import each other as top-level packages (algorithms, games), like the CLIs do.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def hand_rank_cache(tmp_path_factory):
+    # Build the hand-rank tables into a throwaway cache so tests never read a stale user cache.
+    from games import hand_eval
+
+    previous = os.environ.get(hand_eval.CACHE_ENV)
+    os.environ[hand_eval.CACHE_ENV] = str(tmp_path_factory.mktemp("hand_rank"))
+    hand_eval._tables = None
+    yield
+    hand_eval._tables = None
+    if previous is None:
+        del os.environ[hand_eval.CACHE_ENV]
+    else:
+        os.environ[hand_eval.CACHE_ENV] = previous
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import random
+from itertools import combinations
+
+import pytest
+
+from algorithms.deal_sampler import DealSampler, build_alias
+from cli.run_river_exploitability import config_from_dict
+from games.river_holdem import RiverHoldemGame
+
+BOARD = ["Ks", "Th", "7s", "4d", "2c"]
+CARDS = [rank + suit for rank in "AQJ98" for suit in "shdc"]
+
+
+def _game(p0_weights, p1_weights) -> RiverHoldemGame:
+    combos = [a + b for a, b in combinations(CARDS, 2)]
+    return RiverHoldemGame(
+        config_from_dict(
+            {
+                "board": BOARD,
+                "pot": 1000,
+                "stack": 9500,
+                "bet_sizes": [1.0],
+                "players": [
+                    {"hands": combos, "weights": p0_weights(combos)},
+                    {"hands": combos, "weights": p1_weights(combos)},
+                ],
+            }
+        )
+    )
+
+
+def _inverse_cdf(rng, weights):
+    # The river MCCFR trainers' draw before DealSampler: a linear scan of the cumulative weights.
+    threshold = rng.random() * sum(weights)
+    cumulative = 0.0
+    for idx, weight in enumerate(weights):
+        cumulative += weight
+        if threshold <= cumulative:
+            return idx
+    return len(weights) - 1
+
+
+def _inverse_cdf_deals(rng, game, count):
+    p1_weights = game.hand_weights[1]
+    unblocked = [
+        [0.0 if set(hand.cards) & set(opp.cards) else weight for opp, weight in zip(game.hands[1], p1_weights)]
+        for hand in game.hands[0]
+    ]
+    p0_weights = [weight * sum(row) for row, weight in zip(unblocked, game.hand_weights[0])]
+    deals = []
+    for _ in range(count):
+        p0 = _inverse_cdf(rng, p0_weights)
+        deals.append((p0, _inverse_cdf(rng, unblocked[p0])))
+    return deals
+
+
+def _alias_distribution(prob, alias):
+    # Exact probabilities an alias table draws: slot k keeps itself w.p. prob[k], else goes to alias[k].
+    count = len(prob)
+    dist = [0.0 for _ in range(count)]
+    for slot in range(count):
+        dist[slot] += prob[slot] / count
+        dist[alias[slot]] += (1.0 - prob[slot]) / count
+    return dist
+
+
+def _uniform(combos):
+    return [1.0 for _ in combos]
+
+
+def _weighted(seed):
+    def weights(combos):
+        rng = random.Random(seed)
+        return [0.0 if rng.random() < 0.2 else rng.uniform(0.1, 3.0) for _ in combos]
+
+    return weights
+
+
+def test_uniform_ranges_match_inverse_cdf_stream():
+    # Every combo blocks the same number of opposing combos, so all alias slots keep themselves.
+    game = _game(_uniform, _uniform)
+    sampler = DealSampler(game, random.Random(7))
+    assert sampler.sample_batch(2000) == _inverse_cdf_deals(random.Random(7), game, 2000)
+
+
+@pytest.mark.parametrize("seeds", [(1, 2), (3, 3), (4, 5)])
+def test_weighted_deals_are_proportional_to_weight_product(seeds):
+    game = _game(_weighted(seeds[0]), _weighted(seeds[1]))
+    w0, w1 = game.hand_weights
+    target = {}
+    for i, hand in enumerate(game.hands[0]):
+        for j, opp in enumerate(game.hands[1]):
+            if w0[i] * w1[j] > 0.0 and not set(hand.cards) & set(opp.cards):
+                target[(i, j)] = w0[i] * w1[j]
+    total = sum(target.values())
+
+    sampler = DealSampler(game, random.Random(0))
+    p0_dist = _alias_distribution(sampler.p0_prob, sampler.p0_alias)
+    drawn = {}
+    for i, p0_mass in enumerate(p0_dist):
+        lo, hi = sampler.offsets[i], sampler.offsets[i + 1]
+        if lo == hi:
+            assert p0_mass == pytest.approx(0.0, abs=1e-12)
+            continue
+        local = _alias_distribution(sampler.p1_prob[lo:hi], sampler.p1_alias[lo:hi])
+        for slot, mass in enumerate(local):
+            if p0_mass * mass > 0.0:
+                drawn[(i, sampler.p1_index[lo + slot])] = p0_mass * mass
+    assert set(drawn) == set(target)
+    for pair, mass in drawn.items():
+        assert mass == pytest.approx(target[pair] / total, rel=1e-9)
+
+    for i, j in sampler.sample_batch(2000):
+        assert (i, j) in target
+
+
+def test_build_alias_rejects_empty_weight():
+    with pytest.raises(ValueError):
+        build_alias([0.0, 0.0])
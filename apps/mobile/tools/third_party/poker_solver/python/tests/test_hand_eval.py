@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import random
+from itertools import combinations, combinations_with_replacement
+
+import pytest
+
+from games import hand_eval
+from games.hand_eval import evaluate_rank, evaluate_7, tuple_class
+
+
+def _check(cards):
+    assert evaluate_rank(cards) == tuple_class(evaluate_7(cards)), cards
+
+
+@pytest.mark.parametrize("size", [5, 6, 7])
+def test_every_suited_rank_set(size):
+    # Exercises flush[mask] for 5-, 6- and 7-bit masks, straight flushes included.
+    for suit in (0, 3):
+        for ranks in combinations(range(13), size):
+            _check([suit * 13 + rank for rank in ranks])
+
+
+def test_paired_boards_with_flush():
+    # Five or six suited cards plus off-suit copies of suited ranks: pairs, two pair, trips and
+    # full-house candidates next to a flush.
+    for suited_size in (5, 6):
+        for ranks in combinations(range(13), suited_size):
+            for extra_size in range(1, 7 - suited_size + 1):
+                for extras in combinations_with_replacement(ranks, extra_size):
+                    _check(list(ranks) + [(idx + 1) * 13 + rank for idx, rank in enumerate(extras)])
+
+
+def test_random_seven_card_hands():
+    rng = random.Random(20261017)
+    deck = list(range(52))
+    for _ in range(20000):
+        _check(rng.sample(deck, 7))
+
+
+def test_flush_hands_cover_large_masks():
+    # verify_exhaustive's flush sweep must reach 6- and 7-card single-suit masks.
+    sizes = {sum(1 for card in cards if card < 13) for cards in hand_eval._flush_hands()}
+    assert sizes == {5, 6, 7}
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import pytest
+
+from algorithms.snapshot import load_trainer, save_trainer
+from cli.run_river_exploitability import config_from_dict, make_trainer
+from games.river_holdem import RiverHoldemGame
+
+HANDS = ["AsAd", "AhAc", "QsQd", "JhJc", "9s9d", "8h8c", "6s6d", "5h5c", "AdKd", "QhJh", "3h3c", "AcQc"]
+
+CONFIG = {
+    "board": ["Ks", "Th", "7s", "4d", "2s"],
+    "pot": 1000,
+    "stack": 9500,
+    "bet_sizes": [1.0],
+    "include_all_in": True,
+    "max_raises": 2,
+    "players": [
+        {"hands": HANDS, "weights": [1.0 + 0.25 * (i % 3) for i in range(len(HANDS))]},
+        {"hands": HANDS, "weights": [1.0 for _ in HANDS]},
+    ],
+}
+
+ALGOS = ["cfr", "cfr+", "dcfr", "pcfr+", "fp", "fp-node", "mccfr", "mccfr-table", "mccfr-outcome"]
+ARRAY_ALGOS = ["cfr+-array", "dcfr-array", "pcfr+-array"]
+
+
+def _game():
+    return RiverHoldemGame(config_from_dict(CONFIG))
+
+
+def _state(trainer):
+    meta, tables = trainer.snapshot_state()
+    return meta, {name: list(values) for name, values in tables}
+
+
+def _assert_resume_is_exact(algo, tmp_path):
+    # Snapshot halfway, resume in a fresh trainer and finish: every table, the RNG state and the
+    # average strategy must equal an uninterrupted run bit for bit.
+    straight = make_trainer(algo, _game())
+    straight.run(24)
+
+    first = make_trainer(algo, _game())
+    first.run(11)
+    path = tmp_path / f"{algo}.bin"
+    save_trainer(path, first, algo)
+    resumed = make_trainer(algo, _game())
+    load_trainer(path, resumed, algo)
+    assert resumed.iteration == first.iteration
+    resumed.run(13)
+
+    assert _state(resumed) == _state(straight)
+    assert resumed.average_strategy_profile() == straight.average_strategy_profile()
+
+
+@pytest.mark.parametrize("algo", ALGOS)
+def test_resume_matches_uninterrupted_run(algo, tmp_path):
+    _assert_resume_is_exact(algo, tmp_path)
+
+
+@pytest.mark.parametrize("algo", ARRAY_ALGOS)
+def test_array_resume_matches_uninterrupted_run(algo, tmp_path):
+    pytest.importorskip("numpy")
+    _assert_resume_is_exact(algo, tmp_path)
+
+
+def test_resume_rejects_other_algo(tmp_path):
+    trainer = make_trainer("cfr+", _game())
+    trainer.run(2)
+    path = tmp_path / "cfr+.bin"
+    save_trainer(path, trainer, "cfr+")
+    with pytest.raises(ValueError):
+        load_trainer(path, make_trainer("dcfr", _game()), "dcfr")
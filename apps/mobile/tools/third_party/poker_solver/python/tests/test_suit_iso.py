@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from itertools import combinations
+
+import pytest
+
+from algorithms.vector_eval import build_strength_summary, exploitability
+from cli.run_river_exploitability import config_from_dict, make_trainer
+from games.river_holdem import RiverHoldemGame
+from games.suit_iso import HandIsomorphism
+
+# Two-tone: clubs and diamonds are absent, so swapping them maps the board onto itself.
+BOARD = ["Ks", "Th", "7s", "4h", "2s"]
+RANKS = "AQ985"
+RANK_WEIGHT = {"A": 1.0, "Q": 0.5, "9": 2.0, "8": 1.5, "5": 0.75}
+
+
+def _config(ranges_symmetric: bool = True) -> dict:
+    cards = [rank + suit for rank in RANKS for suit in "shdc"]
+    combos = [a + b for a, b in combinations(cards, 2)]
+    # Weights depend on ranks only, so the ranges keep the club/diamond symmetry of the board.
+    weights = [RANK_WEIGHT[combo[0]] * RANK_WEIGHT[combo[2]] for combo in combos]
+    if not ranges_symmetric:
+        weights[combos.index("AdQd")] += 1.0
+    return {
+        "board": BOARD,
+        "pot": 1000,
+        "stack": 9500,
+        "bet_sizes": [0.5, 1.0],
+        "include_all_in": True,
+        "max_raises": 2,
+        "players": [
+            {"hands": combos, "weights": weights},
+            {"hands": combos, "weights": [0.5 + weight for weight in weights]},
+        ],
+    }
+
+
+def _exploitability(game, algo, suit_isomorphism, iterations):
+    trainer = make_trainer(algo, game, suit_isomorphism=suit_isomorphism)
+    trainer.run(iterations)
+    summaries = {0: build_strength_summary(game.hands[1]), 1: build_strength_summary(game.hands[0])}
+    return exploitability(game, trainer.average_strategy_profile(), summaries)
+
+
+def test_two_tone_board_has_classes():
+    game = RiverHoldemGame(config_from_dict(_config()))
+    iso = HandIsomorphism(game)
+    for player in (0, 1):
+        assert iso.num_classes(player) < len(game.hands[player])
+    # A range that breaks the symmetry leaves nothing to merge.
+    game = RiverHoldemGame(config_from_dict(_config(ranges_symmetric=False)))
+    iso = HandIsomorphism(game)
+    assert [iso.num_classes(player) for player in (0, 1)] == [len(game.hands[player]) for player in (0, 1)]
+
+
+@pytest.mark.parametrize("algo", ["cfr", "cfr+", "dcfr"])
+def test_suit_iso_matches_full_solve(algo):
+    game = RiverHoldemGame(config_from_dict(_config()))
+    full = _exploitability(game, algo, False, 20)
+    reduced = _exploitability(game, algo, True, 20)
+    assert reduced == pytest.approx(full, rel=1e-9, abs=1e-9)
+
+
+def test_array_suit_iso_matches_full_solve():
+    pytest.importorskip("numpy")
+    game = RiverHoldemGame(config_from_dict(_config()))
+    full = _exploitability(game, "cfr+-array", False, 20)
+    reduced = _exploitability(game, "cfr+-array", True, 20)
+    assert reduced == pytest.approx(full, rel=1e-9, abs=1e-9)
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import random
+from itertools import combinations
+
+import pytest
+
+from algorithms.naive_eval import showdown_values_naive
+from algorithms.vector_eval import (
+    build_card_removal_index,
+    build_strength_summary,
+    fold_values_card_removal,
+    showdown_values_card_removal,
+)
+from games.river_holdem import Hand, board_strengths, parse_cards
+
+BOARDS = {
+    "dry": ["Ks", "Th", "7s", "4d", "2c"],
+    "paired": ["Ks", "Kh", "7s", "7d", "2c"],
+    "trips": ["9c", "9d", "9h", "5s", "5c"],
+    "monotone": ["As", "Js", "8s", "6s", "3s"],
+    "straight": ["Tc", "Jd", "Qh", "Ks", "Ad"],
+}
+
+
+def _hands(strengths, combos, rng, zero_share: float):
+    # Range weights are random, with a share of exact zeros (hands folded out of a range).
+    hands = [Hand(cards, 1.0, strengths[cards]) for cards in combos]
+    weights = [0.0 if rng.random() < zero_share else rng.uniform(0.05, 2.0) for _ in combos]
+    return hands, weights
+
+
+def _random_range(strengths, rng, size: int):
+    return rng.sample(sorted(strengths), min(size, len(strengths)))
+
+
+def _blocker_range(strengths, rng, cards):
+    # Every combo built from a few cards: most pairs of hands share a card, and both players hold
+    # identical combos, which exercises the inclusion-exclusion correction.
+    return [combo for combo in combinations(sorted(cards), 2) if combo in strengths and rng.random() < 0.8]
+
+
+def _fold_naive(player_hands, opp_hands, opp_weights, value):
+    values = []
+    for hand in player_hands:
+        mass = sum(
+            weight for opp, weight in zip(opp_hands, opp_weights) if not set(hand.cards) & set(opp.cards)
+        )
+        values.append(value * mass)
+    return values
+
+
+def _assert_matches(player_hands, opp_hands, opp_weights):
+    index = build_card_removal_index(player_hands, build_strength_summary(opp_hands))
+    for pot_total, contrib in ((1000.0, 500.0), (3700.0, 1850.0), (640.0, 120.0)):
+        fast = showdown_values_card_removal(index, opp_weights, pot_total, contrib)
+        naive = showdown_values_naive(player_hands, opp_hands, opp_weights, pot_total, contrib)
+        assert fast == pytest.approx(naive, rel=1e-9, abs=1e-6)
+    fast = fold_values_card_removal(index, 250.0, opp_weights)
+    assert fast == pytest.approx(_fold_naive(player_hands, opp_hands, opp_weights, 250.0), rel=1e-9, abs=1e-6)
+
+
+@pytest.mark.parametrize("board", sorted(BOARDS))
+def test_random_ranges_match_naive(board):
+    strengths = board_strengths(BOARDS[board])
+    rng = random.Random(f"random-{board}")
+    for size_p, size_opp in ((40, 60), (200, 150), (len(strengths), len(strengths))):
+        player_hands, _ = _hands(strengths, _random_range(strengths, rng, size_p), rng, 0.0)
+        opp_hands, opp_weights = _hands(strengths, _random_range(strengths, rng, size_opp), rng, 0.2)
+        _assert_matches(player_hands, opp_hands, opp_weights)
+
+
+@pytest.mark.parametrize("board", sorted(BOARDS))
+def test_blocker_heavy_ranges_match_naive(board):
+    strengths = board_strengths(BOARDS[board])
+    board_cards = set(parse_cards(BOARDS[board]))
+    rng = random.Random(f"blockers-{board}")
+    deck = [card for card in range(52) if card not in board_cards]
+    for _ in range(6):
+        shared = rng.sample(deck, 7)
+        player_cards = shared + rng.sample([card for card in deck if card not in shared], 2)
+        player_hands, _ = _hands(strengths, _blocker_range(strengths, rng, player_cards), rng, 0.0)
+        opp_hands, opp_weights = _hands(strengths, _blocker_range(strengths, rng, shared), rng, 0.1)
+        _assert_matches(player_hands, opp_hands, opp_weights)
+
+
+def test_zero_opponent_mass_gives_zero_values():
+    strengths = board_strengths(BOARDS["paired"])
+    rng = random.Random(7)
+    player_hands, _ = _hands(strengths, _random_range(strengths, rng, 30), rng, 0.0)
+    opp_hands, _ = _hands(strengths, _random_range(strengths, rng, 30), rng, 0.0)
+    index = build_card_removal_index(player_hands, build_strength_summary(opp_hands))
+    zeros = [0.0 for _ in opp_hands]
+    assert showdown_values_card_removal(index, zeros, 1000.0, 500.0) == [0.0 for _ in player_hands]
+    assert fold_values_card_removal(index, 250.0, zeros) == [0.0 for _ in player_hands]